@@ -0,0 +1,590 @@
+import io
+import math
+import os
+import pickle
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+import bezetting
+import data
+import meting
+import sessiecache
+
+MAXPOWER_START = 2750
+MAXPOWER_BREEDTE = 250
+NUMERIEKE_KOLOMMEN = ['TotalEnergy', 'ConnectedTime', 'ChargeTime', 'MaxPower']
+TIJD_KOLOMMEN = ['ConnectedTime', 'ChargeTime']
+AGGREGATEN_PAD = os.path.join(data.KOLOM_MAP, "aggregaten.pkl")
+# vaste histogrambins voor de tijdkolommen (uren); alles boven HIST_MAX valt in de laatste bin
+HIST_BREEDTE = 0.1
+HIST_MAX = 24.0
+# per kant zoveel extreemste waarden bewaren: de getoonde uitschieters zijn hieruit
+MAX_UITSCHIETERS = 200
+# ophogen als de opgeslagen aggregaten een ander formaat krijgen
+VERSIE = 4
+# ~16 MB CSV per blok (ca. 200k sessies)
+BLOK_BYTES = 16 * 1024 ** 2
+
+
+# -----------------------
+# Samenvoegbare kwantielschets (log-emmers met relatieve fout, zoals DDSketch)
+# -----------------------
+class KwantielSchets:
+    def __init__(self, relatieve_fout=0.005):
+        self.relatieve_fout = relatieve_fout
+        self.gamma = (1 + relatieve_fout) / (1 - relatieve_fout)
+        self.emmers = Counter()
+        self.nul = 0
+        self.n = 0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def voeg_toe(self, waarden):
+        waarden = np.asarray(waarden, dtype='float64')
+        waarden = waarden[~np.isnan(waarden)]
+        if len(waarden) == 0:
+            return
+        positief = waarden[waarden > 0]
+        emmers, aantallen = np.unique(np.ceil(np.log(positief) / np.log(self.gamma)).astype('int64'), return_counts=True)
+        self.emmers.update(dict(zip(emmers.tolist(), aantallen.tolist())))
+        self.nul += len(waarden) - len(positief)
+        self.n += len(waarden)
+        self.min = min(self.min, float(waarden.min()))
+        self.max = max(self.max, float(waarden.max()))
+
+    def samenvoegen(self, ander):
+        self.emmers.update(ander.emmers)
+        self.nul += ander.nul
+        self.n += ander.n
+        self.min = min(self.min, ander.min)
+        self.max = max(self.max, ander.max)
+
+    def kwantielen(self, qs):
+        # waarde per kwantiel, binnen relatieve_fout van de echte waarde
+        if self.n == 0:
+            return np.full(len(qs), np.nan)
+        sleutels = np.array(sorted(self.emmers), dtype='int64')
+        cumulatief = self.nul + np.cumsum([self.emmers[k] for k in sleutels])
+        rang = np.asarray(qs, dtype='float64') * (self.n - 1)
+        positie = np.searchsorted(cumulatief, rang, side='right')
+        waarden = 2 * self.gamma ** sleutels[np.minimum(positie, len(sleutels) - 1)] / (self.gamma + 1)
+        waarden = np.where(rang < self.nul, 0.0, waarden)
+        return np.clip(waarden, self.min, self.max)
+
+    def grootste_tot(self, grens):
+        # (benadering van) de grootste waarde <= grens: de bovenste snorhaar
+        if self.max <= grens:
+            return self.max
+        sleutels = np.array([k for k in self.emmers if 2 * self.gamma ** k / (self.gamma + 1) <= grens])
+        return float(2 * self.gamma ** sleutels.max() / (self.gamma + 1)) if len(sleutels) else self.min
+
+    def kleinste_vanaf(self, grens):
+        if self.min >= grens:
+            return self.min
+        sleutels = np.array([k for k in self.emmers if 2 * self.gamma ** k / (self.gamma + 1) >= grens])
+        return float(2 * self.gamma ** sleutels.min() / (self.gamma + 1)) if len(sleutels) else self.max
+
+
+def _uitersten(waarden, k=MAX_UITSCHIETERS):
+    # de k kleinste en k grootste waarden, gesorteerd; samenvoegbaar en onafhankelijk van de volgorde
+    if len(waarden) <= 2 * k:
+        return np.sort(waarden)
+    return np.sort(np.r_[np.partition(waarden, k - 1)[:k], np.partition(waarden, len(waarden) - k)[-k:]])
+
+
+def maxpower_bins(vermogen):
+    # 250W-bins: (2750, 3000] -> 0, (3000, 3250] -> 1, ...
+    return np.ceil((vermogen - MAXPOWER_START) / MAXPOWER_BREEDTE).astype('int64') - 1
+
+
+def kalenderdagen(begin, eind):
+    # aantal kalenderdagen van begin t/m eind, beide meegeteld: de noemer van elk gemiddelde per dag
+    return (pd.Timestamp(eind).normalize() - pd.Timestamp(begin).normalize()).days + 1
+
+
+def hist_bins(waarden, aantal):
+    return np.clip((waarden / HIST_BREEDTE).astype('int64'), 0, aantal - 1)
+
+
+# -----------------------
+# Optelbare totalen per kalenderdag; met prefixsommen is elk datumvenster snel op te vragen
+# -----------------------
+class DagTotalen:
+    # n, energie, MaxPower-bins, tijdhistogrammen en correlatiesommen per dag van de starttijd;
+    # de bezetting per uur per kalenderdag waarin dat uur valt
+    def __init__(self):
+        self.eerste_dag = None
+        self.velden = {}
+        self.referentie = None
+        self._prefix = None
+
+    def __len__(self):
+        return len(self.velden['n']) if self.velden else 0
+
+    def __getstate__(self):
+        # prefixsommen zijn uit de velden af te leiden: niet mee opslaan
+        staat = dict(self.__dict__)
+        staat['_prefix'] = None
+        return staat
+
+    def _van_sessies(self, df):
+        dag = df['Started'].to_numpy(dtype='datetime64[ns]').astype('datetime64[D]')
+        eerste, bezet = bezetting.bezetting_per_dag_uur(df['Started'], df['Ended'])
+        d = (dag - eerste).astype('int64')
+        D = max(int(d.max()) + 1, len(bezet))
+
+        velden = {
+            'n': np.bincount(d, minlength=D),
+            'energie': np.bincount(d, weights=df['TotalEnergy'].to_numpy(dtype='float64'), minlength=D),
+            'bezetting': np.pad(bezet, ((0, D - len(bezet)), (0, 0))),
+        }
+
+        vermogen = df['MaxPower'].to_numpy()
+        boven = vermogen > MAXPOWER_START
+        bins = maxpower_bins(vermogen[boven])
+        B = int(bins.max()) + 1 if len(bins) else 0
+        velden['maxpower'] = np.bincount(d[boven] * B + bins, minlength=D * B).reshape(D, B)
+
+        for col in TIJD_KOLOMMEN:
+            waarden = df[col].to_numpy(dtype='float64')
+            geldig = ~np.isnan(waarden)
+            H = int(round(HIST_MAX / HIST_BREEDTE))
+            h = hist_bins(waarden[geldig], H)
+            velden['hist_' + col] = np.bincount(d[geldig] * H + h, minlength=D * H).reshape(D, H)
+
+        k = len(NUMERIEKE_KOLOMMEN)
+        x = df[NUMERIEKE_KOLOMMEN].to_numpy(dtype='float64') - self.referentie
+        velden['som'] = np.stack([np.bincount(d, weights=x[:, j], minlength=D) for j in range(k)], axis=1)
+        velden['kruis'] = np.stack(
+            [np.bincount(d, weights=x[:, j] * x[:, l], minlength=D) for j in range(k) for l in range(k)], axis=1
+        ).reshape(D, k, k)
+        return eerste, velden
+
+    def _tel_op(self, eerste, velden):
+        # beide reeksen dagen (en MaxPower-bins) uitlijnen op hun vereniging en optellen
+        if not self.velden:
+            self.eerste_dag, self.velden = eerste, velden
+            return
+        begin = min(self.eerste_dag, eerste)
+        eind = max(self.eerste_dag + len(self), eerste + len(velden['n']))
+        D = int((eind - begin).astype('int64'))
+        nieuw = {}
+        for naam, oud in self.velden.items():
+            erbij = velden[naam]
+            vorm = (D,) + tuple(max(a, b) for a, b in zip(oud.shape[1:], erbij.shape[1:]))
+            som = np.zeros(vorm, dtype=np.result_type(oud, erbij))
+            for deel, start in [(oud, self.eerste_dag), (erbij, eerste)]:
+                i = int((start - begin).astype('int64'))
+                som[(slice(i, i + len(deel)),) + tuple(slice(0, n) for n in deel.shape[1:])] += deel
+            nieuw[naam] = som
+        self.eerste_dag, self.velden = begin, nieuw
+
+    def voeg_toe(self, df):
+        if len(df) == 0:
+            return self
+        if self.referentie is None:
+            self.referentie = df[NUMERIEKE_KOLOMMEN].to_numpy(dtype='float64').mean(axis=0)
+        self._tel_op(*self._van_sessies(df))
+        self._prefix = None
+        return self
+
+    def samenvoegen(self, ander):
+        if not ander.velden:
+            return self
+        if self.referentie is None:
+            self.referentie = ander.referentie
+        velden = dict(ander.velden)
+        # correlatiesommen per dag omrekenen naar ons referentiepunt
+        d = ander.referentie - self.referentie
+        n = velden['n'].astype('float64')
+        som = velden['som']
+        velden['som'] = som + n[:, None] * d
+        velden['kruis'] = (velden['kruis'] + som[:, :, None] * d[None, None, :] + d[None, :, None] * som[:, None, :]
+                           + n[:, None, None] * np.outer(d, d))
+        self._tel_op(ander.eerste_dag, velden)
+        self._prefix = None
+        return self
+
+    def dagen(self):
+        return self.eerste_dag + np.arange(len(self))
+
+    def prefix(self):
+        # prefix[naam][i] = som over de eerste i dagen
+        if self._prefix is None:
+            self._prefix = {
+                naam: np.concatenate([np.zeros((1,) + w.shape[1:], dtype=w.dtype), np.cumsum(w, axis=0)])
+                for naam, w in self.velden.items()
+            }
+        return self._prefix
+
+    def som_over(self, begin, eind):
+        # totalen over de dagen begin t/m eind: twee binaire zoekacties en één aftrekking per veld
+        dagen = self.dagen()
+        i0 = np.searchsorted(dagen, np.datetime64(pd.Timestamp(begin).date()), side='left')
+        i1 = np.searchsorted(dagen, np.datetime64(pd.Timestamp(eind).date()), side='right')
+        prefix = self.prefix()
+        return {naam: p[i1] - p[i0] for naam, p in prefix.items()}
+
+
+# -----------------------
+# Aggregaten achter alle grafieken in tab2
+# -----------------------
+class Aggregaten:
+    def __init__(self):
+        self.n = 0
+        self.maxpower_telling = np.zeros(0, dtype='int64')
+        self.bezetting_uur = np.zeros(24, dtype='int64')
+        self.eerste_start = None
+        self.laatste_einde = None
+        self.versie = VERSIE
+        self.schetsen = {col: KwantielSchets() for col in TIJD_KOLOMMEN}
+        self.histogrammen = {col: np.zeros(int(round(HIST_MAX / HIST_BREEDTE)), dtype='int64') for col in TIJD_KOLOMMEN}
+        self.uitersten = {col: np.zeros(0) for col in TIJD_KOLOMMEN}
+        self.per_dag = DagTotalen()
+        # voldoende statistieken voor de correlatie, t.o.v. een vast referentiepunt
+        # (numeriek stabieler dan ruwe kwadratensommen)
+        self.referentie = None
+        self.som = np.zeros(len(NUMERIEKE_KOLOMMEN))
+        self.kruis = np.zeros((len(NUMERIEKE_KOLOMMEN), len(NUMERIEKE_KOLOMMEN)))
+        # tot waar het bronbestand verwerkt is, t.b.v. incrementeel bijwerken
+        self.bron_vingerafdruk = sessiecache.Vingerafdruk()
+
+    @property
+    def bron_positie(self):
+        return self.bron_vingerafdruk.positie
+
+    # ---- bijwerken ----
+    def voeg_toe(self, df):
+        if len(df) == 0:
+            return self
+        self.n += len(df)
+        self.tel_maxpower(df)
+        self.tel_bezetting(df)
+        self.tel_tijden(df)
+        self.tel_correlatie(df)
+        with meting.meet("dagtotalen", rijen=len(df)):
+            self.per_dag.voeg_toe(df)
+        return self
+
+    # de stappen van voeg_toe afzonderlijk (ook los te meten in benchmarks.suite)
+    def tel_maxpower(self, df):
+        vermogen = df['MaxPower'].to_numpy()
+        bins = maxpower_bins(vermogen[vermogen > MAXPOWER_START])
+        telling = np.bincount(bins, minlength=len(self.maxpower_telling))
+        telling[:len(self.maxpower_telling)] += self.maxpower_telling
+        self.maxpower_telling = telling
+
+    def tel_bezetting(self, df):
+        with meting.meet("bezetting (sweep)", rijen=len(df)):
+            self.bezetting_uur = self.bezetting_uur + bezetting.bezetting_per_uur(df['Started'], df['Ended'])
+        start, einde = df['Started'].min(), df['Ended'].max()
+        self.eerste_start = start if self.eerste_start is None else min(self.eerste_start, start)
+        self.laatste_einde = einde if self.laatste_einde is None else max(self.laatste_einde, einde)
+
+    def tel_tijden(self, df):
+        for col in TIJD_KOLOMMEN:
+            waarden = df[col].to_numpy(dtype='float64')
+            waarden = waarden[~np.isnan(waarden)]
+            self.schetsen[col].voeg_toe(waarden)
+            bins = hist_bins(waarden, len(self.histogrammen[col]))
+            self.histogrammen[col] += np.bincount(bins, minlength=len(self.histogrammen[col]))
+            self.uitersten[col] = _uitersten(np.r_[self.uitersten[col], waarden])
+
+    def tel_correlatie(self, df):
+        with meting.meet("correlatiesommen", rijen=len(df)):
+            x = df[NUMERIEKE_KOLOMMEN].to_numpy(dtype='float64')
+            if self.referentie is None:
+                self.referentie = x.mean(axis=0)
+            x = x - self.referentie
+            self.som += x.sum(axis=0)
+            self.kruis += x.T @ x
+
+    def samenvoegen(self, ander):
+        if ander.n == 0:
+            return self
+        if self.n == 0:
+            self.referentie = ander.referentie
+        self.n += ander.n
+
+        lengte = max(len(self.maxpower_telling), len(ander.maxpower_telling))
+        self.maxpower_telling = (
+            np.pad(self.maxpower_telling, (0, lengte - len(self.maxpower_telling)))
+            + np.pad(ander.maxpower_telling, (0, lengte - len(ander.maxpower_telling)))
+        )
+        self.bezetting_uur = self.bezetting_uur + ander.bezetting_uur
+        self.eerste_start = ander.eerste_start if self.eerste_start is None else min(self.eerste_start, ander.eerste_start)
+        self.laatste_einde = ander.laatste_einde if self.laatste_einde is None else max(self.laatste_einde, ander.laatste_einde)
+
+        for col in TIJD_KOLOMMEN:
+            self.schetsen[col].samenvoegen(ander.schetsen[col])
+            self.histogrammen[col] += ander.histogrammen[col]
+            self.uitersten[col] = _uitersten(np.r_[self.uitersten[col], ander.uitersten[col]])
+
+        # sommen van de ander omrekenen naar ons referentiepunt
+        d = ander.referentie - self.referentie
+        self.som += ander.som + ander.n * d
+        self.kruis += ander.kruis + np.outer(ander.som, d) + np.outer(d, ander.som) + ander.n * np.outer(d, d)
+        self.per_dag.samenvoegen(ander.per_dag)
+        return self
+
+    # ---- uitlezen ----
+    def maxpower_freq(self):
+        randen = MAXPOWER_START + MAXPOWER_BREEDTE * np.arange(len(self.maxpower_telling) + 1)
+        labels = [str(pd.Interval(int(a), int(b))) for a, b in zip(randen[:-1], randen[1:])]
+        return pd.DataFrame({'MaxPower_bin': labels, 'Frequency': self.maxpower_telling})
+
+    def dagen(self):
+        # kalenderdagen van de eerste start t/m het laatste einde, zoals Venster.dagen
+        if self.eerste_start is None:
+            return 1
+        return kalenderdagen(self.eerste_start, self.laatste_einde)
+
+    def gemiddelde_bezetting_per_uur(self):
+        return pd.DataFrame({
+            'Hour': range(24),
+            'AvgOccupancy': (self.bezetting_uur / self.dagen()).clip(min=0)
+        })
+
+    def totale_energie(self):
+        return float(self.per_dag.velden['energie'].sum()) if len(self.per_dag) else 0.0
+
+    def momenten(self, col):
+        # gemiddelde en standaardafwijking uit de sommen t.o.v. het referentiepunt
+        # (nan bij 0 sessies, sd nan bij 1 sessie)
+        i = NUMERIEKE_KOLOMMEN.index(col)
+        if self.n == 0:
+            return math.nan, math.nan
+        gemiddelde = self.referentie[i] + self.som[i] / self.n
+        if self.n < 2:
+            return gemiddelde, math.nan
+        variantie = (self.kruis[i, i] - self.som[i] ** 2 / self.n) / (self.n - 1)
+        return gemiddelde, math.sqrt(max(variantie, 0.0))
+
+    def box_statistieken(self, col):
+        schets = self.schetsen[col]
+        q1, mediaan, q3 = schets.kwantielen([0.25, 0.5, 0.75])
+        iqr = q3 - q1
+        gemiddelde, sd = self.momenten(col)
+        return {
+            'q1': q1, 'median': mediaan, 'q3': q3,
+            'lowerfence': schets.kleinste_vanaf(q1 - 1.5 * iqr),
+            'upperfence': schets.grootste_tot(q3 + 1.5 * iqr),
+            'mean': gemiddelde, 'sd': sd,
+            'min': schets.min, 'max': schets.max, 'n': schets.n,
+        }
+
+    def uitschieters(self, col, box=None):
+        # waarden buiten de snorharen, uit de bewaarde extremen (hooguit MAX_UITSCHIETERS per kant)
+        box = box or self.box_statistieken(col)
+        u = self.uitersten[col]
+        return u[(u < box['lowerfence']) | (u > box['upperfence'])]
+
+    def histogram(self, col):
+        aantal = self.histogrammen[col]
+        return pd.DataFrame({
+            'van': HIST_BREEDTE * np.arange(len(aantal)),
+            'tot': HIST_BREEDTE * np.arange(1, len(aantal) + 1),
+            'aantal': aantal,
+        })
+
+    def correlatie(self):
+        covariantie = self.kruis - np.outer(self.som, self.som) / self.n
+        sd = np.sqrt(np.diag(covariantie))
+        return pd.DataFrame(covariantie / np.outer(sd, sd), index=NUMERIEKE_KOLOMMEN, columns=NUMERIEKE_KOLOMMEN)
+
+    def venster(self, begin, eind):
+        return Venster(self, begin, eind)
+
+
+class Venster(Aggregaten):
+    # dezelfde uitleesmethoden als Aggregaten, voor alleen de dagen begin t/m eind;
+    # kwartielen en uitschieters komen hier uit de vaste histogrambins (0.1 uur)
+    def __init__(self, agg, begin, eind):
+        super().__init__()
+        totalen = agg.per_dag.som_over(begin, eind)
+        self.begin = pd.Timestamp(begin).normalize()
+        self.eind = pd.Timestamp(eind).normalize()
+        self.n = int(totalen['n'])
+        self.energie = float(totalen['energie'])
+        self.maxpower_telling = totalen['maxpower']
+        self.bezetting_uur = totalen['bezetting']
+        self.histogrammen = {col: totalen['hist_' + col] for col in TIJD_KOLOMMEN}
+        self.referentie = agg.per_dag.referentie
+        self.som = totalen['som']
+        self.kruis = totalen['kruis']
+
+    def dagen(self):
+        return kalenderdagen(self.begin, self.eind)
+
+    def totale_energie(self):
+        return self.energie
+
+    def box_statistieken(self, col):
+        aantal = self.histogrammen[col]
+        cumulatief = np.cumsum(aantal)
+        # lineair geïnterpoleerd binnen de bin waarin de rang valt
+        rang = np.array([0.25, 0.5, 0.75]) * cumulatief[-1]
+        i = np.minimum(np.searchsorted(cumulatief, rang), len(aantal) - 1)
+        q1, mediaan, q3 = (i + (rang - cumulatief[i] + aantal[i]) / np.maximum(aantal[i], 1)) * HIST_BREEDTE
+        iqr = q3 - q1
+        midden = (np.flatnonzero(aantal) + 0.5) * HIST_BREEDTE
+        laag, hoog = midden[midden >= q1 - 1.5 * iqr], midden[midden <= q3 + 1.5 * iqr]
+        gemiddelde, sd = self.momenten(col)
+        return {
+            'q1': q1, 'median': mediaan, 'q3': q3,
+            'lowerfence': laag.min() if len(laag) else q1,
+            'upperfence': hoog.max() if len(hoog) else q3,
+            'mean': gemiddelde, 'sd': sd,
+            'min': midden.min(), 'max': midden.max(), 'n': int(cumulatief[-1]),
+        }
+
+    def uitschieters(self, col, box=None):
+        # één punt per bezette bin buiten de snorharen
+        box = box or self.box_statistieken(col)
+        midden = (np.flatnonzero(self.histogrammen[col]) + 0.5) * HIST_BREEDTE
+        return midden[(midden < box['lowerfence']) | (midden > box['upperfence'])]
+
+
+# -----------------------
+# Sessielog in blokken van vaste grootte lezen (geheugengebruik onafhankelijk van de lengte)
+# -----------------------
+def kop_lengte(pad):
+    with open(pad, 'rb') as f:
+        return len(f.readline())
+
+
+def regel_grens(pad):
+    # positie net na de laatste volledige regel; een half weggeschreven regel blijft liggen
+    with open(pad, 'rb') as f:
+        eind = f.seek(0, os.SEEK_END)
+        while eind > 0:
+            stap = min(65536, eind)
+            f.seek(eind - stap)
+            i = f.read(stap).rfind(b'\n')
+            if i >= 0:
+                return eind - stap + i + 1
+            eind -= stap
+    return 0
+
+
+def blokken(pad, begin, eind, blok_bytes=BLOK_BYTES):
+    # (begin, eind) van opeenvolgende blokken van ~blok_bytes, afgekapt op regelgrenzen
+    with open(pad, 'rb') as f:
+        while begin < eind:
+            grens = eind
+            if begin + blok_bytes < eind:
+                f.seek(begin + blok_bytes)
+                f.readline()
+                grens = min(f.tell(), eind)
+            yield begin, grens
+            begin = grens
+
+
+def blok_bestand(pad, begin, eind):
+    # kopregel + de bytes van het blok als los CSV-bestand in het geheugen
+    with open(pad, 'rb') as f:
+        kop = f.readline()
+        f.seek(begin)
+        tekst = f.read(eind - begin)
+    return io.BytesIO(kop + tekst)
+
+
+def lees_blok(pad, begin, eind):
+    with meting.meet("sessieblok inlezen (CSV + to_datetime)", bytes=eind - begin) as m:
+        df = data.lees_sessies(blok_bestand(pad, begin, eind))
+        m.rijen = len(df)
+    return df
+
+
+def sessies(pad, begin, eind, vingerafdruk, blok_bytes=BLOK_BYTES):
+    # geparste sessies uit de bytes [begin, eind) van het log, blok voor blok; vingerafdruk (van
+    # [0, begin)) wordt bijgewerkt tot eind. Vanaf het begin van het log komen ze uit de
+    # sessiecache voor zover die geldig is; wat daarna nog uit de CSV moet, komt samen met de
+    # oude inhoud in een nieuwe cache
+    if begin > kop_lengte(pad):
+        vingerafdruk.werk_bij(pad, eind)
+        for blok in blokken(pad, begin, eind, blok_bytes):
+            yield lees_blok(pad, *blok)
+        return
+
+    with meting.meet("sessiecache openen", cache=True) as m:
+        tabel, cache_afdruk = sessiecache.open_cache(pad)
+        if tabel is None:
+            meting.mis("sessiecache openen")
+        else:
+            m.rijen = tabel.num_rows
+    positie = 0
+    if tabel is not None:
+        # de cache dekt [0, positie): vanaf daar verder met zijn vingerafdruk
+        vingerafdruk.neem_over(cache_afdruk)
+        positie = cache_afdruk.positie
+        for batch in tabel.to_batches():
+            yield sessiecache.als_frame(batch)
+        if positie == eind:
+            return
+
+    # alleen de nieuwe bytes hashen, vóór het inlezen: de vingerafdruk staat in de kop van de cache
+    vingerafdruk.werk_bij(pad, eind)
+    with sessiecache.Schrijver(pad, vingerafdruk) as schrijver:
+        if tabel is not None:
+            schrijver.schrijf_tabel(tabel)
+        for blok in blokken(pad, max(positie, begin), eind, blok_bytes):
+            df = lees_blok(pad, *blok)
+            schrijver.schrijf(df)
+            yield df
+
+
+# -----------------------
+# Alleen nieuw toegevoegde regels van het sessielog verwerken
+# -----------------------
+def werk_bij(aggregaten, pad=data.SESSIES_CSV, blok_bytes=BLOK_BYTES):
+    # bestand ingekort of herschreven => opnieuw beginnen
+    if not aggregaten.bron_vingerafdruk.klopt(pad):
+        aggregaten = Aggregaten()
+
+    # nieuwe regels blok voor blok: nooit meer dan één blok sessies tegelijk in het geheugen
+    begin = max(aggregaten.bron_positie, kop_lengte(pad))
+    eind = max(regel_grens(pad), begin)
+    # pas na het laatste blok overnemen: een fout halverwege laat de positie staan
+    vingerafdruk = sessiecache.Vingerafdruk().neem_over(aggregaten.bron_vingerafdruk)
+    with meting.meet("sessielog bijwerken", bytes=eind - begin) as m:
+        n = aggregaten.n
+        for df in sessies(pad, begin, eind, vingerafdruk, blok_bytes):
+            aggregaten.voeg_toe(df)
+        m.rijen = aggregaten.n - n
+    aggregaten.bron_vingerafdruk = vingerafdruk
+    return aggregaten
+
+
+def laad_of_werk_bij(pad=data.SESSIES_CSV, opslag=AGGREGATEN_PAD):
+    aggregaten = Aggregaten()
+    if os.path.exists(opslag):
+        with open(opslag, 'rb') as f:
+            aggregaten = pickle.load(f)
+        # opgeslagen in een ouder formaat => opnieuw opbouwen
+        if getattr(aggregaten, 'versie', 1) != VERSIE:
+            aggregaten = Aggregaten()
+
+    positie = aggregaten.bron_positie
+    aggregaten = werk_bij(aggregaten, pad)
+    if aggregaten.bron_positie != positie:
+        os.makedirs(os.path.dirname(opslag), exist_ok=True)
+        tijdelijk = data.tijdelijk_pad(opslag)
+        with open(tijdelijk, 'wb') as f:
+            pickle.dump(aggregaten, f)
+        os.replace(tijdelijk, opslag)
+    return aggregaten
+
+
+# -----------------------
+# Ingestie: python -m aggregaten bouwt de sessiecache en de aggregaten vooraf op
+# -----------------------
+if __name__ == "__main__":
+    # via de geïmporteerde module: anders staat Aggregaten als __main__.Aggregaten in de pickle
+    # en kan de app hem niet laden
+    import aggregaten
+
+    agg = aggregaten.laad_of_werk_bij()
+    print(f"{data.SESSIES_CSV} -> {sessiecache.cache_pad(data.SESSIES_CSV)}, {AGGREGATEN_PAD} ({agg.n} sessies)")
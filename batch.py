@@ -0,0 +1,87 @@
+# Tab2-analyses zonder Streamlit over één of meer sessielogs, verdeeld over processen.
+#   python -m batch sessies.csv [meer.csv ...] [--processen N] [--blok-mb 64] [--uit map]
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+import aggregaten
+
+BLOK_BYTES = 64 * 1024 ** 2
+
+
+# -----------------------
+# Sessielog -> blokken op regelgrenzen
+# -----------------------
+def blokken(pad, blok_bytes=BLOK_BYTES):
+    # (pad, begin, eind) in bytes; de grenzen hangen alleen af van het bestand en
+    # blok_bytes, niet van het aantal processen
+    for begin, eind in aggregaten.blokken(pad, aggregaten.kop_lengte(pad), os.path.getsize(pad), blok_bytes):
+        yield pad, begin, eind
+
+
+def verwerk_blok(blok):
+    # draait in een werkproces: alleen (pad, begin, eind) gaat heen, alleen de aggregaten terug
+    return aggregaten.Aggregaten().voeg_toe(aggregaten.lees_blok(*blok))
+
+
+# -----------------------
+# Blokken parallel verwerken, deelresultaten in vaste volgorde samenvoegen
+# -----------------------
+def analyseer(paden, processen=1, blok_bytes=BLOK_BYTES):
+    # dezelfde blokken in dezelfde volgorde samengevoegd => bit-voor-bit dezelfde
+    # uitkomst bij elk aantal processen
+    taken = [blok for pad in paden for blok in blokken(pad, blok_bytes)]
+    totaal = aggregaten.Aggregaten()
+    if processen == 1:
+        for deel in map(verwerk_blok, taken):
+            totaal.samenvoegen(deel)
+    else:
+        with ProcessPoolExecutor(processen) as pool:
+            for deel in pool.map(verwerk_blok, taken):
+                totaal.samenvoegen(deel)
+    return totaal
+
+
+def resultaten(agg):
+    # dezelfde tabellen als achter de grafieken in tab2; zonder sessies (alleen koppen) zijn
+    # kwartielen, grenzen en correlaties niet gedefinieerd
+    if agg.n == 0:
+        raise ValueError("geen sessies om te analyseren")
+    box = pd.DataFrame([agg.box_statistieken(col) for col in aggregaten.TIJD_KOLOMMEN], index=aggregaten.TIJD_KOLOMMEN)
+    return {
+        'maxpower': agg.maxpower_freq(),
+        'bezetting_per_uur': agg.gemiddelde_bezetting_per_uur(),
+        'tijden_box': box.rename_axis('kolom').reset_index(),
+        'tijden_histogram': pd.concat(
+            [agg.histogram(col).assign(kolom=col) for col in aggregaten.TIJD_KOLOMMEN], ignore_index=True
+        ),
+        'correlatie': agg.correlatie().rename_axis('kolom').reset_index(),
+    }
+
+
+def schrijf_resultaten(agg, map_):
+    os.makedirs(map_, exist_ok=True)
+    paden = []
+    for naam, df in resultaten(agg).items():
+        pad = os.path.join(map_, f"{naam}.csv")
+        df.to_csv(pad, index=False)
+        paden.append(pad)
+    return paden
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tab2-analyses over sessielogs, verdeeld over processen")
+    parser.add_argument("paden", nargs="+", help="sessielogs in het formaat van laadpaaldata_cleaned.csv")
+    parser.add_argument("--processen", type=int, default=os.cpu_count())
+    parser.add_argument("--blok-mb", type=float, default=BLOK_BYTES / 1024 ** 2)
+    parser.add_argument("--uit", default="resultaten")
+    args = parser.parse_args()
+
+    agg = analyseer(args.paden, args.processen, int(args.blok_mb * 1024 ** 2))
+    if agg.n == 0:
+        parser.exit(1, f"geen sessies in {', '.join(args.paden)}; er is niets geschreven\n")
+    print(f"{agg.n} sessies uit {len(args.paden)} bestand(en)")
+    for pad in schrijf_resultaten(agg, args.uit):
+        print(pad)
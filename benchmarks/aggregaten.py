@@ -0,0 +1,36 @@
+# Volledig herberekenen vs. incrementeel bijwerken van de tab2-aggregaten.
+#   python -m benchmarks.aggregaten [aantal sessies] [aantal nieuwe sessies]
+import os
+import sys
+import tempfile
+import time
+
+import aggregaten
+from benchmarks.synthetisch import sessies
+
+
+def main(n, erbij):
+    with tempfile.TemporaryDirectory() as map_:
+        pad = os.path.join(map_, "sessies.csv")
+        opslag = os.path.join(map_, "aggregaten.pkl")
+        sessies(n, seed=0).to_csv(pad, index=False, date_format='%Y-%m-%d %H:%M:%S')
+
+        t0 = time.perf_counter()
+        aggregaten.laad_of_werk_bij(pad, opslag)
+        t1 = time.perf_counter()
+        print(f"eerste opbouw ({n} sessies):        {t1 - t0:.3f} s")
+
+        aggregaten.laad_of_werk_bij(pad, opslag)
+        t2 = time.perf_counter()
+        print(f"paginalading zonder nieuwe sessies: {t2 - t1:.3f} s")
+
+        sessies(erbij, seed=1).to_csv(pad, mode='a', header=False, index=False, date_format='%Y-%m-%d %H:%M:%S')
+        t3 = time.perf_counter()
+        agg = aggregaten.laad_of_werk_bij(pad, opslag)
+        t4 = time.perf_counter()
+        print(f"bijwerken met {erbij} nieuwe sessies: {t4 - t3:.3f} s  (totaal {agg.n})")
+
+
+if __name__ == "__main__":
+    argumenten = [int(a) for a in sys.argv[1:]]
+    main(*(argumenten + [1_000_000, 10_000][len(argumenten):]))
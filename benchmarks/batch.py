@@ -0,0 +1,55 @@
+# Doorvoer van de batch-analyse per aantal processen, plus controle dat de uitkomst
+# bij elk aantal processen byte-voor-byte gelijk is.
+#   python -m benchmarks.batch [sessies per bestand] [aantal bestanden] [blok-MB]
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+import aggregaten
+import batch
+import data
+from benchmarks.synthetisch import schrijf_sessies_csv
+
+
+def uitkomst_bytes(map_):
+    return {naam: open(os.path.join(map_, naam), 'rb').read() for naam in sorted(os.listdir(map_))}
+
+
+def main(n, bestanden, blok_mb):
+    with tempfile.TemporaryDirectory() as map_:
+        paden = [schrijf_sessies_csv(os.path.join(map_, f"sessies_{i}.csv"), n, seed=i) for i in range(bestanden)]
+        blok_bytes = int(blok_mb * 1024 ** 2)
+        print(f"{bestanden} x {n} sessies, {len(list(batch.blokken(paden[0], blok_bytes)))} blokken per bestand, "
+              f"{os.cpu_count()} cores")
+
+        referentie = None
+        aantallen = sorted({1, 2, 4, os.cpu_count() or 1})
+        for processen in aantallen:
+            t0 = time.perf_counter()
+            agg = batch.analyseer(paden, processen, blok_bytes)
+            duur = time.perf_counter() - t0
+            uit = os.path.join(map_, f"uit_{processen}")
+            batch.schrijf_resultaten(agg, uit)
+            bytes_ = uitkomst_bytes(uit)
+            referentie = referentie or bytes_
+            gelijk = "identiek" if bytes_ == referentie else "AFWIJKEND"
+            print(f"{processen:2d} processen: {duur:6.2f} s  {agg.n / duur:10.0f} sessies/s  {gelijk}")
+            assert bytes_ == referentie
+
+        # tegen de app-route (hele bestanden in één keer): gelijk op afronding na
+        los = aggregaten.Aggregaten()
+        for pad in paden:
+            los.voeg_toe(data.lees_sessies(pad))
+        assert (los.maxpower_telling == agg.maxpower_telling).all()
+        assert (los.bezetting_uur == agg.bezetting_uur).all()
+        assert np.allclose(los.correlatie(), agg.correlatie())
+
+
+if __name__ == "__main__":
+    argumenten = [float(a) for a in sys.argv[1:]]
+    standaard = [500_000, 4, 8]
+    n, bestanden, blok_mb = argumenten + standaard[len(argumenten):]
+    main(int(n), int(bestanden), blok_mb)
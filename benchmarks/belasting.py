@@ -0,0 +1,164 @@
+# Belastingstest: N gelijktijdige sessies tegen een lokale Streamlit-server, via hetzelfde
+# websocketprotocol als de browser. Elke sessie loopt de pagina's langs; per N de p50/p95 van
+# de rerun-tijd en het geheugen van de serverprocessen: RSS en PSS (gedeelde pagina's, zoals
+# memory-mapped Arrow-bestanden, naar rato over de processen verdeeld).
+#   python -m benchmarks.belasting [--sessies 1 2 4 8] [--processen 1] [--rondes 2] [--script ...]
+import argparse
+import asyncio
+import socket
+import subprocess
+import sys
+import time
+
+import numpy as np
+import requests
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from tornado.websocket import websocket_connect
+
+# de paginakeuze (option_menu met key="pagina"); de id komt uit de eerste run
+PAGINA_SLEUTEL = "-pagina"
+RONDE = ["Laadpalen map", "Oplaad data", "Laadcapaciteit", "Voertuigverdeling over de tijd"]
+
+
+# -----------------------
+# Serverprocessen
+# -----------------------
+def vrije_poort():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(script):
+    poort = vrije_poort()
+    proces = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", script, "--server.headless", "true",
+         "--server.port", str(poort), "--server.fileWatcherType", "none", "--browser.gatherUsageStats", "false"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    for _ in range(600):
+        try:
+            if requests.get(f"http://127.0.0.1:{poort}/_stcore/health", timeout=1).ok:
+                return proces, f"ws://127.0.0.1:{poort}/_stcore/stream"
+        except requests.ConnectionError:
+            pass
+        if proces.poll() is not None:
+            break
+        time.sleep(0.1)
+    proces.kill()
+    raise RuntimeError(f"server voor {script} start niet")
+
+
+def geheugen(pid):
+    # (RSS, PSS) in bytes; smaps_rollup bestaat alleen op Linux
+    waarden = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for regel in f:
+            delen = regel.split()
+            if delen[0] in ("Rss:", "Pss:"):
+                waarden[delen[0]] = int(delen[1]) * 1024
+    return waarden["Rss:"], waarden["Pss:"]
+
+
+# -----------------------
+# Eén sessie: BackMsg.rerun_script sturen, ForwardMsgs lezen tot script_finished
+# -----------------------
+class Sessie:
+    def __init__(self, url):
+        self.url = url
+        self.ws = None
+        self.pagina_id = None
+        self.fouten = 0
+
+    async def verbind(self):
+        self.ws = await websocket_connect(self.url, subprotocols=["streamlit"])
+
+    async def rerun(self, pagina=None):
+        msg = BackMsg()
+        msg.rerun_script.SetInParent()
+        if pagina is not None:
+            widget = msg.rerun_script.widget_states.widgets.add()
+            widget.id = self.pagina_id
+            widget.json_value = f'"{pagina}"'
+        t0 = time.perf_counter()
+        await self.ws.write_message(msg.SerializeToString(), binary=True)
+        while True:
+            inhoud = await self.ws.read_message()
+            if inhoud is None:
+                raise ConnectionError("websocket gesloten")
+            fmsg = ForwardMsg()
+            fmsg.ParseFromString(inhoud)
+            soort = fmsg.WhichOneof("type")
+            if soort == "delta" and fmsg.delta.WhichOneof("type") == "new_element":
+                element = fmsg.delta.new_element
+                if element.WhichOneof("type") == "exception":
+                    self.fouten += 1
+                elif element.WhichOneof("type") == "component_instance" and element.component_instance.id.endswith(PAGINA_SLEUTEL):
+                    self.pagina_id = element.component_instance.id
+            elif soort == "script_finished":
+                return time.perf_counter() - t0
+
+    def sluit(self):
+        self.ws.close()
+
+
+async def gebruiker(url, rondes):
+    # eerste keer laden, dan `rondes` keer alle pagina's langs (elke paginakeuze is een rerun)
+    sessie = Sessie(url)
+    await sessie.verbind()
+    eerste = await sessie.rerun()
+    tijden = [await sessie.rerun(pagina) for _ in range(rondes) for pagina in RONDE]
+    return sessie, eerste, tijden
+
+
+# -----------------------
+# Meting per aantal sessies
+# -----------------------
+async def stap(servers, n, rondes):
+    # n sessies tegelijk, om de beurt over de serverprocessen verdeeld
+    t0 = time.perf_counter()
+    uitkomst = await asyncio.gather(*(gebruiker(servers[i % len(servers)][1], rondes) for i in range(n)))
+    duur = time.perf_counter() - t0
+    # geheugen terwijl alle sessies nog verbonden zijn (sessiestatus incl.)
+    rss, pss = np.sum([geheugen(proces.pid) for proces, _ in servers], axis=0)
+    for sessie, _, _ in uitkomst:
+        sessie.sluit()
+    return {
+        "tijden": np.concatenate([t for _, _, t in uitkomst]),
+        "fouten": sum(s.fouten for s, _, _ in uitkomst),
+        "duur": duur, "rss": rss, "pss": pss,
+    }
+
+
+async def meet(servers, sessies, rondes):
+    # opwarmen: één sessie per proces vult de caches (koude start telt niet mee)
+    opwarmen = await stap(servers, len(servers), 1)
+    print(f"{len(servers)} serverproces(sen), opwarmen {opwarmen['duur']:.1f} s; per sessie {rondes}x {len(RONDE)} pagina's\n")
+    print(f"{'sessies':>8} {'reruns':>7} {'p50 (ms)':>9} {'p95 (ms)':>9} {'max (ms)':>9} {'fouten':>7} "
+          f"{'RSS (MB)':>9} {'PSS (MB)':>9}")
+    for n in sessies:
+        r = await stap(servers, n, rondes)
+        p50, p95 = np.percentile(r["tijden"], [50, 95]) * 1000
+        print(f"{n:>8} {len(r['tijden']):>7} {p50:>9.0f} {p95:>9.0f} {r['tijden'].max() * 1000:>9.0f} {r['fouten']:>7} "
+              f"{r['rss'] / 1024 ** 2:>9.0f} {r['pss'] / 1024 ** 2:>9.0f}")
+
+
+def main(sessies, processen, rondes, script):
+    servers = [start_server(script) for _ in range(processen)]
+    try:
+        asyncio.run(meet(servers, sessies, rondes))
+    finally:
+        for proces, _ in servers:
+            proces.terminate()
+            proces.wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rerun-latentie en servergeheugen bij N gelijktijdige sessies")
+    parser.add_argument("--sessies", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--processen", type=int, default=1, help="aantal serverprocessen; sessies worden verdeeld")
+    parser.add_argument("--rondes", type=int, default=2)
+    parser.add_argument("--script", default="laadpalensteamlit.py")
+    args = parser.parse_args()
+    main(args.sessies, args.processen, args.rondes, args.script)
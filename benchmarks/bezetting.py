@@ -0,0 +1,37 @@
+# Snelheid van de sweep-line bezetting t.o.v. de oude 24-voudige maskerlus; de vergelijking
+# van de uitkomsten staat in tests/test_bezetting.py.
+#   python -m benchmarks.bezetting [aantal sessies ...]
+import sys
+import time
+
+import numpy as np
+
+import bezetting
+from benchmarks.synthetisch import sessies
+
+
+def naief_per_uur(df):
+    # de oorspronkelijke lus uit tab2
+    occupancy = []
+    for hour in range(24):
+        active = df[(df['Started'].dt.hour <= hour) & (df['Ended'].dt.hour > hour)]
+        occupancy.append(len(active))
+    return np.array(occupancy)
+
+
+def main(aantallen):
+    print(f"{'sessies':>10} {'oude lus (s)':>13} {'per uur (s)':>12} {'per minuut (s)':>15}")
+    for n in aantallen:
+        df = sessies(n, seed=2)
+        t0 = time.perf_counter()
+        naief_per_uur(df)
+        t1 = time.perf_counter()
+        bezetting.bezetting_per_uur(df['Started'], df['Ended'])
+        t2 = time.perf_counter()
+        bezetting.bezetting_per_minuut(df['Started'], df['Ended'])
+        t3 = time.perf_counter()
+        print(f"{n:>10} {t1 - t0:>13.3f} {t2 - t1:>12.3f} {t3 - t2:>15.3f}")
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [10_000, 1_000_000, 5_000_000])
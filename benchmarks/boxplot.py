@@ -0,0 +1,42 @@
+# Omvang van de boxplot-figuur: alle ruwe punten (px.box op de melt) vs. vooraf berekende
+# box-statistieken met een begrensde set uitschieters.
+#   python -m benchmarks.boxplot [aantal sessies ...]
+import sys
+
+import plotly.express as px
+import plotly.graph_objects as go
+
+import aggregaten
+from benchmarks.synthetisch import sessies
+
+
+def ruwe_figuur(df):
+    df_compare = df[['ConnectedTime', 'ChargeTime']].melt(var_name='Soort', value_name='Tijd')
+    return px.box(df_compare, x='Soort', y='Tijd', color='Soort')
+
+
+def voorberekende_figuur(agg):
+    fig = go.Figure()
+    for col in aggregaten.TIJD_KOLOMMEN:
+        box = agg.box_statistieken(col)
+        fig.add_trace(go.Box(
+            name=col, x=[col], q1=[box['q1']], median=[box['median']], q3=[box['q3']],
+            lowerfence=[box['lowerfence']], upperfence=[box['upperfence']], mean=[box['mean']], sd=[box['sd']]
+        ))
+        uitschieters = agg.uitschieters(col, box)
+        fig.add_trace(go.Scatter(x=[col] * len(uitschieters), y=uitschieters, mode='markers'))
+    return fig
+
+
+def main(aantallen):
+    print(f"{'sessies':>10} {'ruwe punten (kB)':>17} {'voorberekend (kB)':>18}")
+    for n in aantallen:
+        df = sessies(n, seed=0)
+        agg = aggregaten.Aggregaten().voeg_toe(df)
+        ruw = len(ruwe_figuur(df).to_json()) / 1024
+        voor = len(voorberekende_figuur(agg).to_json()) / 1024
+        print(f"{n:>10} {ruw:>17.0f} {voor:>18.1f}")
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [10_000, 100_000, 1_000_000])
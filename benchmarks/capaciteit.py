@@ -0,0 +1,65 @@
+# Controleert het capaciteitsmodel (broadcast over scenario x jaar x provincie x uur) tegen een
+# lus per (scenario, jaar, provincie) en meet de rekentijd per sliderstand.
+#   python -m benchmarks.capaciteit [aantal scenario's ...]
+import sys
+import time
+
+import numpy as np
+
+import capaciteit
+
+JAREN = np.arange(2025, 2031)
+PROVINCIES = 12
+
+
+def invoer(scenarios, seed=0):
+    rng = np.random.default_rng(seed)
+    vloot = 1.6e6 * np.cumprod(1 + rng.uniform(0.03, 0.1, (scenarios, len(JAREN))), axis=1)
+    aandeel = rng.dirichlet(np.ones(PROVINCIES))
+    laadpunten = 180_000 * rng.dirichlet(np.ones(PROVINCIES))
+    profiel = 0.1 + 0.2 * np.sin(np.linspace(0, np.pi, 24))
+    sessies_per_ev = rng.uniform(0.05, 0.2, scenarios)
+    groei = rng.uniform(0.0, 0.2, scenarios)
+    return vloot, aandeel, laadpunten, profiel, sessies_per_ev, groei, JAREN - JAREN[0]
+
+
+def per_lus(vloot, aandeel, laadpunten, profiel, sessies_per_ev, groei, jaren_vooruit):
+    piek = np.empty(vloot.shape + aandeel.shape)
+    benutting = np.empty(piek.shape + profiel.shape)
+    for s in range(vloot.shape[0]):
+        for t in range(vloot.shape[1]):
+            for p in range(len(aandeel)):
+                vraag = vloot[s, t] * sessies_per_ev[s] * aandeel[p] * profiel
+                punten = laadpunten[p] * (1 + groei[s]) ** jaren_vooruit[t]
+                benutting[s, t, p] = vraag / punten
+                piek[s, t, p] = vraag.max()
+    return piek, benutting
+
+
+def tijd(functie, *args, herhalingen=20):
+    beste = float('inf')
+    for _ in range(herhalingen):
+        t0 = time.perf_counter()
+        functie(*args)
+        beste = min(beste, time.perf_counter() - t0)
+    return beste
+
+
+def main(aantallen):
+    args = invoer(7)
+    uitkomst = capaciteit.bereken(*args)
+    piek, benutting = per_lus(*args)
+    assert np.allclose(uitkomst['piek'], piek) and np.allclose(uitkomst['benutting'], benutting)
+    print("correct t.o.v. de lus per (scenario, jaar, provincie)")
+
+    print(f"{'scenarios':>10} {'cellen':>10} {'lus (ms)':>10} {'broadcast (ms)':>15}")
+    for n in aantallen:
+        args = invoer(n)
+        cellen = n * len(JAREN) * PROVINCIES * 24
+        lus = tijd(per_lus, *args, herhalingen=3)
+        broadcast = tijd(capaciteit.bereken, *args)
+        print(f"{n:>10} {cellen:>10} {lus * 1000:>10.1f} {broadcast * 1000:>15.3f}")
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [3, 30, 300])
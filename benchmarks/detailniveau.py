@@ -0,0 +1,39 @@
+# Payload per beeld met het detailniveau, van heel Nederland tot straatniveau.
+#   python -m benchmarks.detailniveau [aantal laadpalen ...]
+import math
+import sys
+import time
+
+import detailniveau
+import kaart
+from benchmarks import synthetisch
+
+BREEDTE, HOOGTE = 1750, 750
+
+
+def beeld(lat, lon, zoom):
+    # (zuid, west, noord, oost) van een kaart van BREEDTE x HOOGTE pixels
+    breedte = BREEDTE * 360 / (256 * 2 ** zoom)
+    hoogte = HOOGTE * 360 / (256 * 2 ** zoom) * math.cos(math.radians(lat))
+    return lat - hoogte / 2, lon - breedte / 2, lat + hoogte / 2, lon + breedte / 2
+
+
+def main(aantallen):
+    print(f"{'laadpalen':>10} {'zoom':>5} {'clusters':>9} {'punten':>7} {'vraag (ms)':>11} {'payload (kB)':>13}")
+    for n in aantallen:
+        gdf = synthetisch.laadpalen(n)
+        t0 = time.perf_counter()
+        index = detailniveau.DetailIndex(gdf['AddressInfo.Longitude'], gdf['AddressInfo.Latitude'], gdf['AddressInfo.Title'])
+        print(f"{n:>10} index opgebouwd in {time.perf_counter() - t0:.2f} s")
+        for zoom in [7, 9, 11, 13, 15]:
+            grenzen = beeld(52.09, 5.12, zoom)
+            index.vraag(*grenzen, zoom)  # niveau opbouwen telt niet mee
+            t1 = time.perf_counter()
+            clusters, punten = index.vraag(*grenzen, zoom)
+            t2 = time.perf_counter()
+            html = kaart.kaart_html(kaart.bouw_detail_kaart(clusters, punten, [52.09, 5.12], zoom))
+            print(f"{n:>10} {zoom:>5} {len(clusters):>9} {len(punten):>7} {(t2 - t1) * 1000:>11.1f} {len(html.encode()) / 1e3:>13.1f}")
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [10_000, 1_000_000])
@@ -0,0 +1,49 @@
+# Figuur opnieuw bouwen vs. uit de figuurcache halen (tab2-correlatieheatmap).
+#   python -m benchmarks.figuren [aantal sessies] [herhalingen]
+import sys
+import time
+
+import plotly.express as px
+
+import aggregaten
+import figuren
+import meting
+from benchmarks.synthetisch import sessies
+
+
+def bouw(agg):
+    fig = px.imshow(agg.correlatie(), text_auto=True, color_continuous_scale='RdBu_r', zmin=-1, zmax=1)
+    fig.update_layout(plot_bgcolor='#1e222b', paper_bgcolor='#1e222b', font=dict(color='white', size=20))
+    return fig
+
+
+def main(n, herhalingen):
+    agg = aggregaten.Aggregaten()
+    agg.voeg_toe(sessies(n, seed=0))
+
+    t0 = time.perf_counter()
+    for _ in range(herhalingen):
+        bouw(agg).to_json()
+    t1 = time.perf_counter()
+    print(f"elke rerun opnieuw bouwen:   {(t1 - t0) / herhalingen * 1000:.2f} ms")
+
+    cache = figuren.FiguurCache(max_figuren=4)
+    t2 = time.perf_counter()
+    for _ in range(herhalingen):
+        # wat st.plotly_chart met een figuur doet: to_dict + JSON
+        cache.haal("correlatie", ("versie", 1), lambda: bouw(agg)).to_json()
+    t3 = time.perf_counter()
+    print(f"uit de figuurcache:          {(t3 - t2) / herhalingen * 1000:.2f} ms")
+
+    # LRU-grens: na 10 verschillende staten staan er nog maar 4 in de cache
+    for i in range(10):
+        cache.haal("correlatie", ("versie", i), lambda: bouw(agg))
+    aantal, omvang = cache.omvang()
+    assert aantal == 4, aantal
+    print(meting.overzicht().to_string(index=False))
+    print(f"{aantal} figuren, {omvang / 1024:.0f} kB")
+
+
+if __name__ == "__main__":
+    argumenten = [int(a) for a in sys.argv[1:]]
+    main(*(argumenten + [100_000, 50][len(argumenten):]))
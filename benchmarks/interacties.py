@@ -0,0 +1,62 @@
+# Rerun-latentie per interactie, gemeten met Streamlits AppTest.
+#   python -m benchmarks.interacties [script]
+# Met een ouder script (bv. `git show <commit>:laadpalensteamlit.py > /tmp/oud.py`) zijn
+# de cijfers van voor/na te vergelijken; de paginakeuze is daar een gewone rerun.
+import os
+import sys
+import time
+
+from streamlit.testing.v1 import AppTest
+
+from benchmarks import synthetisch
+
+
+def provincies_offline():
+    # de provinciegrenzen komen normaal van internet; voor de meting synthetische polygonen
+    # (oudere scripts lezen de URL direct met gpd.read_file, nieuwere via provincies.lees_provincies;
+    # sinds de voorbereide grenzen geeft die een Provinciegrenzen in plaats van een GeoDataFrame)
+    import geopandas as gpd
+
+    import provincies
+    origineel = gpd.read_file
+    gpd.read_file = lambda url, *a, **k: synthetisch.provincies() if str(url).startswith("http") else origineel(url, *a, **k)
+    if hasattr(provincies, "bereid_voor"):
+        grenzen = provincies.bereid_voor(synthetisch.provincies())
+        provincies.lees_provincies = lambda *a, **k: grenzen
+    else:
+        provincies.lees_provincies = lambda *a, **k: synthetisch.provincies()
+
+
+def main(script):
+    sys.path.insert(0, os.getcwd())
+    at = AppTest.from_file(script, default_timeout=300)
+    if script != "laadpalensteamlit.py":
+        # een ouder script laadt de kaart (en dus de provincies) al bij de eerste run
+        provincies_offline()
+
+    def stap(naam, actie=None):
+        if actie is not None:
+            actie()
+        t0 = time.perf_counter()
+        at.run()
+        duur = time.perf_counter() - t0
+        assert not at.exception, at.exception
+        zwaar = [m for m in ("geopandas", "shapely", "folium") if m in sys.modules]
+        print(f"{naam:<36} {duur * 1000:8.0f} ms   geïmporteerd: {', '.join(zwaar) or '-'}")
+
+    def pagina(naam):
+        at.session_state["pagina"] = naam
+
+    stap("eerste keer laden")
+    stap("rerun zonder wijziging")
+    begin, eind = at.slider[0].value
+    stap("periode-slider verschuiven", lambda: at.slider[0].set_value((begin, begin + (eind - begin) / 2)))
+    stap("regressielijn aanzetten", lambda: at.toggle[0].set_value(True))
+    stap("naar 'Oplaad data'", lambda: pagina("Oplaad data"))
+    stap("naar 'Laadpalen map'", lambda: (provincies_offline(), pagina("Laadpalen map")))
+    stap("terug naar voertuigverdeling", lambda: pagina("Voertuigverdeling over de tijd"))
+    stap("periode-slider terugzetten", lambda: at.slider[0].set_value((begin, eind)))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else "laadpalensteamlit.py")
@@ -0,0 +1,82 @@
+# Bouwtijd (Python) en HTML-payload van de kaart: één folium.Marker per laadpaal vs. de compacte array.
+# Beide aanpakken staan alleen nog hier; de app gebruikt kaart.bouw_detail_kaart.
+#   python -m benchmarks.kaart [aantal laadpalen ...]
+import sys
+import time
+
+import folium
+from folium.plugins import MarkerCluster
+from jinja2 import Template
+
+import kaart
+from benchmarks import synthetisch
+
+
+class SnelleMarkerCluster(MarkerCluster):
+    # Zoals FastMarkerCluster: markers worden pas in de browser aangemaakt en in één
+    # keer aan het cluster toegevoegd. De titel gaat als tekstnode in de popup, zodat
+    # er geen HTML uit de data wordt uitgevoerd.
+    _template = Template(
+        """
+        {% macro script(this, kwargs) %}
+            var {{ this.get_name() }} = (function(){
+                var d = {{ this.data }};
+                var cluster = L.markerClusterGroup({{ this.options|tojson }});
+                var markers = new Array(d.lat.length);
+                for (var i = 0; i < d.lat.length; i++) {
+                    var marker = L.marker([d.lat[i], d.lon[i]]);
+                    marker.bindPopup(document.createTextNode(d.titels[d.t[i]]));
+                    markers[i] = marker;
+                }
+                cluster.addLayers(markers);
+                cluster.addTo({{ this._parent.get_name() }});
+                return cluster;
+            })();
+        {% endmacro %}"""
+    )
+
+    def __init__(self, data, **kwargs):
+        super().__init__(**kwargs)
+        self._name = "SnelleMarkerCluster"
+        self.data = data
+
+
+def bouw_kaart(gdf, locatie=[52.1, 5.3], zoom=8):
+    # alle laadpalen als één array, markers in de browser
+    m = folium.Map(location=locatie, zoom_start=zoom)
+    SnelleMarkerCluster(kaart.punten_json(gdf)).add_to(m)
+    return m
+
+
+def bouw_kaart_markers(gdf, locatie=[52.1, 5.3], zoom=8):
+    # oorspronkelijke aanpak: één folium.Marker per laadpaal
+    m = folium.Map(location=locatie, zoom_start=zoom)
+    cluster = MarkerCluster().add_to(m)
+    for _, r in gdf.iterrows():
+        folium.Marker(
+            location=[r["AddressInfo.Latitude"], r["AddressInfo.Longitude"]],
+            popup=r.get("AddressInfo.Title", "Laadpunt")
+        ).add_to(cluster)
+    return m
+
+
+def meet(bouw, gdf):
+    t0 = time.perf_counter()
+    m = bouw(gdf)
+    t1 = time.perf_counter()
+    html = kaart.kaart_html(m)
+    t2 = time.perf_counter()
+    return t1 - t0, t2 - t1, len(html.encode()) / 1e6
+
+
+def main(aantallen):
+    print(f"{'laadpalen':>10} {'methode':<10} {'bouwen (s)':>11} {'renderen (s)':>13} {'payload (MB)':>13}")
+    for n in aantallen:
+        gdf = synthetisch.laadpalen(n)
+        for naam, bouw in [('markers', bouw_kaart_markers), ('array', bouw_kaart)]:
+            bouwen, renderen, mb = meet(bouw, gdf)
+            print(f"{n:>10} {naam:<10} {bouwen:>11.3f} {renderen:>13.3f} {mb:>13.2f}")
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [10_000, 100_000])
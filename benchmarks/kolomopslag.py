@@ -0,0 +1,75 @@
+# Vergelijkt koude laadtijd en piekgeheugen van de CSV-route en de Arrow-sessiecache (alle
+# kolommen of alleen wat een grafiek nodig heeft).
+#   python -m benchmarks.kolomopslag [aantal sessies ...]   (Linux, leest /proc)
+import multiprocessing as mp
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.synthetisch import schrijf_sessies_csv
+
+
+def _rss_mb(veld):
+    with open('/proc/self/status') as f:
+        for regel in f:
+            if regel.startswith(veld):
+                return int(regel.split()[1]) / 1024
+    return 0.0
+
+
+def _meet(route, pad, kolommen, wachtrij):
+    import data
+    import sessiecache
+
+    # piekwaarde (VmHWM) terugzetten zodat de imports niet meetellen
+    with open('/proc/self/clear_refs', 'w') as f:
+        f.write('5')
+    voor = _rss_mb('VmRSS')
+    t0 = time.perf_counter()
+    if route == 'csv':
+        df = data.lees_sessies(pad)
+    else:
+        tabel, _ = sessiecache.open_cache(pad)
+        df = sessiecache.als_frame(tabel.select(kolommen) if kolommen else tabel)
+    duur = time.perf_counter() - t0
+    piek = _rss_mb('VmHWM') - voor
+    wachtrij.put((duur, piek, len(df)))
+
+
+def meet(route, pad, kolommen=None):
+    # elke meting in een vers proces: koude caches, schone geheugenpiek
+    ctx = mp.get_context('spawn')
+    wachtrij = ctx.Queue()
+    proces = ctx.Process(target=_meet, args=(route, pad, kolommen, wachtrij))
+    proces.start()
+    resultaat = wachtrij.get()
+    proces.join()
+    return resultaat
+
+
+def main(aantallen):
+    import aggregaten
+    import sessiecache
+
+    with tempfile.TemporaryDirectory() as map_:
+        print(f"{'sessies':>10} {'route':<24} {'tijd (s)':>9} {'piek (MB)':>10}")
+        for n in aantallen:
+            pad = schrijf_sessies_csv(os.path.join(map_, f"sessies_{n}.csv"), n)
+            # de sessiecache opbouwen zoals de app dat doet
+            for _ in aggregaten.sessies(pad, aggregaten.kop_lengte(pad), aggregaten.regel_grens(pad), sessiecache.Vingerafdruk()):
+                pass
+
+            routes = [
+                ('csv', None, 'csv'),
+                ('arrow', None, 'arrow (alles)'),
+                ('arrow', ['Started', 'Ended'], 'arrow (Started/Ended)'),
+                ('arrow', ['MaxPower'], 'arrow (MaxPower)'),
+            ]
+            for route, kolommen, label in routes:
+                duur, piek, _ = meet(route, pad, kolommen)
+                print(f"{n:>10} {label:<24} {duur:>9.3f} {piek:>10.1f}")
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [10_000, 1_000_000])
@@ -0,0 +1,43 @@
+# Tijden van snapshot + modifiedsince-verversing tegen een lokale OpenChargeMap-stand-in.
+# De juistheid (samenvoegen op ID, mislukte verversing) staat in tests/test_laadpalen.py.
+#   python -m benchmarks.laadpalen_snapshot [aantal POI's]
+import datetime as dt
+import os
+import sys
+import tempfile
+import time
+
+import laadpalen
+from benchmarks.lokale_ocm import LokaleOCM, maak_pois
+
+
+def main(n):
+    with tempfile.TemporaryDirectory() as map_, LokaleOCM(maak_pois(n)) as ocm:
+        pad = os.path.join(map_, "snapshot.parquet")
+        meta = os.path.join(map_, "snapshot.json")
+
+        t0 = time.perf_counter()
+        laadpalen.ververs(url=ocm.url, pad=pad, meta=meta)
+        t1 = time.perf_counter()
+        print(f"volledige ophaalronde ({n} POI's): {t1 - t0:.3f} s")
+
+        # 10 gewijzigde en 5 nieuwe POI's, met een wijzigingsdatum na de vorige sync
+        nu = (dt.datetime.now(dt.timezone.utc) + dt.timedelta(seconds=1)).strftime("%Y-%m-%dT%H:%M:%SZ")
+        for p in list(ocm.pois.values())[:10]:
+            p["AddressInfo"]["Title"] = "Gewijzigd"
+            p["DateLastStatusUpdate"] = nu
+        for p in maak_pois(5, seed=1, start_id=n + 1, datum=nu):
+            ocm.pois[p["ID"]] = p
+
+        t2 = time.perf_counter()
+        laadpalen.ververs(url=ocm.url, pad=pad, meta=meta)
+        t3 = time.perf_counter()
+        print(f"modifiedsince-verversing (15 gewijzigd): {t3 - t2:.3f} s")
+
+        t4 = time.perf_counter()
+        laadpalen.lees_snapshot(pad)
+        print(f"start vanaf snapshot: {time.perf_counter() - t4:.3f} s")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
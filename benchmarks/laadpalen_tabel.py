@@ -0,0 +1,92 @@
+# Geheugen per werkproces en st.cache_data-kosten (pickle-omvang, (un)pickle-tijd per cache-treffer)
+# van de laadpalentabel op het kaartpad: de oude GeoDataFrame met shapely-Points vs. laadpalen.slank.
+# Voor de slanke tabel ook de tijd om hem als gedeeld Arrow-bestand te openen (data.gedeeld; per
+# proces één keer, daarna deelt st.cache_resource hem zonder kopie).
+#   python -m benchmarks.laadpalen_tabel [aantal laadpalen ...]   (Linux, leest /proc)
+import multiprocessing as mp
+import os
+import pickle
+import sys
+import tempfile
+import time
+
+from benchmarks.kolomopslag import _rss_mb
+
+
+def _snapshot(n):
+    # zoals laadpalen.lees_snapshot: de vijf snapshotkolommen
+    import numpy as np
+    import pandas as pd
+
+    from benchmarks import synthetisch
+
+    df = synthetisch.laadpalen(n)
+    df['ID'] = pd.array(df['ID'], dtype="Int64")
+    df['DateLastStatusUpdate'] = pd.Timestamp("2025-01-01", tz="UTC") + pd.to_timedelta(np.arange(n), unit='s')
+    provincie = np.random.default_rng(0).integers(0, 12, n)
+    return df, [f"Provincie {i + 1}" for i in range(12)], provincie
+
+
+def _bouw(route, n):
+    import geopandas as gpd
+    import pandas as pd
+    from shapely.geometry import Point
+
+    import laadpalen
+
+    df, namen, provincie = _snapshot(n)
+    voor = _rss_mb('VmRSS')
+    if route == 'voor':
+        # de oude _laad_laadpalen + koppel_provincies
+        geometry = [Point(xy) for xy in zip(df["AddressInfo.Longitude"], df["AddressInfo.Latitude"])]
+        tabel = gpd.GeoDataFrame(df, geometry=geometry, crs="EPSG:4326")
+        tabel["Provincie"] = pd.Series(namen, dtype=object).to_numpy()[provincie]
+    else:
+        tabel = laadpalen.slank(df)
+        tabel["Provincie"] = pd.Categorical.from_codes(provincie, namen)
+    del df
+    return tabel, _rss_mb('VmRSS') - voor
+
+
+def _meet(route, n, wachtrij):
+    tabel, geheugen = _bouw(route, n)
+    t0 = time.perf_counter()
+    blob = pickle.dumps(tabel, protocol=pickle.HIGHEST_PROTOCOL)
+    t1 = time.perf_counter()
+    pickle.loads(blob)
+    t2 = time.perf_counter()
+    openen = None
+    if route == 'na':
+        import data
+
+        with tempfile.TemporaryDirectory() as map_:
+            pad = os.path.join(map_, "laadpalen.arrow")
+            data.schrijf_gedeeld(tabel, pad)
+            t3 = time.perf_counter()
+            data.lees_gedeeld(pad)
+            openen = time.perf_counter() - t3
+    wachtrij.put((geheugen, len(blob) / 1024 ** 2, t1 - t0, t2 - t1, openen))
+
+
+def meet(route, n):
+    ctx = mp.get_context('spawn')
+    wachtrij = ctx.Queue()
+    proces = ctx.Process(target=_meet, args=(route, n, wachtrij))
+    proces.start()
+    resultaat = wachtrij.get()
+    proces.join()
+    return resultaat
+
+
+def main(aantallen):
+    print(f"{'laadpalen':>10} {'tabel':<6} {'RSS (MB)':>9} {'pickle (MB)':>12} {'pickle (ms)':>12} {'unpickle (ms)':>14} "
+          f"{'Arrow openen (ms)':>18}")
+    for n in aantallen:
+        for route in ['voor', 'na']:
+            geheugen, omvang, dumps, loads, openen = meet(route, n)
+            openen = f"{openen * 1000:>18.1f}" if openen is not None else f"{'-':>18}"
+            print(f"{n:>10} {route:<6} {geheugen:>9.1f} {omvang:>12.2f} {dumps * 1000:>12.1f} {loads * 1000:>14.1f} {openen}")
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [6_000, 100_000, 1_000_000])
@@ -0,0 +1,68 @@
+# Lokale stand-in voor de OpenChargeMap-API (POI-lijst met modifiedsince-filter).
+import datetime as dt
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+
+
+def maak_pois(n, seed=0, start_id=1, datum="2024-01-01T00:00:00Z"):
+    rng = np.random.default_rng(seed)
+    lon = rng.uniform(3.4, 7.2, n)
+    lat = rng.uniform(50.8, 53.5, n)
+    return [
+        {
+            "ID": start_id + i,
+            "DateLastStatusUpdate": datum,
+            "AddressInfo": {"Title": f"Laadpunt {start_id + i}", "Latitude": float(lat[i]), "Longitude": float(lon[i])},
+        }
+        for i in range(n)
+    ]
+
+
+class LokaleOCM:
+    def __init__(self, pois, vertraging=0.0):
+        self.pois = {p["ID"]: p for p in pois}
+        self.vertraging = vertraging
+        # een andere status dan 200 laat elke aanvraag mislukken (voor de terugval in de tests)
+        self.status = 200
+        self.verzoeken = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                import time
+                params = {k: v[0] for k, v in parse_qs(urlparse(self.path).query).items()}
+                server.verzoeken.append(params)
+                time.sleep(server.vertraging)
+                if server.status != 200:
+                    self.send_response(server.status)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                antwoord = list(server.pois.values())
+                if "modifiedsince" in params:
+                    sinds = dt.datetime.fromisoformat(params["modifiedsince"]).replace(tzinfo=dt.timezone.utc)
+                    antwoord = [p for p in antwoord if dt.datetime.fromisoformat(p["DateLastStatusUpdate"].replace("Z", "+00:00")) >= sinds]
+                body = json.dumps(antwoord).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}/v3/poi/"
+
+    def __enter__(self):
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *args):
+        self.httpd.shutdown()
+        self.httpd.server_close()
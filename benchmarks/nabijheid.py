@@ -0,0 +1,83 @@
+# Controleert de BallTree-nabijheidsindex tegen brute-force haversine en meet bouwen,
+# k-dichtstbij, aantal binnen een straal en het dekkingsraster.
+#   python -m benchmarks.nabijheid [aantal laadpalen ...]
+import sys
+import time
+
+import numpy as np
+
+import nabijheid
+from benchmarks.synthetisch import NL_BBOX, laadpalen
+
+VRAGEN = 1_000
+K = 5
+STRAAL_KM = 5.0
+DEKKING_STAP_KM = 2.0
+
+
+def haversine_km(lat, lon, lat_alle, lon_alle):
+    lat, lon, lat_alle, lon_alle = map(np.radians, (lat, lon, lat_alle, lon_alle))
+    a = np.sin((lat_alle - lat) / 2) ** 2 + np.cos(lat) * np.cos(lat_alle) * np.sin((lon_alle - lon) / 2) ** 2
+    return 2 * nabijheid.AARDSTRAAL_KM * np.arcsin(np.sqrt(a))
+
+
+def brute_force(lat, lon, lat_alle, lon_alle, k, straal_km):
+    # per vraagpunt de afstand tot alle laadpalen (zoals een lus over de tabel, maar dan per rij in numpy)
+    afstanden, aantallen = [], []
+    for la, lo in zip(lat, lon):
+        d = haversine_km(la, lo, lat_alle, lon_alle)
+        afstanden.append(np.sort(d)[:k])
+        aantallen.append(int((d <= straal_km).sum()))
+    return np.array(afstanden), np.array(aantallen)
+
+
+def vraagpunten(n, seed=1):
+    rng = np.random.default_rng(seed)
+    lon = rng.uniform(NL_BBOX[0], NL_BBOX[2], n)
+    lat = rng.uniform(NL_BBOX[1], NL_BBOX[3], n)
+    return lat, lon
+
+
+def controleer(lon_alle, lat_alle):
+    lat, lon = vraagpunten(200)
+    index = nabijheid.NabijheidIndex(lon_alle, lat_alle)
+    afstand, posities = index.dichtstbij(lat, lon, K)
+    verwacht_afstand, verwacht_aantal = brute_force(lat, lon, lat_alle, lon_alle, K, STRAAL_KM)
+    assert np.allclose(afstand, verwacht_afstand, atol=1e-6)
+    assert np.allclose(haversine_km(lat[:, None], lon[:, None], lat_alle[posities], lon_alle[posities]), afstand, atol=1e-6)
+    # punten precies op de straal kunnen door afronding net anders vallen
+    assert np.abs(index.aantal_binnen(lat, lon, STRAAL_KM) - verwacht_aantal).max() <= 1
+
+
+def main(aantallen):
+    df = laadpalen(10_000)
+    controleer(df['AddressInfo.Longitude'].to_numpy(), df['AddressInfo.Latitude'].to_numpy())
+    print("correct t.o.v. brute-force haversine")
+
+    lat, lon = vraagpunten(VRAGEN)
+    print(f"{VRAGEN} vraagpunten, k={K}, straal {STRAAL_KM:g} km, dekkingsraster {DEKKING_STAP_KM:g} km")
+    print(f"{'laadpalen':>10} {'bouwen (s)':>11} {'k-dichtstbij (ms)':>18} {'straal (ms)':>12} "
+          f"{'dekking (s)':>12} {'brute force (ms)':>17}")
+    for n in aantallen:
+        df = laadpalen(n)
+        lon_alle, lat_alle = df['AddressInfo.Longitude'].to_numpy(), df['AddressInfo.Latitude'].to_numpy()
+        del df
+
+        t0 = time.perf_counter()
+        index = nabijheid.NabijheidIndex(lon_alle, lat_alle)
+        t1 = time.perf_counter()
+        index.dichtstbij(lat, lon, K)
+        t2 = time.perf_counter()
+        index.aantal_binnen(lat, lon, STRAAL_KM)
+        t3 = time.perf_counter()
+        index.dekking(NL_BBOX[1], NL_BBOX[0], NL_BBOX[3], NL_BBOX[2], stap_km=DEKKING_STAP_KM)
+        t4 = time.perf_counter()
+        # brute force op 20 punten, omgerekend naar alle vraagpunten
+        brute_force(lat[:20], lon[:20], lat_alle, lon_alle, K, STRAAL_KM)
+        t5 = time.perf_counter()
+        print(f"{n:>10} {t1 - t0:>11.3f} {(t2 - t1) * 1000:>18.1f} {(t3 - t2) * 1000:>12.1f} "
+              f"{t4 - t3:>12.3f} {(t5 - t4) * 1000 * VRAGEN / 20:>17.0f}")
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [10_000, 100_000, 1_000_000])
@@ -0,0 +1,107 @@
+# De ophaallaag tegen een lokale testserver met instelbare vertraging: gelijktijdig vs. na elkaar,
+# eerste keer (200) en revalidatie met ETag (304). De testserver gebruiken ook tests/test_ophalen.py.
+#   python -m benchmarks.ophalen [vertraging in ms ...]
+import gzip
+import hashlib
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import ophalen
+
+INHOUD = b'{"type": "FeatureCollection", "features": []}' * 2000
+LAATST_GEWIJZIGD = "Sat, 01 Jan 2022 00:00:00 GMT"
+
+
+# -----------------------
+# Testserver: /bron?vertraging=ms (ETag, gzip), /wankel?fouten=n (eerst n keer 503) en
+# /altijd304 (304, ook zonder voorwaardelijke koppen)
+# -----------------------
+class Handler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        vraag = {k: int(v[0]) for k, v in parse_qs(url.query).items()}
+        server = self.server
+        with server.lock:
+            server.verzoeken[url.path] = server.verzoeken.get(url.path, 0) + 1
+            nummer = server.verzoeken[url.path]
+            server.koppen = dict(self.headers)
+        time.sleep(vraag.get("vertraging", 0) / 1000)
+
+        if url.path == "/wankel" and nummer <= vraag.get("fouten", 0):
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        etag = '"' + hashlib.sha1(INHOUD).hexdigest()[:16] + '"'
+        if self.headers.get("If-None-Match") == etag or url.path == "/altijd304":
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+
+        inhoud = INHOUD
+        self.send_response(200)
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", LAATST_GEWIJZIGD)
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            inhoud = gzip.compress(INHOUD)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(inhoud)))
+        self.end_headers()
+        self.wfile.write(inhoud)
+        with server.lock:
+            server.verzonden += len(inhoud)
+
+
+def start_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.lock = threading.Lock()
+    server.verzoeken = {}
+    server.verzonden = 0
+    server.koppen = {}
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def bron(naam, url, map_, meegeleverd=None):
+    return ophalen.Bron(naam, url, os.path.join(map_, naam + ".json"), meegeleverd=meegeleverd)
+
+
+# -----------------------
+# Metingen (de controles staan in tests/test_ophalen.py)
+# -----------------------
+def main(vertragingen):
+    with tempfile.TemporaryDirectory() as map_:
+        server, basis = start_server()
+
+        # aparte bronnen (eigen kopie op schijf) voor na elkaar en tegelijk: beide rondes gelijk
+        def bronnen(soort):
+            return [bron(f"{soort}{i}", f"{basis}/bron?vertraging={ms}", map_) for i, ms in enumerate(vertragingen)]
+
+        na_elkaar_bronnen, tegelijk_bronnen = bronnen("na_elkaar"), bronnen("tegelijk")
+        print(f"{len(vertragingen)} bronnen, vertraging {', '.join(f'{ms} ms' for ms in vertragingen)}")
+        for ronde, verwacht in [("eerste keer (200)", "netwerk"), ("revalidatie (304)", "ongewijzigd")]:
+            t0 = time.perf_counter()
+            uitkomst = [ophalen.haal(b) for b in na_elkaar_bronnen]
+            na_elkaar = time.perf_counter() - t0
+            t0 = time.perf_counter()
+            uitkomst += ophalen.gelijktijdig({b.naam: (lambda b=b: ophalen.haal(b)) for b in tegelijk_bronnen}).values()
+            tegelijk = time.perf_counter() - t0
+            assert all(herkomst == verwacht for _, herkomst in uitkomst), uitkomst
+            print(f"  {ronde:<20} na elkaar {na_elkaar * 1000:6.0f} ms   tegelijk {tegelijk * 1000:6.0f} ms")
+
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [300, 500])
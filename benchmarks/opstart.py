@@ -0,0 +1,57 @@
+# Koude start: importtijden per pakket en tijd tot de eerste render, in een vers proces.
+#   python -m benchmarks.opstart [script] [aantal pakketten]
+import subprocess
+import sys
+from collections import defaultdict
+
+METING = """
+import sys, time
+t0 = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+t1 = time.perf_counter()
+voor = {{m.split(".")[0] for m in sys.modules}}
+at = AppTest.from_file({script!r}, default_timeout=300).run()
+t2 = time.perf_counter()
+assert not at.exception, at.exception
+print("streamlit", t1 - t0)
+print("eerste_render", t2 - t1)
+print("app_modules", " ".join(sorted({{m.split(".")[0] for m in sys.modules}} - voor)))
+"""
+
+
+def importtijden(stderr):
+    # -X importtime: "import time: eigen | cumulatief | naam"; de eigen tijd van alle
+    # modules van een pakket opgeteld (cumulatief zou geneste imports dubbel tellen)
+    per_pakket = defaultdict(float)
+    for regel in stderr.splitlines():
+        if not regel.startswith("import time:") or "|" not in regel:
+            continue
+        eigen, _, naam = regel[len("import time:"):].split("|")
+        if not eigen.strip().isdigit():
+            continue
+        per_pakket[naam.strip().split(".")[0]] += int(eigen) / 1e6
+    return per_pakket
+
+
+def main(script, aantal):
+    uitvoer = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", METING.format(script=script)],
+        capture_output=True, text=True, check=True,
+    )
+    resultaat = dict(regel.split(" ", 1) for regel in uitvoer.stdout.splitlines() if " " in regel)
+    per_pakket = importtijden(uitvoer.stderr)
+    app_modules = set(resultaat["app_modules"].split())
+
+    print(f"{'pakket':<24} {'import (s)':>10}   pas bij eerste render geladen")
+    for naam, duur in sorted(per_pakket.items(), key=lambda x: -x[1])[:aantal]:
+        print(f"{naam:<24} {duur:10.3f}   {'ja' if naam in app_modules else ''}")
+    streamlit = float(resultaat["streamlit"])
+    render = float(resultaat["eerste_render"])
+    print(f"\nimport streamlit:        {streamlit:.3f} s")
+    print(f"script tot eerste render: {render:.3f} s  (waarvan imports van de app: "
+          f"{sum(d for n, d in per_pakket.items() if n in app_modules):.3f} s)")
+    print(f"totaal koude start:      {streamlit + render:.3f} s")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else "laadpalensteamlit.py", int(sys.argv[2]) if len(sys.argv) > 2 else 15)
@@ -0,0 +1,77 @@
+# Voorbereide provinciegrenzen: inlezen (GeoJSON + to_crs vs. GeoParquet), toewijzing met het
+# raster vs. de volledige grenzen, en per zoomniveau/tolerantie de hoekpunten, de omvang van de
+# grenslaag voor de browser, de toewijzingstijd en het aandeel afwijkende toewijzingen.
+#   python -m benchmarks.provinciegrenzen [aantal punten] [hoekpunten per rand]
+import json
+import os
+import sys
+import tempfile
+import time
+
+import geopandas as gpd
+import numpy as np
+import shapely
+
+import kaart
+import provincies
+from benchmarks import synthetisch
+
+
+def punten(n):
+    # zonder de punten die synthetisch.laadpalen op de rand van het kader klemt: die liggen precies
+    # op de buitengrens, waar GEOS een trage uitzonderingsroute neemt die echte laadpalen niet raken
+    df = synthetisch.laadpalen(n)
+    x, y = df['AddressInfo.Longitude'].to_numpy(), df['AddressInfo.Latitude'].to_numpy()
+    x0, y0, x1, y1 = synthetisch.NL_BBOX
+    binnen = (x > x0) & (x < x1) & (y > y0) & (y < y1)
+    return x[binnen], y[binnen]
+
+
+def getimed(functie, *args):
+    t0 = time.perf_counter()
+    uitkomst = functie(*args)
+    return uitkomst, time.perf_counter() - t0
+
+
+def main(n, hoekpunten):
+    provs = synthetisch.provincies(hoekpunten=hoekpunten, grillig=0.004)
+    lon, lat = punten(n)
+
+    with tempfile.TemporaryDirectory() as map_:
+        # zoals de bron: GeoJSON, hier in RD New zodat to_crs ook meetelt
+        geojson = os.path.join(map_, "provincies.geojson")
+        provs.to_crs("EPSG:28992").to_file(geojson, driver="GeoJSON")
+        gelezen, t_geojson = getimed(lambda: gpd.read_file(geojson).to_crs("EPSG:4326"))
+        grenzen, t_voorbereiden = getimed(provincies.bereid_voor, gelezen)
+        pad = provincies.grenzen_pad(grenzen.sleutel, map_)
+        grenzen.schrijf(pad)
+        bewaard, t_parquet = getimed(provincies.Provinciegrenzen.lees, pad)
+    assert bewaard.sleutel == grenzen.sleutel
+
+    print(f"{len(provs)} provincies, {shapely.get_num_coordinates(grenzen.geometrieen).sum()} hoekpunten, "
+          f"raster {grenzen.raster.shape[1]}x{grenzen.raster.shape[0]} "
+          f"({(grenzen.raster == provincies.GRENS).mean():.1%} grenscellen)")
+    print(f"  GeoJSON lezen + to_crs {t_geojson * 1000:8.0f} ms")
+    print(f"  voorbereiden (eenmalig) {t_voorbereiden * 1000:7.0f} ms")
+    print(f"  voorbereid lezen       {t_parquet * 1000:8.0f} ms")
+
+    volledig, t_volledig = getimed(provincies.wijs_toe_index, lon, lat, grenzen.geometrieen)
+    via_raster, t_raster = getimed(bewaard.wijs_toe, lon, lat)
+    assert np.array_equal(np.append(grenzen.namen, None)[volledig], via_raster)
+    print(f"\n{len(lon)} punten toewijzen")
+    print(f"  volledige grenzen      {t_volledig * 1000:8.0f} ms")
+    print(f"  raster + grenscellen   {t_raster * 1000:8.0f} ms   (zelfde uitkomst)")
+
+    print(f"\n{'zoom':>5} {'tolerantie':>11} {'hoekpunten':>11} {'grenslaag':>11} {'toewijzen':>10} {'afwijkend':>10}")
+    niveaus = [(zoom, provincies.tolerantie(zoom), bewaard.vereenvoudigd[zoom]) for zoom in provincies.ZOOMNIVEAUS]
+    for zoom, tol, geometrieen in niveaus + [("vol", 0.0, bewaard.geometrieen)]:
+        omvang = len(json.dumps(kaart.grenzen_json(geometrieen, bewaard.namen), separators=(",", ":")))
+        index, t = getimed(provincies.wijs_toe_index, lon, lat, geometrieen)
+        afwijkend = (index != volledig).mean()
+        print(f"{zoom:>5} {tol:>11.5f} {shapely.get_num_coordinates(geometrieen).sum():>11} "
+              f"{omvang / 1024:>8.0f} kB {t * 1000:>7.0f} ms {afwijkend:>10.3%}")
+
+
+if __name__ == "__main__":
+    argumenten = [int(a) for a in sys.argv[1:]]
+    main(*(argumenten + [200_000, 20_000][len(argumenten):]))
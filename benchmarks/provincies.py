@@ -0,0 +1,57 @@
+# Provincietoewijzing: gpd.sjoin, de oude per-polygoon-lus en provincies.koppel
+# (eerste keer, daarna uit de bewaarde toewijzing, en met 1% verplaatste punten).
+#   python -m benchmarks.provincies [aantal punten ...]
+import sys
+import tempfile
+import time
+
+import geopandas as gpd
+import numpy as np
+
+import provincies
+from benchmarks import synthetisch
+
+
+def oude_lus(punten, provs):
+    uitkomst = np.full(len(punten), None, dtype=object)
+    for _, prow in provs.iterrows():
+        uitkomst[punten.geometry.within(prow.geometry).to_numpy()] = prow['name']
+    return uitkomst
+
+
+def main(aantallen):
+    provs = synthetisch.provincies()
+    grenzen = provincies.bereid_voor(provs)
+    print(f"{'punten':>9} {'sjoin':>8} {'oude lus':>9} {'eerste':>8} {'bewaard':>8} {'+1% nieuw':>10}")
+    for n in aantallen:
+        df = synthetisch.laadpalen(n)
+        lon, lat = df['AddressInfo.Longitude'], df['AddressInfo.Latitude']
+        punten = gpd.GeoDataFrame(df, geometry=gpd.points_from_xy(lon, lat), crs="EPSG:4326")
+
+        t0 = time.perf_counter()
+        gejoind = gpd.sjoin(punten, provs, how="left", predicate="within")
+        t1 = time.perf_counter()
+        oud = oude_lus(punten, provs) if n <= 100_000 else None
+        t2 = time.perf_counter()
+
+        with tempfile.TemporaryDirectory() as map_:
+            nieuw = provincies.koppel(lon, lat, grenzen, map_=map_)
+            t3 = time.perf_counter()
+            provincies.koppel(lon, lat, grenzen, map_=map_)
+            t4 = time.perf_counter()
+            # 1% van de punten verplaatst (bijgewerkte POI's)
+            verplaatst = lon.copy()
+            verplaatst.iloc[: n // 100] += 0.001
+            provincies.koppel(verplaatst, lat, grenzen, map_=map_)
+            t5 = time.perf_counter()
+
+        verwacht = gejoind['name'].to_numpy(dtype=object)
+        assert all((a == b) or (a is None and b != b) for a, b in zip(nieuw, verwacht))
+        if oud is not None:
+            assert all(a == b for a, b in zip(nieuw, oud))
+        oud_tijd = f"{t2 - t1:>9.2f}" if oud is not None else f"{'-':>9}"
+        print(f"{n:>9} {t1 - t0:>8.2f} {oud_tijd} {t3 - t2:>8.2f} {t4 - t3:>8.2f} {t5 - t4:>10.2f}")
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [10_000, 100_000, 1_000_000])
@@ -0,0 +1,66 @@
+# Laadtijd en piekgeheugen van het sessielog: CSV parsen vs. de Arrow-sessiecache (memory-mapped),
+# los en als bron voor het opnieuw opbouwen van de tab2-aggregaten.
+#   python -m benchmarks.sessiecache [aantal sessies ...]   (Linux, leest /proc)
+import multiprocessing as mp
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.kolomopslag import _rss_mb
+from benchmarks.streaming import schrijf_groot
+
+
+def _meet(route, pad, wachtrij):
+    import aggregaten
+    import data
+    import sessiecache
+
+    with open('/proc/self/clear_refs', 'w') as f:
+        f.write('5')
+    voor = _rss_mb('VmRSS')
+    t0 = time.perf_counter()
+    if route == 'csv':
+        n = len(data.lees_sessies(pad))
+    elif route == 'cache':
+        tabel, _ = sessiecache.open_cache(pad)
+        n = sum(len(sessiecache.als_frame(batch)) for batch in tabel.to_batches())
+    else:
+        # aggregaten vanaf nul; 'aggregaten (csv)' zonder cache, 'aggregaten (cache)' met een geldige cache
+        if route == 'aggregaten (csv)' and os.path.exists(sessiecache.cache_pad(pad)):
+            os.remove(sessiecache.cache_pad(pad))
+        n = aggregaten.werk_bij(aggregaten.Aggregaten(), pad).n
+    duur = time.perf_counter() - t0
+    wachtrij.put((duur, _rss_mb('VmHWM') - voor, n))
+
+
+def meet(route, pad):
+    # elke meting in een vers proces; het bestand zelf staat wel in de page cache van het OS
+    ctx = mp.get_context('spawn')
+    wachtrij = ctx.Queue()
+    proces = ctx.Process(target=_meet, args=(route, pad, wachtrij))
+    proces.start()
+    resultaat = wachtrij.get()
+    proces.join()
+    return resultaat
+
+
+def main(aantallen):
+    import sessiecache
+
+    with tempfile.TemporaryDirectory() as map_:
+        print(f"{'sessies':>10} {'route':<20} {'tijd (s)':>9} {'piek (MB)':>10}")
+        for n in aantallen:
+            pad = schrijf_groot(os.path.join(map_, "sessies.csv"), n)
+            # 'aggregaten (csv)' schrijft onderweg de cache, die de routes daarna gebruiken
+            for route in ['csv', 'aggregaten (csv)', 'cache', 'aggregaten (cache)']:
+                duur, piek, verwerkt = meet(route, pad)
+                assert verwerkt == n, verwerkt
+                print(f"{n:>10} {route:<20} {duur:>9.3f} {piek:>10.1f}")
+            cache_mb = os.path.getsize(sessiecache.cache_pad(pad)) / 1024 ** 2
+            print(f"{'':>10} CSV {os.path.getsize(pad) / 1024 ** 2:.0f} MB, cache {cache_mb:.0f} MB")
+            os.remove(sessiecache.cache_pad(pad))
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [10_000, 1_000_000])
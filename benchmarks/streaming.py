@@ -0,0 +1,65 @@
+# Piekgeheugen van de tab2-aggregaten bij groeiende sessielogs: blokgewijs (huidige route)
+# vs. het hele log in één keer inlezen (de oude route, alleen tot --max-alles sessies).
+#   python -m benchmarks.streaming [aantal sessies ...]   (Linux, leest /proc)
+import multiprocessing as mp
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.kolomopslag import _rss_mb
+from benchmarks.synthetisch import sessies
+
+MAX_ALLES = 2_000_000
+SCHRIJF_BLOK = 1_000_000
+
+
+def schrijf_groot(pad, n):
+    # in stukken wegschrijven, zodat ook het aanmaken niet alles in het geheugen houdt
+    for i, begin in enumerate(range(0, n, SCHRIJF_BLOK)):
+        sessies(min(SCHRIJF_BLOK, n - begin), seed=i).to_csv(
+            pad, mode='w' if i == 0 else 'a', header=i == 0, index=False, date_format='%Y-%m-%d %H:%M:%S'
+        )
+    return pad
+
+
+def _meet(route, pad, wachtrij):
+    import aggregaten
+    import data
+
+    with open('/proc/self/clear_refs', 'w') as f:
+        f.write('5')
+    voor = _rss_mb('VmRSS')
+    t0 = time.perf_counter()
+    if route == 'blokken':
+        agg = aggregaten.werk_bij(aggregaten.Aggregaten(), pad)
+    else:
+        agg = aggregaten.Aggregaten().voeg_toe(data.lees_sessies(pad))
+    duur = time.perf_counter() - t0
+    wachtrij.put((duur, _rss_mb('VmHWM') - voor, agg.n))
+
+
+def meet(route, pad):
+    ctx = mp.get_context('spawn')
+    wachtrij = ctx.Queue()
+    proces = ctx.Process(target=_meet, args=(route, pad, wachtrij))
+    proces.start()
+    resultaat = wachtrij.get()
+    proces.join()
+    return resultaat
+
+
+def main(aantallen):
+    with tempfile.TemporaryDirectory() as map_:
+        print(f"{'sessies':>11} {'route':<10} {'tijd (s)':>9} {'piek (MB)':>10}")
+        for n in aantallen:
+            pad = schrijf_groot(os.path.join(map_, "sessies.csv"), n)
+            for route in ['blokken', 'alles'] if n <= MAX_ALLES else ['blokken']:
+                duur, piek, verwerkt = meet(route, pad)
+                assert verwerkt == n, verwerkt
+                print(f"{n:>11} {route:<10} {duur:>9.2f} {piek:>10.1f}")
+            os.remove(pad)
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [10_000, 100_000, 1_000_000, 5_000_000])
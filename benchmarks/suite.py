@@ -0,0 +1,272 @@
+# Reproduceerbare benchmarksuite: synthetische sessielogs en laadpalensets op vaste schalen,
+# tijd en piekgeheugen per stap van de pijplijn, vergeleken met een opgeslagen basislijn.
+#   python -m benchmarks.suite [--schaal 10k 1M 10M] [--herhalingen 3] [--drempel 0.25] [--bewaar]
+# Exitcode 1 zodra een stap meer dan --drempel trager of zwaarder is dan de basislijn.
+# (Linux: het piekgeheugen komt uit /proc)
+import argparse
+import json
+import multiprocessing as mp
+import os
+import platform
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+
+from benchmarks import synthetisch
+from benchmarks.kolomopslag import _rss_mb
+from benchmarks.streaming import schrijf_groot
+
+SCHALEN = {'10k': 10_000, '1M': 1_000_000, '10M': 10_000_000}
+BASISLIJN = os.path.join(os.path.dirname(os.path.abspath(__file__)), "basislijn.json")
+DREMPEL = 0.25
+# kleinere verschillen zijn meetruis en tellen nooit als regressie
+MIN_TIJD_S = 0.01
+MIN_PIEK_MB = 5.0
+# de regressie werkt op kwartaalcijfers (in de app ~70 rijen); die stap is bij elke schaal gelijk
+KWARTALEN = 72
+
+
+# -----------------------
+# Tijd en extra piekgeheugen per stap
+# -----------------------
+def _reset_piek():
+    # zet VmHWM terug op het huidige RSS
+    with open('/proc/self/clear_refs', 'w') as f:
+        f.write('5')
+
+
+class Stappen:
+    # tijd en rijen worden per stap opgeteld (over alle blokken); de piek is het geheugen
+    # bovenop wat er vóór de stap al in gebruik was, de hoogste over alle blokken
+    def __init__(self):
+        self.stappen = {}
+
+    @contextmanager
+    def meet(self, naam, rijen=0):
+        _reset_piek()
+        voor = _rss_mb('VmRSS')
+        begin = time.perf_counter()
+        yield
+        duur = time.perf_counter() - begin
+        stap = self.stappen.setdefault(naam, {'tijd_s': 0.0, 'piek_mb': 0.0, 'rijen': 0})
+        stap['tijd_s'] += duur
+        stap['piek_mb'] = max(stap['piek_mb'], _rss_mb('VmHWM') - voor)
+        stap['rijen'] += rijen
+
+
+# -----------------------
+# De stappen van de pijplijn, met dezelfde functies als de app
+# -----------------------
+def sessie_stappen(s, pad):
+    import aggregaten
+    import batch
+    import data
+
+    # blokgewijs zoals aggregaten.werk_bij, maar elke deelstap van voeg_toe apart gemeten
+    agg = aggregaten.Aggregaten()
+    for begin, eind in aggregaten.blokken(pad, aggregaten.kop_lengte(pad), aggregaten.regel_grens(pad)):
+        with s.meet("sessies laden (CSV)"):
+            ruw = data.lees_sessies_ruw(aggregaten.blok_bestand(pad, begin, eind))
+        with s.meet("tijdstippen parsen", len(ruw)):
+            df = data.zet_tijden(ruw)
+        del ruw
+        agg.n += len(df)
+        with s.meet("MaxPower-histogram", len(df)):
+            agg.tel_maxpower(df)
+        with s.meet("bezetting per uur", len(df)):
+            agg.tel_bezetting(df)
+        with s.meet("tijdverdelingen (box/histogram)", len(df)):
+            agg.tel_tijden(df)
+        with s.meet("correlatie", len(df)):
+            agg.tel_correlatie(df)
+        with s.meet("dagtotalen", len(df)):
+            agg.per_dag.voeg_toe(df)
+        del df
+    with s.meet("tab2-tabellen uitlezen"):
+        batch.resultaten(agg)
+    return agg.n
+
+
+def laadpaal_stappen(s, pad, grenzen):
+    import data
+    import detailniveau
+    import kaart
+    import laadpalen
+
+    # zoals op het kaartpad: meteen naar de slanke tabel
+    with s.meet("laadpalen laden (CSV)"):
+        df = laadpalen.slank(data.lees_laadpalen_kort(pad))
+    lon, lat = df['AddressInfo.Longitude'], df['AddressInfo.Latitude']
+    with s.meet("provincies koppelen", len(df)):
+        grenzen.wijs_toe(lon, lat)
+    with s.meet("detailindex bouwen", len(df)):
+        index = detailniveau.DetailIndex(lon, lat, df['AddressInfo.Title'])
+
+    # heel Nederland en ingezoomd op het midden, elk tot en met de HTML voor de browser
+    zuid, west, noord, oost = index.omvang()
+    midden = float(lat.median()), float(lon.median())
+    beelden = [((zuid, west, noord, oost), 8), ((midden[0] - 0.03, midden[1] - 0.05, midden[0] + 0.03, midden[1] + 0.05), 14)]
+    with s.meet("kaart bouwen"):
+        for grenzen, zoom in beelden:
+            clusters, punten = index.vraag(*grenzen, zoom)
+            kaart.kaart_html(kaart.bouw_detail_kaart(clusters, punten, locatie=midden, zoom=zoom))
+    return len(df)
+
+
+def regressie_stap(s, verkoop):
+    import data
+    import prognose
+
+    with s.meet("regressie fitten", len(verkoop) * len(prognose.MODELLEN)):
+        for model in prognose.MODELLEN:
+            prognose.prognoses(verkoop, data.BRANDSTOFFEN, model)
+
+
+def _draai(n, sessies_pad, laadpalen_pad, herhalingen, wachtrij):
+    # draait in een vers proces per schaal: geen caches of geheugen van een vorige schaal.
+    # scipy vooraf importeren, anders telt de eerste regressiefit ~1 s importtijd mee
+    import scipy.stats  # noqa: F401
+
+    import provincies
+
+    # zoals de app: de grenzen één keer voorbereid (daar van schijf), per schaal alleen toewijzen
+    grenzen = provincies.bereid_voor(synthetisch.provincies())
+    verkoop = synthetisch.verkoop(KWARTALEN)
+    metingen = []
+    for _ in range(herhalingen):
+        s = Stappen()
+        assert sessie_stappen(s, sessies_pad) == n
+        assert laadpaal_stappen(s, laadpalen_pad, grenzen) == n
+        regressie_stap(s, verkoop)
+        metingen.append(s.stappen)
+
+    # beste van de herhalingen: minder gevoelig voor toevallige uitschieters
+    beste = {}
+    for naam in metingen[0]:
+        beste[naam] = {
+            'tijd_s': round(min(m[naam]['tijd_s'] for m in metingen), 4),
+            'piek_mb': round(min(m[naam]['piek_mb'] for m in metingen), 1),
+            'rijen': metingen[0][naam]['rijen'],
+        }
+    wachtrij.put({'herhalingen': herhalingen, 'stappen': beste})
+
+
+def meet_schaal(n, map_, herhalingen):
+    sessies_pad = schrijf_groot(os.path.join(map_, "sessies.csv"), n)
+    laadpalen_pad = synthetisch.schrijf_laadpalen_csv(os.path.join(map_, "laadpalen.csv"), n)
+
+    ctx = mp.get_context('spawn')
+    wachtrij = ctx.Queue()
+    proces = ctx.Process(target=_draai, args=(n, sessies_pad, laadpalen_pad, herhalingen, wachtrij))
+    proces.start()
+    resultaat = wachtrij.get()
+    proces.join()
+    for pad in [sessies_pad, laadpalen_pad]:
+        os.remove(pad)
+    return resultaat
+
+
+# -----------------------
+# Basislijn bewaren en vergelijken
+# -----------------------
+def omgeving():
+    import numpy
+    import pandas
+    import shapely
+
+    return {
+        'python': platform.python_version(),
+        'numpy': numpy.__version__,
+        'pandas': pandas.__version__,
+        'shapely': shapely.__version__,
+        'machine': platform.machine(),
+        'cpus': os.cpu_count(),
+    }
+
+
+def lees_basislijn(pad):
+    if not os.path.exists(pad):
+        return {'omgeving': None, 'schalen': {}}
+    with open(pad) as f:
+        return json.load(f)
+
+
+def bewaar_basislijn(pad, basislijn, resultaten):
+    # alleen de gemeten schalen vervangen; de rest van de basislijn blijft staan
+    basislijn['omgeving'] = omgeving()
+    basislijn['schalen'].update(resultaten)
+    with open(pad, 'w') as f:
+        json.dump(basislijn, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def regressie(nieuw, basis, drempel, minimum):
+    return basis is not None and nieuw > basis * (1 + drempel) and nieuw - basis > minimum
+
+
+def vergelijk(schaal, stappen, basis, drempel):
+    # print de tabel voor één schaal; geeft de stappen met een regressie terug
+    def getal(waarde, breedte, decimalen):
+        return f"{waarde:>{breedte}.{decimalen}f}" if waarde is not None else f"{'-':>{breedte}}"
+
+    def verschil(nieuw, oud):
+        return f"{(nieuw / oud - 1) * 100:+6.0f}%" if oud else f"{'-':>7}"
+
+    print(f"\n{schaal}")
+    print(f"  {'stap':<32} {'tijd (s)':>9} {'basis':>9} {'':>7} {'piek (MB)':>10} {'basis':>8} {'':>7}")
+    gevonden = []
+    for naam, stap in stappen.items():
+        oud = basis.get(naam, {})
+        oud_tijd, oud_piek = oud.get('tijd_s'), oud.get('piek_mb')
+        markering = []
+        if regressie(stap['tijd_s'], oud_tijd, drempel, MIN_TIJD_S):
+            markering.append("trager")
+        if regressie(stap['piek_mb'], oud_piek, drempel, MIN_PIEK_MB):
+            markering.append("meer geheugen")
+        if markering:
+            gevonden.append((schaal, naam, markering))
+        print(
+            f"  {naam:<32} {getal(stap['tijd_s'], 9, 3)} {getal(oud_tijd, 9, 3)} {verschil(stap['tijd_s'], oud_tijd)}"
+            f" {getal(stap['piek_mb'], 10, 1)} {getal(oud_piek, 8, 1)} {verschil(stap['piek_mb'], oud_piek)}"
+            f"  {'REGRESSIE: ' + ', '.join(markering) if markering else ''}"
+        )
+    return gevonden
+
+
+def main(schalen, herhalingen, drempel, pad, bewaar):
+    basislijn = lees_basislijn(pad)
+    if basislijn['omgeving'] not in (None, omgeving()):
+        print(f"let op: basislijn gemeten in een andere omgeving: {basislijn['omgeving']}")
+
+    resultaten = {}
+    with tempfile.TemporaryDirectory() as map_:
+        for schaal in schalen:
+            resultaten[schaal] = meet_schaal(SCHALEN[schaal], map_, herhalingen)
+
+    regressies = []
+    for schaal, resultaat in resultaten.items():
+        basis = basislijn['schalen'].get(schaal, {}).get('stappen', {})
+        regressies += vergelijk(schaal, resultaat['stappen'], basis, drempel)
+
+    if bewaar:
+        bewaar_basislijn(pad, basislijn, resultaten)
+        print(f"\nbasislijn bijgewerkt: {pad}")
+        return 0
+    if regressies:
+        print(f"\n{len(regressies)} regressie(s) boven {drempel:.0%}:")
+        for schaal, naam, markering in regressies:
+            print(f"  {schaal} {naam}: {', '.join(markering)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tijd en piekgeheugen per stap op synthetische data")
+    parser.add_argument("--schaal", nargs="+", choices=list(SCHALEN), default=['10k', '1M'])
+    parser.add_argument("--herhalingen", type=int, default=3)
+    parser.add_argument("--drempel", type=float, default=DREMPEL, help="toegestane verslechtering, als fractie")
+    parser.add_argument("--basislijn", default=BASISLIJN)
+    parser.add_argument("--bewaar", action="store_true", help="de gemeten schalen als nieuwe basislijn opslaan")
+    args = parser.parse_args()
+    sys.exit(main(args.schaal, args.herhalingen, args.drempel, args.basislijn, args.bewaar))
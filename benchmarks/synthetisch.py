@@ -0,0 +1,113 @@
+import numpy as np
+import pandas as pd
+
+
+# -----------------------
+# Synthetische laadsessies in het formaat van laadpaaldata_cleaned.csv
+# -----------------------
+def sessies(n, seed=0, start='2018-01-01', dagen=365):
+    rng = np.random.default_rng(seed)
+
+    # aankomsten pieken 's ochtends en aan het eind van de middag
+    dag = rng.integers(0, dagen, n)
+    uur = np.where(rng.random(n) < 0.5, rng.normal(8.5, 1.5, n), rng.normal(17.0, 2.0, n)) % 24
+    begin = pd.Timestamp(start) + pd.to_timedelta(dag * 86400 + (uur * 3600).astype('int64'), unit='s')
+
+    verbonden = np.clip(rng.lognormal(1.2, 0.9, n), 0.02, 19.5)
+    laad = np.minimum(verbonden, np.clip(rng.normal(2.3, 1.2, n), 0.02, 6.0))
+    vermogen = np.clip(rng.normal(3400, 170, n), 2840, 4006).astype('int64')
+    energie = np.maximum(50, (laad * vermogen * rng.uniform(0.8, 1.0, n)).round(-1)).astype('int64')
+
+    return pd.DataFrame({
+        'Started': begin,
+        'Ended': begin + pd.to_timedelta((verbonden * 3600).astype('int64'), unit='s'),
+        'TotalEnergy': energie,
+        'ConnectedTime': verbonden.round(4),
+        'ChargeTime': laad.round(4),
+        'MaxPower': vermogen,
+    })
+
+
+def schrijf_sessies_csv(pad, n, seed=0):
+    sessies(n, seed).to_csv(pad, index=False, date_format='%Y-%m-%d %H:%M:%S')
+    return pad
+
+
+# -----------------------
+# Synthetische laadpalen en provincies (Nederland-achtige bounding box)
+# -----------------------
+NL_BBOX = (3.36, 50.75, 7.23, 53.55)
+
+
+def laadpalen(n, seed=0):
+    rng = np.random.default_rng(seed)
+    # geclusterd rond "steden", zoals echte laadpalen
+    steden = rng.uniform(NL_BBOX[:2], NL_BBOX[2:], size=(40, 2))
+    keuze = rng.integers(0, len(steden), n)
+    xy = steden[keuze] + rng.normal(0, 0.08, size=(n, 2))
+    xy = np.clip(xy, NL_BBOX[:2], NL_BBOX[2:])
+    return pd.DataFrame({
+        'ID': np.arange(1, n + 1),
+        'AddressInfo.Longitude': xy[:, 0],
+        'AddressInfo.Latitude': xy[:, 1],
+        'AddressInfo.Title': [f"Laadpunt {i}" for i in range(1, n + 1)],
+    })
+
+
+def schrijf_laadpalen_csv(pad, n, seed=0):
+    # zelfde opmaak als laadpalen_kort.csv (met indexkolom)
+    laadpalen(n, seed).drop(columns='ID').to_csv(pad)
+    return pad
+
+
+def provincies(n=12, seed=0, hoekpunten=2000, grillig=0.0):
+    # Voronoi-vlakken met ~hoekpunten per rand, zodat de 'within'-tests net zo duur zijn
+    # als bij echte grenzen; aangrenzende vlakken overlappen niet.
+    # grillig > 0: kronkelende grenzen (amplitude in graden) met gedeelde hoekpunten tussen
+    # buren, een geldige dekking zoals echte provincies; nodig om vereenvoudigen te meten
+    import geopandas as gpd
+    import shapely
+
+    rng = np.random.default_rng(seed)
+    kernen = shapely.multipoints(rng.uniform(NL_BBOX[:2], NL_BBOX[2:], size=(n, 2)))
+    kader = shapely.box(*NL_BBOX)
+    vlakken = shapely.intersection(shapely.get_parts(shapely.voronoi_polygons(kernen, extend_to=kader)), kader)
+    if grillig:
+        # overal dezelfde staplengte, dan krijgt een gedeelde rand aan beide kanten dezelfde punten
+        stap = shapely.length(vlakken).sum() / (n * hoekpunten)
+        vlakken = shapely.set_precision(shapely.segmentize(vlakken, stap), 1e-9)
+        fase = rng.uniform(0, 2 * np.pi, (6, 2))
+
+        def golf(xy):
+            # som van golven op steeds kleinere schaal; dezelfde verschuiving voor elk gedeeld punt
+            x, y = xy[:, 0], xy[:, 1]
+            dx, dy = np.zeros_like(x), np.zeros_like(y)
+            for i in range(6):
+                dx += grillig / 2 ** i * np.sin(20 * 2 ** i * y + fase[i, 0])
+                dy += grillig / 2 ** i * np.sin(20 * 2 ** i * x + fase[i, 1])
+            return np.column_stack([x + dx, y + dy])
+
+        vlakken = shapely.transform(vlakken, golf)
+    else:
+        vlakken = [shapely.segmentize(v, v.exterior.length / hoekpunten) for v in vlakken]
+
+    return gpd.GeoDataFrame({'name': [f"Provincie {i + 1}" for i in range(n)]}, geometry=vlakken, crs="EPSG:4326")
+
+
+# -----------------------
+# Synthetische verkoopcijfers per kwartaal (zoals data.lees_verkoop)
+# -----------------------
+def verkoop(kwartalen=72, seed=0, start='2007-01-01'):
+    # benzine/diesel vlak met ruis, elektrisch en hybride als S-curve die pas later begint
+    rng = np.random.default_rng(seed)
+    t = np.arange(kwartalen)
+    reeksen = {
+        'Benzine': 110_000 * (1 + 0.05 * rng.standard_normal(kwartalen)),
+        'Diesel': 45_000 * np.exp(-t / 40) * (1 + 0.08 * rng.standard_normal(kwartalen)),
+        'elektrisch': 40_000 / (1 + np.exp(-(t - 0.8 * kwartalen) / 5)) * (1 + 0.1 * rng.standard_normal(kwartalen)),
+        'hybride': 30_000 / (1 + np.exp(-(t - 0.6 * kwartalen) / 8)) * (1 + 0.1 * rng.standard_normal(kwartalen)),
+    }
+    df = pd.DataFrame({'datum': pd.date_range(start, periods=kwartalen, freq='QS')})
+    for naam, waarden in reeksen.items():
+        df[naam] = np.maximum(waarden, 1.0).round()
+    return df
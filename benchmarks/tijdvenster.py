@@ -0,0 +1,48 @@
+# Tab2-statistieken voor een datumvenster: prefixsommen per dag vs. de sessies opnieuw filteren.
+#   python -m benchmarks.tijdvenster [aantal sessies] [aantal vensters]
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+import aggregaten
+from benchmarks.synthetisch import sessies
+
+
+def uitlezen(bron):
+    return (bron.maxpower_freq(), bron.gemiddelde_bezetting_per_uur(), bron.correlatie(),
+            [bron.box_statistieken(col) for col in aggregaten.TIJD_KOLOMMEN], bron.totale_energie())
+
+
+def main(n, aantal):
+    df = sessies(n, seed=0)
+    agg = aggregaten.Aggregaten().voeg_toe(df)
+    rng = np.random.default_rng(1)
+    dagen = agg.per_dag.dagen()
+    vensters = [tuple(pd.Timestamp(d) for d in np.sort(rng.choice(dagen[:-1], 2))) for _ in range(aantal)]
+
+    t0 = time.perf_counter()
+    for begin, eind in vensters:
+        uitlezen(agg.venster(begin, eind))
+    t1 = time.perf_counter()
+    print(f"prefixsommen:        {(t1 - t0) / aantal * 1000:8.2f} ms per venster")
+
+    for begin, eind in vensters:
+        sel = df[(df['Started'] >= begin) & (df['Started'] < eind + pd.Timedelta(days=1))]
+        uitlezen(aggregaten.Aggregaten().voeg_toe(sel))
+    t2 = time.perf_counter()
+    print(f"opnieuw filteren:    {(t2 - t1) / aantal * 1000:8.2f} ms per venster  ({n} sessies)")
+
+    # aantallen en energie zijn exact, de correlatie op afronding na
+    for begin, eind in vensters[:5]:
+        v = agg.venster(begin, eind)
+        sel = df[(df['Started'] >= begin) & (df['Started'] < eind + pd.Timedelta(days=1))]
+        assert v.n == len(sel) and v.totale_energie() == sel['TotalEnergy'].sum()
+        if len(sel) > 2:
+            assert np.allclose(v.correlatie(), aggregaten.Aggregaten().voeg_toe(sel).correlatie())
+
+
+if __name__ == "__main__":
+    argumenten = [int(a) for a in sys.argv[1:]]
+    main(*(argumenten + [1_000_000, 20][len(argumenten):]))
@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+
+STAPPEN = {'h': 3_600_000_000_000, 'min': 60_000_000_000}
+DAG_NS = 86_400_000_000_000
+
+
+# -----------------------
+# Sweep-line over begin/eind-gebeurtenissen
+# -----------------------
+def _vakken(started, ended, stap):
+    # tijdstippen -> vaknummers (uur of minuut) t.o.v. middernacht van de eerste dag
+    begin = np.asarray(started, dtype='datetime64[ns]').view('int64')
+    eind = np.asarray(ended, dtype='datetime64[ns]').view('int64')
+    oorsprong = (begin.min() // DAG_NS) * DAG_NS
+    b = (begin - oorsprong) // STAPPEN[stap]
+    e = (eind - oorsprong) // STAPPEN[stap]
+    # sessies met een eindtijd vóór de begintijd tellen nergens mee
+    return oorsprong, b, np.maximum(e, b)
+
+
+def _tijdlijn(started, ended, stap):
+    # een sessie telt mee in vak v als begin_vak <= v < eind_vak
+    oorsprong, b, e = _vakken(started, ended, stap)
+    lengte = int(e.max()) + 1
+    verschil = np.bincount(b, minlength=lengte) - np.bincount(e, minlength=lengte)
+    return oorsprong, np.cumsum(verschil)
+
+
+def bezetting_tijdlijn(started, ended, stap='h'):
+    # aantal gelijktijdige sessies per uur/minuut over de hele periode
+    if len(started) == 0:
+        return pd.Series(dtype='int64')
+    oorsprong, aantallen = _tijdlijn(started, ended, stap)
+    tijden = (oorsprong + np.arange(len(aantallen)) * STAPPEN[stap]).astype('datetime64[ns]')
+    return pd.Series(aantallen, index=pd.DatetimeIndex(tijden))
+
+
+def _per_dag(started, ended, stap):
+    # (eerste dag, matrix dagen x vakken van de dag); de tijdlijn begint om middernacht,
+    # dus aanvullen tot hele dagen en omvormen volstaat
+    vakken_per_dag = DAG_NS // STAPPEN[stap]
+    oorsprong, aantallen = _tijdlijn(started, ended, stap)
+    dagen = -(-len(aantallen) // vakken_per_dag)
+    aantallen = np.pad(aantallen, (0, dagen * vakken_per_dag - len(aantallen)))
+    return np.datetime64(int(oorsprong), 'ns').astype('datetime64[D]'), aantallen.reshape(dagen, vakken_per_dag)
+
+
+def _per_vak_van_dag(started, ended, stap):
+    if len(started) == 0:
+        return np.zeros(DAG_NS // STAPPEN[stap], dtype='int64')
+    return _per_dag(started, ended, stap)[1].sum(axis=0)
+
+
+def bezetting_per_dag_uur(started, ended):
+    # (eerste dag, dagen x 24): bezetting per uur, per kalenderdag
+    return _per_dag(started, ended, 'h')
+
+
+def bezetting_per_uur(started, ended):
+    # som over alle dagen van het aantal actieve sessies per uur van de dag (24 waarden);
+    # sessies over middernacht of over meerdere dagen worden correct opgesplitst
+    return _per_vak_van_dag(started, ended, 'h')
+
+
+def bezetting_per_minuut(started, ended):
+    # idem per minuut van de dag (1440 waarden)
+    return _per_vak_van_dag(started, ended, 'min')
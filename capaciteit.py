@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+
+# de verkoopprognose levert per kwartaal een voorspelling met betrouwbaarheidsband
+SCENARIOS = ['laag', 'midden', 'hoog']
+SCENARIO_KOLOMMEN = ['onder', 'voorspelling', 'boven']
+
+# inwoners per provincie (CBS, 1 januari 2024, x1000): verdeelt de vloot over de provincies,
+# bij gebrek aan BEV-cijfers per provincie
+INWONERS = {
+    'Groningen': 596, 'Friesland': 659, 'Fryslân': 659, 'Drenthe': 502, 'Overijssel': 1184,
+    'Flevoland': 446, 'Gelderland': 2133, 'Utrecht': 1387, 'Noord-Holland': 2952,
+    'Zuid-Holland': 3804, 'Zeeland': 392, 'Noord-Brabant': 2626, 'Limburg': 1128,
+}
+
+
+# -----------------------
+# Vaste invoer (per databestand één keer): uurprofiel, vloot per jaar, laadpalen per provincie
+# -----------------------
+def uurprofiel(agg):
+    # gelijktijdig verbonden auto's per uur van de dag, per sessie per dag (H,);
+    # de som over de uren is het gemiddelde aantal verbonden uren per sessie
+    bezetting = agg.gemiddelde_bezetting_per_uur()['AvgOccupancy'].to_numpy(dtype='float64')
+    return bezetting * agg.dagen() / max(agg.n, 1)
+
+
+def vloot_per_jaar(huidig, verkoop, prognoses, jaren):
+    # BEV-vloot op 1 januari van elk jaar per scenario (S, T): de laatst bekende vloot plus de
+    # verkochte BEV's sindsdien; bekende kwartalen uit de verkoopcijfers, daarna de prognose
+    # (onder/voorspelling/boven). Sloop is bij een zo jonge vloot verwaarloosd.
+    laatste = huidig.dropna(subset=['Elektriciteit']).iloc[-1]
+    vanaf = pd.Timestamp(int(laatste['jaar']), 1, 1)
+    bekend = verkoop.set_index('datum')['elektrisch'].dropna()
+    lijn = prognoses['elektrisch']['lijn'].set_index('datum')
+    toekomst = lijn[lijn.index > bekend.index.max()]
+
+    grenzen = pd.to_datetime([f"{j}-01-01" for j in jaren])
+    vloot = np.empty((len(SCENARIOS), len(jaren)))
+    for s, kolom in enumerate(SCENARIO_KOLOMMEN):
+        kwartalen = pd.concat([bekend, toekomst[kolom]])
+        kwartalen = kwartalen[kwartalen.index >= vanaf]
+        # verkocht vóór elke jaargrens: cumulatieve som, opgezocht met searchsorted
+        cumulatief = np.r_[0.0, np.cumsum(np.maximum(kwartalen.to_numpy(), 0.0))]
+        vloot[s] = laatste['Elektriciteit'] * 1e6 + cumulatief[np.searchsorted(kwartalen.index, grenzen)]
+    return vloot
+
+
+def laadpalen_per_provincie(provincie):
+    # (namen, aandeel) van de provincies met laadpalen; Provincie is categorisch.
+    # De snapshot is een steekproef van de publieke laadpunten: alleen de verdeling telt
+    telling = provincie.value_counts()
+    telling = telling[telling > 0].sort_index()
+    aantallen = telling.to_numpy(dtype='float64')
+    return np.asarray(telling.index, dtype=object), aantallen / aantallen.sum()
+
+
+def aandeel_vloot(namen, aandeel_laadpalen):
+    # aandeel van de vloot per provincie naar inwoners; onbekende provincienamen
+    # (een andere GeoJSON) vallen terug op het aandeel in de laadpalen
+    if not all(naam in INWONERS for naam in namen):
+        return aandeel_laadpalen
+    inwoners = np.array([INWONERS[naam] for naam in namen], dtype='float64')
+    return inwoners / inwoners.sum()
+
+
+# -----------------------
+# Het model: alles als broadcast over (scenario, jaar, provincie, uur)
+# -----------------------
+def bereken(vloot, aandeel_ev, laadpunten, profiel, sessies_per_ev, groei, jaren_vooruit):
+    # vloot (S, T), aandeel_ev/laadpunten (P,), profiel (H,), jaren_vooruit (T,);
+    # sessies_per_ev en groei: getal of (S,) per scenario
+    sessies_per_ev = np.broadcast_to(np.asarray(sessies_per_ev, dtype='float64'), vloot.shape[:1])
+    groei = np.broadcast_to(np.asarray(groei, dtype='float64'), vloot.shape[:1])
+
+    # gelijktijdig ladende auto's (S, T, P, H)
+    vraag = (vloot * sessies_per_ev[:, None])[:, :, None, None] * aandeel_ev[:, None] * profiel
+    # laadpunten (S, T, P): de huidige punten met een vaste jaarlijkse groei
+    capaciteit = ((1 + groei[:, None]) ** jaren_vooruit)[:, :, None] * laadpunten
+    benutting = vraag / capaciteit[..., None]
+
+    piekuur = vraag.argmax(axis=-1)
+    piek = np.take_along_axis(vraag, piekuur[..., None], axis=-1)[..., 0]
+    return {
+        'vraag': vraag,
+        'capaciteit': capaciteit,
+        'benutting': benutting,
+        'piek': piek,
+        'piekuur': piekuur,
+        'piek_benutting': piek / capaciteit,
+        # uren per dag waarin de vraag de capaciteit overschrijdt (S, T, P)
+        'uren_tekort': (benutting > 1).sum(axis=-1),
+    }
@@ -0,0 +1,193 @@
+import glob
+import hashlib
+import os
+import threading
+
+import pandas as pd
+import pyarrow as pa
+
+VERKOOP_CSV = "personenautos_csb.csv"
+HUIDIG_CSV = "personenautos_huidig.csv"
+SESSIES_CSV = "laadpaaldata_cleaned.csv"
+LAADPALEN_CSV = "laadpalen_kort.csv"
+
+# afgeleide bestanden (Parquet, Arrow) worden naast de bron in deze map gezet
+KOLOM_MAP = "cache"
+
+BRANDSTOFFEN = ['Benzine', 'Diesel', 'elektrisch', 'hybride']
+
+# energie in Wh en vermogen in W: int32 gaat tot 2,1 GWh / 2,1 GW per sessie
+SESSIE_DTYPES = {
+    'TotalEnergy': 'int32',
+    'ConnectedTime': 'float64',
+    'ChargeTime': 'float64',
+    'MaxPower': 'int32',
+}
+SESSIE_DATUM_FORMAAT = '%Y-%m-%d %H:%M:%S'
+
+
+# -----------------------
+# Cache-sleutel: bestand verandert => nieuwe sleutel
+# -----------------------
+def bestand_sleutel(pad):
+    info = os.stat(pad)
+    return info.st_mtime_ns, info.st_size
+
+
+# -----------------------
+# Atomair wegschrijven: eerst naar een eigen tijdelijk bestand, dan os.replace
+# -----------------------
+def tijdelijk_pad(pad):
+    # per proces én per thread: twee servers, of twee sessies in één server, die hetzelfde
+    # bestand tegelijk schrijven zitten elkaar niet in de weg
+    return f"{pad}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+
+def schrijf_kolombestand(df, doel):
+    os.makedirs(os.path.dirname(doel), exist_ok=True)
+    tijdelijk = tijdelijk_pad(doel)
+    df.to_parquet(tijdelijk, index=False)
+    os.replace(tijdelijk, doel)
+
+
+# -----------------------
+# Gedeelde, alleen-lezen tabellen: Arrow IPC in cache/, memory-mapped. Alle sessies en alle
+# serverprocessen lezen dezelfde pagina's uit de page cache; getallen worden niet gekopieerd
+# en een schrijfpoging geeft een fout in plaats van de data van andere sessies te wijzigen
+# -----------------------
+def gedeeld_pad(naam, sleutel, map_=KOLOM_MAP):
+    return os.path.join(map_, f"{naam}_{hashlib.sha1(repr(sleutel).encode()).hexdigest()[:12]}.arrow")
+
+
+def schrijf_gedeeld(df, pad):
+    os.makedirs(os.path.dirname(pad), exist_ok=True)
+    tabel = pa.Table.from_pandas(df, preserve_index=False)
+    tijdelijk = tijdelijk_pad(pad)
+    with pa.OSFile(tijdelijk, 'wb') as f, pa.ipc.new_file(f, tabel.schema) as schrijver:
+        schrijver.write_table(tabel)
+    os.replace(tijdelijk, pad)
+
+
+def lees_gedeeld(pad):
+    tabel = pa.ipc.open_file(pa.memory_map(pad)).read_all()
+    # split_blocks: elke kolom een eigen (alleen-lezen) view op de map, geen samenvoegkopie
+    return tabel.to_pandas(split_blocks=True)
+
+
+def gedeeld(naam, sleutel, maak, map_=KOLOM_MAP):
+    # maak() alleen als geen enkel proces deze versie al heeft weggeschreven
+    pad = gedeeld_pad(naam, sleutel, map_)
+    if not os.path.exists(pad):
+        schrijf_gedeeld(maak(), pad)
+        ruim_oude_versies_op(pad, naam, ".arrow", map_)
+    return lees_gedeeld(pad)
+
+
+def ruim_oude_versies_op(pad, naam, extensie, map_=KOLOM_MAP):
+    # de andere versies naam_<12 hex-tekens><extensie> naast pad weg; een proces dat er nog
+    # een gemapt of open heeft, houdt die tot het de nieuwe leest
+    for oud in glob.glob(os.path.join(map_, naam + "_" + "[0-9a-f]" * 12 + extensie)):
+        if oud != pad:
+            try:
+                os.remove(oud)
+            except OSError:
+                pass
+
+
+def gedeeld_naast(bron_pad, naam, sleutel, lees):
+    # afgeleid van een bronbestand: in de cache-map naast de bron, zoals de kolombestanden
+    map_ = os.path.join(os.path.dirname(bron_pad), KOLOM_MAP)
+    return gedeeld(naam, (os.path.basename(bron_pad), sleutel), lambda: lees(bron_pad), map_)
+
+
+# -----------------------
+# Verkoopcijfers CBS (per kwartaal)
+# -----------------------
+def parse_kwartalen(kwartaal):
+    # "2007 1e kwartaal" (evt. met '*') -> eerste dag van het kwartaal
+    delen = kwartaal.str.extract(r'^\s*(\d{4})\s+(\d)')
+    jaar = pd.to_numeric(delen[0], errors='coerce')
+    maand = (pd.to_numeric(delen[1], errors='coerce') - 1) * 3 + 1
+    return pd.to_datetime(
+        pd.DataFrame({'year': jaar, 'month': maand, 'day': 1}),
+        errors='coerce'
+    )
+
+
+def lees_verkoop(pad=VERKOOP_CSV):
+    # de echte kolomnamen staan in de tweede regel van het bestand
+    df = pd.read_csv(
+        pad,
+        header=1,
+        usecols=['Brandstofsoort voertuig', 'Benzine', 'Diesel', 'Full elektric (BEV)', 'Totaal hybrides'],
+        dtype=str
+    )
+    df = df.rename(columns={
+        'Brandstofsoort voertuig': 'kwartaal',
+        'Full elektric (BEV)': 'elektrisch',
+        'Totaal hybrides': 'hybride'
+    })
+
+    for col in BRANDSTOFFEN:
+        df[col] = pd.to_numeric(df[col], errors='coerce').astype('float64')
+
+    df['datum'] = parse_kwartalen(df['kwartaal'])
+    df = df.dropna(subset=['datum']).reset_index(drop=True)
+    return df[['kwartaal', 'datum'] + BRANDSTOFFEN]
+
+
+# -----------------------
+# Actieve personenauto's (per jaar)
+# -----------------------
+def lees_huidig(pad=HUIDIG_CSV):
+    df = pd.read_csv(pad)
+
+    # Fix potential column name typo
+    df = df.rename(columns={'Elekrticiteit': 'Elektriciteit'})
+    df['jaar'] = df['jaar'].astype('int64')
+    for col in df.columns.drop('jaar'):
+        df[col] = pd.to_numeric(df[col], errors='coerce').astype('float64')
+    return df
+
+
+# -----------------------
+# Laadsessies
+# -----------------------
+def lees_sessies_ruw(pad=SESSIES_CSV):
+    # tijdstippen nog als tekst
+    return pd.read_csv(
+        pad,
+        usecols=['Started', 'Ended'] + list(SESSIE_DTYPES),
+        dtype={'Started': str, 'Ended': str, **SESSIE_DTYPES}
+    )
+
+
+def zet_tijden(df):
+    # ongeldige tijdstippen (bv. 29 februari) worden NaT en vallen weg
+    for col in ['Started', 'Ended']:
+        df[col] = pd.to_datetime(df[col], format=SESSIE_DATUM_FORMAAT, errors='coerce')
+    df = df.dropna(subset=['Started', 'Ended']).reset_index(drop=True)
+    return df
+
+
+def lees_sessies(pad=SESSIES_CSV):
+    # geparst bewaard wordt het log in de Arrow-sessiecache (sessiecache.py, via aggregaten.sessies)
+    return zet_tijden(lees_sessies_ruw(pad))
+
+
+# -----------------------
+# Laadpalen snapshot (lengte-/breedtegraad en naam); alleen de startwaarde van
+# laadpalen.lees_snapshot, daarna komt de kaart uit de eigen Parquet-snapshot
+# -----------------------
+def lees_laadpalen_kort(pad=LAADPALEN_CSV):
+    df = pd.read_csv(
+        pad,
+        index_col=0,
+        dtype={
+            'AddressInfo.Longitude': 'float64',
+            'AddressInfo.Latitude': 'float64',
+            'AddressInfo.Title': str
+        }
+    )
+    return df.reset_index(drop=True)
+
@@ -0,0 +1,118 @@
+import numpy as np
+import pandas as pd
+
+MAX_NIVEAU = 20
+# cellen zijn een kwart tegel (64 px): niveau = kaartzoom + 2
+NIVEAU_BOVEN_ZOOM = 2
+DREMPEL = 50
+
+
+# -----------------------
+# Web Mercator en Morton-codes (quadtree-volgorde)
+# -----------------------
+def mercator(lon, lat):
+    x = (np.asarray(lon, dtype='float64') + 180.0) / 360.0
+    s = np.sin(np.radians(np.clip(np.asarray(lat, dtype='float64'), -85.05112878, 85.05112878)))
+    y = 0.5 - np.log((1 + s) / (1 - s)) / (4 * np.pi)
+    return x, y
+
+
+def _spreid(v):
+    # bits 0..31 -> even bitposities 0..62
+    v = v.astype('uint64') & np.uint64(0xFFFFFFFF)
+    for schuif, masker in [(16, 0x0000FFFF0000FFFF), (8, 0x00FF00FF00FF00FF), (4, 0x0F0F0F0F0F0F0F0F),
+                           (2, 0x3333333333333333), (1, 0x5555555555555555)]:
+        v = (v | (v << np.uint64(schuif))) & np.uint64(masker)
+    return v
+
+
+def morton(xt, yt):
+    return _spreid(xt) | (_spreid(yt) << np.uint64(1))
+
+
+# -----------------------
+# Quadtree-index: per niveau de cellen als aaneengesloten stukken van de gesorteerde punten
+# -----------------------
+class DetailIndex:
+    def __init__(self, lon, lat, titels=None, max_niveau=MAX_NIVEAU):
+        self.max_niveau = max_niveau
+        x, y = mercator(lon, lat)
+        schaal = 2 ** max_niveau
+        xt = np.clip((x * schaal).astype('int64'), 0, schaal - 1)
+        yt = np.clip((y * schaal).astype('int64'), 0, schaal - 1)
+        codes = morton(xt, yt)
+
+        # in Morton-volgorde vormt elke cel op elk niveau één aaneengesloten stuk
+        volgorde = np.argsort(codes, kind='stable')
+        self.codes = codes[volgorde]
+        self.xt = xt[volgorde]
+        self.yt = yt[volgorde]
+        # float32 is op deze breedtegraden tot op ~0,5 m nauwkeurig; zwaartepunten in float64
+        self.lon = np.asarray(lon, dtype='float32')[volgorde]
+        self.lat = np.asarray(lat, dtype='float32')[volgorde]
+        # titels als codes in een lijst unieke namen: geen Python-string per laadpaal
+        if titels is None:
+            titels = np.full(len(volgorde), "Laadpunt", dtype=object)
+        if isinstance(getattr(titels, 'dtype', None), pd.CategoricalDtype):
+            codes, namen = pd.Series(titels).cat.codes.to_numpy(), pd.Series(titels).cat.categories
+        else:
+            codes, namen = pd.factorize(titels)
+            codes = codes.astype('int32')
+        self.titel_codes = codes[volgorde]
+        # "Laadpunt" achteraan: code -1 (geen titel) wijst daar vanzelf naar, ook als alle titels ontbreken
+        self.titel_namen = np.asarray(list(namen) + ["Laadpunt"], dtype=object)
+        self._niveaus = {}
+
+    def __len__(self):
+        return len(self.codes)
+
+    def omvang(self):
+        # (zuid, west, noord, oost) van alle punten
+        if len(self) == 0:
+            return None
+        return float(self.lat.min()), float(self.lon.min()), float(self.lat.max()), float(self.lon.max())
+
+    def niveau(self, niveau):
+        # cellen op dit niveau: begin, aantal, celcoördinaten en zwaartepunt
+        if niveau not in self._niveaus:
+            schuif = np.uint64(2 * (self.max_niveau - niveau))
+            sleutel = self.codes >> schuif
+            begin = np.flatnonzero(np.r_[True, sleutel[1:] != sleutel[:-1]]) if len(sleutel) else np.zeros(0, dtype='int64')
+            aantal = np.diff(np.r_[begin, len(sleutel)])
+            self._niveaus[niveau] = {
+                'begin': begin,
+                'aantal': aantal,
+                'cx': self.xt[begin] >> (self.max_niveau - niveau),
+                'cy': self.yt[begin] >> (self.max_niveau - niveau),
+                'lat': np.add.reduceat(self.lat, begin, dtype='float64') / aantal if len(begin) else np.zeros(0),
+                'lon': np.add.reduceat(self.lon, begin, dtype='float64') / aantal if len(begin) else np.zeros(0),
+            }
+        return self._niveaus[niveau]
+
+    def vraag(self, zuid, west, noord, oost, zoom, drempel=DREMPEL):
+        # clusters (lat, lon, aantal) en losse punten binnen het beeld
+        niveau = int(min(max(zoom + NIVEAU_BOVEN_ZOOM, 0), self.max_niveau))
+        cellen = self.niveau(niveau)
+        schaal = 2 ** niveau
+        (x0, x1), (y1, y0) = mercator([west, oost], [zuid, noord])
+        in_beeld = (
+            (cellen['cx'] >= int(x0 * schaal)) & (cellen['cx'] <= int(x1 * schaal))
+            & (cellen['cy'] >= int(y0 * schaal)) & (cellen['cy'] <= int(y1 * schaal))
+        )
+        groot = in_beeld & (cellen['aantal'] > drempel)
+        klein = in_beeld & ~groot
+
+        clusters = pd.DataFrame({
+            'lat': cellen['lat'][groot], 'lon': cellen['lon'][groot], 'aantal': cellen['aantal'][groot]
+        })
+
+        # alle punten uit de kleine cellen in één keer: begin + 0..aantal-1 per cel
+        begin, aantal = cellen['begin'][klein], cellen['aantal'][klein]
+        idx = np.repeat(begin - np.cumsum(aantal) + aantal, aantal) + np.arange(aantal.sum())
+        punten = pd.DataFrame({
+            'AddressInfo.Latitude': self.lat[idx],
+            'AddressInfo.Longitude': self.lon[idx],
+            # alleen de zichtbare titels opzoeken
+            'AddressInfo.Title': self.titel_namen[self.titel_codes[idx]],
+        })
+        return clusters, punten
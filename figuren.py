@@ -0,0 +1,55 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+import meting
+
+MAX_FIGUREN = 64
+MAX_BYTES = 64 * 1024 ** 2
+
+
+# -----------------------
+# LRU-cache van kant-en-klare figuren, gedeeld door alle sessies
+# -----------------------
+def figuur_sleutel(naam, staat):
+    # staat: databestand-sleutel(s) + widgetwaarden; alles met een stabiele repr
+    return hashlib.sha1(repr((naam, staat)).encode()).hexdigest()
+
+
+class FiguurCache:
+    def __init__(self, max_figuren=MAX_FIGUREN, max_bytes=MAX_BYTES):
+        self.max_figuren = max_figuren
+        self.max_bytes = max_bytes
+        # sleutel -> (naam, figuur-JSON, figuur); de JSON bepaalt de omvang, de figuur
+        # zelf gaat direct naar st.plotly_chart (een dict laat Plotly alles opnieuw valideren)
+        self._figuren = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def haal(self, naam, staat, bouw):
+        # bouwtijd, treffers/missers en omvang per figuur gaan naar het meetregister
+        sleutel = figuur_sleutel(naam, staat)
+        with meting.meet(f"figuur: {naam}", cache=True) as m:
+            with self._lock:
+                if sleutel in self._figuren:
+                    self._figuren.move_to_end(sleutel)
+                    return self._figuren[sleutel][2]
+
+            meting.mis(f"figuur: {naam}")
+            fig = bouw()
+            tekst = fig.to_json()
+            m.bytes = len(tekst)
+
+        with self._lock:
+            if sleutel not in self._figuren:
+                self._figuren[sleutel] = (naam, tekst, fig)
+                self._bytes += len(tekst)
+            while self._figuren and (len(self._figuren) > self.max_figuren or self._bytes > self.max_bytes):
+                _, (_, oud, _) = self._figuren.popitem(last=False)
+                self._bytes -= len(oud)
+        return fig
+
+    def omvang(self):
+        # (aantal figuren, bytes figuur-JSON) in de cache
+        with self._lock:
+            return len(self._figuren), self._bytes
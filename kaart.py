@@ -0,0 +1,139 @@
+import json
+
+import folium
+import numpy as np
+import pandas as pd
+import shapely
+from folium.plugins import MarkerCluster
+from jinja2 import Template
+
+
+# -----------------------
+# Laadpalen -> één compacte kolomgewijze JSON-array voor de browser
+# -----------------------
+def punten_json(gdf):
+    # titels worden als codes + unieke lijst meegestuurd; dubbele namen kosten zo bijna niets.
+    # Werkt ook op een categorische titelkolom; ontbrekende titels worden "Laadpunt"
+    if "AddressInfo.Title" in gdf:
+        codes, titels = pd.factorize(gdf["AddressInfo.Title"])
+    else:
+        codes, titels = np.full(len(gdf), -1), []
+    titels = [str(t) for t in titels]
+    if (codes < 0).any():
+        codes = np.where(codes < 0, len(titels), codes)
+        titels.append("Laadpunt")
+    tekst = json.dumps(
+        {
+            "lat": gdf["AddressInfo.Latitude"].to_numpy(dtype="float64").round(6).tolist(),
+            "lon": gdf["AddressInfo.Longitude"].to_numpy(dtype="float64").round(6).tolist(),
+            "titels": titels,
+            "t": codes.tolist(),
+        },
+        separators=(",", ":"),
+    )
+    # veilig binnen <script>
+    return tekst.replace("<", "\\u003c").replace(">", "\\u003e")
+
+
+class DetailLaag(MarkerCluster):
+    # Voor het detailniveau: vooraf getelde clusters als bolletjes met aantal (klik = inzoomen)
+    # en losse markers voor cellen onder de drempel. Hergebruikt de markercluster-CSS.
+    _template = Template(
+        """
+        {% macro script(this, kwargs) %}
+            var {{ this.get_name() }} = (function(){
+                var kaart = {{ this._parent.get_name() }};
+                var c = {{ this.clusters }};
+                var d = {{ this.data }};
+                var laag = L.layerGroup();
+                for (var i = 0; i < c.n.length; i++) {
+                    var grootte = c.n[i] < 100 ? 'small' : (c.n[i] < 1000 ? 'medium' : 'large');
+                    var cluster = L.marker([c.lat[i], c.lon[i]], {icon: L.divIcon({
+                        html: '<div><span>' + c.n[i] + '</span></div>',
+                        className: 'marker-cluster marker-cluster-' + grootte,
+                        iconSize: L.point(40, 40)
+                    })});
+                    cluster.on('click', function (e) {
+                        kaart.setView(e.latlng, kaart.getZoom() + 2);
+                    });
+                    laag.addLayer(cluster);
+                }
+                for (var i = 0; i < d.lat.length; i++) {
+                    var marker = L.marker([d.lat[i], d.lon[i]]);
+                    marker.bindPopup(document.createTextNode(d.titels[d.t[i]]));
+                    laag.addLayer(marker);
+                }
+                laag.addTo(kaart);
+                return laag;
+            })();
+        {% endmacro %}"""
+    )
+
+    def __init__(self, clusters, data, **kwargs):
+        super().__init__(**kwargs)
+        self._name = "DetailLaag"
+        self.clusters = json.dumps(
+            {
+                "lat": clusters["lat"].round(6).tolist(),
+                "lon": clusters["lon"].round(6).tolist(),
+                "n": clusters["aantal"].tolist(),
+            },
+            separators=(",", ":"),
+        )
+        self.data = data
+
+
+# -----------------------
+# Kaart bouwen
+# -----------------------
+def bouw_detail_kaart(clusters, punten, locatie=[52.1, 5.3], zoom=8, lagen=()):
+    m = folium.Map(location=locatie, zoom_start=zoom)
+    for laag in lagen:
+        laag.add_to(m)
+    DetailLaag(clusters, punten_json(punten)).add_to(m)
+    return m
+
+
+def grenzen_json(geometrieen, namen):
+    # op ~1 m afgerond: de rest van de cijfers is alleen omvang
+    features = [
+        {
+            "type": "Feature",
+            "properties": {"naam": str(naam)},
+            "geometry": json.loads(shapely.to_geojson(shapely.transform(geom, lambda xy: xy.round(5)))),
+        }
+        for geom, naam in zip(geometrieen, namen)
+    ]
+    return {"type": "FeatureCollection", "features": features}
+
+
+def grenslaag(geometrieen, namen):
+    # provinciegrenzen als lijnen (geen vulling, dus klikken gaan naar de kaart)
+    return folium.GeoJson(
+        grenzen_json(geometrieen, namen),
+        name="Provinciegrenzen",
+        style_function=lambda _: {"color": "#00c0ff", "weight": 2, "fill": False},
+        tooltip=folium.GeoJsonTooltip(fields=["naam"], labels=False),
+    )
+
+
+def dekkingslaag(afstand, grenzen, drempel_km):
+    # afstand: raster uit NabijheidIndex.dekking (rijen noord -> zuid, gelijk in Web Mercator).
+    # Cellen verder dan drempel_km van een laadpaal worden rood, dekkender naarmate het gat
+    # groter is; de kleuren worden in één keer op het hele raster berekend
+    zuid, west, noord, oost = grenzen
+    verhouding = np.nan_to_num(afstand / drempel_km, nan=0.0)
+    gat = verhouding > 1
+    rgba = np.zeros(afstand.shape + (4,), dtype='uint8')
+    rgba[gat, 0] = 220
+    rgba[gat, 1] = 40
+    rgba[gat, 2] = 40
+    rgba[..., 3] = np.where(gat, np.clip(90 + 60 * (verhouding - 1), 90, 210), 0).astype('uint8')
+    return folium.raster_layers.ImageOverlay(
+        rgba, bounds=[[zuid, west], [noord, oost]], name=f"Meer dan {drempel_km:g} km van een laadpaal"
+    )
+
+
+def kaart_html(m):
+    # volledige HTML zoals die naar de browser gaat (voor metingen)
+    return m.get_root().render()
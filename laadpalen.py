@@ -0,0 +1,151 @@
+import datetime as dt
+import json
+import logging
+import os
+import threading
+import time
+
+import pandas as pd
+
+import data
+import meting
+import ophalen
+import provincies
+
+OCM_URL = "https://api.openchargemap.io/v3/poi/"
+OCM_PARAMS = {
+    "output": "json",
+    "countrycode": "NL",
+    "maxresults": 10000,
+    "compact": "true",
+    "verbose": "false",
+    "key": "2960318e-86ae-49e0-82b1-3c8bc6790b41",
+}
+
+SNAPSHOT_PAD = os.path.join(data.KOLOM_MAP, "laadpalen_snapshot.parquet")
+SNAPSHOT_META = os.path.join(data.KOLOM_MAP, "laadpalen_snapshot.json")
+SNAPSHOT_KOLOMMEN = ["ID", "AddressInfo.Longitude", "AddressInfo.Latitude", "AddressInfo.Title", "DateLastStatusUpdate"]
+
+# een kleine overlap voorkomt dat wijzigingen rond het synchronisatiemoment wegvallen
+SYNC_OVERLAP = dt.timedelta(minutes=5)
+
+log = logging.getLogger(__name__)
+
+
+# -----------------------
+# OpenChargeMap-antwoord -> alleen de kolommen die we gebruiken
+# -----------------------
+def pois_naar_frame(pois):
+    adres = [p.get("AddressInfo") or {} for p in pois]
+    df = pd.DataFrame({
+        "ID": pd.array([p.get("ID") for p in pois], dtype="Int64"),
+        "AddressInfo.Longitude": pd.to_numeric(pd.Series([a.get("Longitude") for a in adres], dtype=object), errors="coerce"),
+        "AddressInfo.Latitude": pd.to_numeric(pd.Series([a.get("Latitude") for a in adres], dtype=object), errors="coerce"),
+        "AddressInfo.Title": pd.Series([a.get("Title") for a in adres], dtype=object),
+        "DateLastStatusUpdate": pd.to_datetime([p.get("DateLastStatusUpdate") for p in pois], utc=True, errors="coerce"),
+    })
+    return df.dropna(subset=["AddressInfo.Latitude", "AddressInfo.Longitude"])
+
+
+def haal_pois(sinds=None, url=OCM_URL, timeout=30):
+    params = dict(OCM_PARAMS)
+    if sinds is not None:
+        params["modifiedsince"] = sinds.strftime("%Y-%m-%dT%H:%M:%S")
+    # gedeelde sessie: keep-alive, gzip en nieuwe pogingen bij verbindingsfouten en 429/5xx
+    r = ophalen.sessie().get(url, params=params, timeout=timeout)
+    r.raise_for_status()
+    return pois_naar_frame(r.json())
+
+
+# -----------------------
+# Snapshot op schijf
+# -----------------------
+def lees_meta(meta=SNAPSHOT_META):
+    if not os.path.exists(meta):
+        return {}
+    with open(meta) as f:
+        return json.load(f)
+
+
+def schrijf_snapshot(df, laatste_sync, pad=SNAPSHOT_PAD, meta=SNAPSHOT_META):
+    data.schrijf_kolombestand(df[SNAPSHOT_KOLOMMEN].reset_index(drop=True), pad)
+    tijdelijk = data.tijdelijk_pad(meta)
+    with open(tijdelijk, "w") as f:
+        json.dump({"laatste_sync": laatste_sync.isoformat() if laatste_sync else None, "aantal": len(df)}, f)
+    os.replace(tijdelijk, meta)
+
+
+def start_snapshot(csv_pad=data.LAADPALEN_CSV):
+    # eerste start: begin met de meegeleverde laadpalen_kort.csv (zonder ID's);
+    # de eerste verversing haalt dan de volledige set op en vervangt deze
+    df = data.lees_laadpalen_kort(csv_pad)
+    df["ID"] = pd.array([pd.NA] * len(df), dtype="Int64")
+    df["DateLastStatusUpdate"] = pd.NaT
+    df["DateLastStatusUpdate"] = df["DateLastStatusUpdate"].dt.tz_localize("UTC")
+    return df
+
+
+def lees_snapshot(pad=SNAPSHOT_PAD, csv_pad=data.LAADPALEN_CSV):
+    if os.path.exists(pad):
+        return pd.read_parquet(pad)
+    return start_snapshot(csv_pad)
+
+
+def snapshot_sleutel(pad=SNAPSHOT_PAD, csv_pad=data.LAADPALEN_CSV):
+    return data.bestand_sleutel(pad if os.path.exists(pad) else csv_pad)
+
+
+def slank(df):
+    # alleen wat de kaart en de provincietelling gebruiken: float32-coördinaten en de titel
+    # als categorie (codes + unieke namen); ID en wijzigingsdatum zijn alleen voor het verversen
+    df = df.dropna(subset=["AddressInfo.Latitude", "AddressInfo.Longitude"])
+    # factorize + from_codes: categorieën in volgorde van voorkomen (pd.Categorical sorteert ze, veel trager)
+    codes, titels = pd.factorize(df["AddressInfo.Title"])
+    return pd.DataFrame({
+        "AddressInfo.Longitude": df["AddressInfo.Longitude"].to_numpy(dtype="float32"),
+        "AddressInfo.Latitude": df["AddressInfo.Latitude"].to_numpy(dtype="float32"),
+        "AddressInfo.Title": pd.Categorical.from_codes(codes, titels),
+    })
+
+
+def voeg_samen(oud, nieuw):
+    # gewijzigde POI's vervangen hun oude versie, nieuwe komen erbij
+    oud = oud[oud["ID"].notna() & ~oud["ID"].isin(nieuw["ID"])]
+    return pd.concat([oud, nieuw], ignore_index=True)
+
+
+def ververs(url=OCM_URL, pad=SNAPSHOT_PAD, meta=SNAPSHOT_META, timeout=30):
+    begin = dt.datetime.now(dt.timezone.utc)
+    laatste_sync = lees_meta(meta).get("laatste_sync")
+
+    with meting.meet("OpenChargeMap ophalen") as m:
+        if laatste_sync is None or not os.path.exists(pad):
+            snapshot = nieuw = haal_pois(url=url, timeout=timeout)
+        else:
+            sinds = dt.datetime.fromisoformat(laatste_sync) - SYNC_OVERLAP
+            nieuw = haal_pois(sinds, url=url, timeout=timeout)
+            snapshot = voeg_samen(pd.read_parquet(pad), nieuw)
+        m.rijen = len(nieuw)
+
+    schrijf_snapshot(snapshot, begin, pad, meta)
+    return snapshot
+
+
+# -----------------------
+# Achtergrondverversing (één thread per proces): laadpalen en provinciegrenzen tegelijk
+# -----------------------
+def _ververs_lus(interval, url):
+    while True:
+        # een mislukte bron wordt gelogd; de andere wordt gewoon bijgewerkt
+        ophalen.gelijktijdig({
+            "laadpalen": lambda: ververs(url=url),
+            "provincies": lambda: ophalen.haal(provincies.PROVINCIES),
+        })
+        time.sleep(interval)
+
+
+def start_verversing(interval=3600, url=OCM_URL):
+    # elke aanroep start een thread; de app gaat via paginas.laadpalenkaart.start_verversing (één per proces)
+    thread = threading.Thread(target=_ververs_lus, args=(interval, url), daemon=True, name="laadpalen-verversing")
+    thread.start()
+    return thread
@@ -0,0 +1,130 @@
+import json
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+import pandas as pd
+
+PROMETHEUS_PREFIX = "laadpalen_stap"
+
+# per stap: aantal aanroepen, tijden, rijen/bytes van de laatste aanroep en cache-missers;
+# één register per proces, gedeeld door alle sessies en de achtergrondthread
+_stappen = {}
+_lock = threading.Lock()
+
+
+class Meting:
+    # wordt binnen `with meet(...) as m` ingevuld zodra rijen/bytes bekend zijn
+    def __init__(self, rijen=None, bytes=None):
+        self.rijen = rijen
+        self.bytes = bytes
+
+
+def _stap(naam):
+    return _stappen.setdefault(naam, {
+        'aanroepen': 0, 'missers': 0, 'cache': False,
+        'totaal_s': 0.0, 'laatste_s': 0.0, 'max_s': 0.0,
+        'rijen': None, 'bytes': None,
+    })
+
+
+# -----------------------
+# Meten: context manager, decorator en cache-missers
+# -----------------------
+@contextmanager
+def meet(naam, rijen=None, bytes=None, cache=False):
+    meting = Meting(rijen, bytes)
+    begin = time.perf_counter()
+    try:
+        yield meting
+    finally:
+        duur = time.perf_counter() - begin
+        with _lock:
+            stap = _stap(naam)
+            stap['aanroepen'] += 1
+            stap['cache'] = stap['cache'] or cache
+            stap['totaal_s'] += duur
+            stap['laatste_s'] = duur
+            stap['max_s'] = max(stap['max_s'], duur)
+            if meting.rijen is not None:
+                stap['rijen'] = int(meting.rijen)
+            if meting.bytes is not None:
+                stap['bytes'] = int(meting.bytes)
+
+
+def gemeten(naam, cache=False):
+    def decorator(functie):
+        @wraps(functie)
+        def omhulsel(*args, **kwargs):
+            with meet(naam, cache=cache):
+                return functie(*args, **kwargs)
+        return omhulsel
+    return decorator
+
+
+def mis(naam):
+    # aanroepen binnen de body van een gecachte functie: die draait alleen bij een misser
+    with _lock:
+        _stap(naam)['missers'] += 1
+
+
+def wis():
+    with _lock:
+        _stappen.clear()
+
+
+# -----------------------
+# Uitlezen: tabel, JSON en Prometheus-tekstformaat
+# -----------------------
+def momentopname():
+    with _lock:
+        return {naam: dict(stap) for naam, stap in _stappen.items()}
+
+
+def overzicht():
+    rijen = []
+    for naam, stap in momentopname().items():
+        rijen.append({
+            'stap': naam,
+            'aanroepen': stap['aanroepen'],
+            'laatste (ms)': stap['laatste_s'] * 1000,
+            'gemiddeld (ms)': stap['totaal_s'] / stap['aanroepen'] * 1000 if stap['aanroepen'] else None,
+            'max (ms)': stap['max_s'] * 1000,
+            'rijen': stap['rijen'],
+            'bytes': stap['bytes'],
+            'treffers': stap['aanroepen'] - stap['missers'] if stap['cache'] else None,
+            'missers': stap['missers'] if stap['cache'] else None,
+        })
+    kolommen = ['stap', 'aanroepen', 'laatste (ms)', 'gemiddeld (ms)', 'max (ms)', 'rijen', 'bytes', 'treffers', 'missers']
+    return pd.DataFrame(rijen, columns=kolommen).astype({k: 'Int64' for k in ['rijen', 'bytes', 'treffers', 'missers']})
+
+
+def als_json():
+    return json.dumps(momentopname(), indent=2, sort_keys=True)
+
+
+def _label(waarde):
+    return waarde.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def als_prometheus():
+    metrieken = [
+        ('aanroepen_totaal', 'counter', 'Aantal keer dat de stap is uitgevoerd', 'aanroepen'),
+        ('seconden_totaal', 'counter', 'Totale tijd in de stap', 'totaal_s'),
+        ('seconden_laatste', 'gauge', 'Duur van de laatste uitvoering', 'laatste_s'),
+        ('seconden_max', 'gauge', 'Langste uitvoering', 'max_s'),
+        ('rijen', 'gauge', 'Rijen verwerkt bij de laatste uitvoering', 'rijen'),
+        ('bytes', 'gauge', 'Bytes (payload of invoer) bij de laatste uitvoering', 'bytes'),
+        ('cache_missers_totaal', 'counter', 'Aanroepen die niet uit de cache kwamen', 'missers'),
+    ]
+    stappen = momentopname()
+    regels = []
+    for achtervoegsel, soort, uitleg, veld in metrieken:
+        naam = f"{PROMETHEUS_PREFIX}_{achtervoegsel}"
+        regels += [f"# HELP {naam} {uitleg}", f"# TYPE {naam} {soort}"]
+        for stap, waarden in sorted(stappen.items()):
+            if waarden[veld] is None or (veld == 'missers' and not waarden['cache']):
+                continue
+            regels.append(f'{naam}{{stap="{_label(stap)}"}} {waarden[veld]}')
+    return "\n".join(regels) + "\n"
@@ -0,0 +1,60 @@
+import numpy as np
+import shapely
+from sklearn.neighbors import BallTree
+
+AARDSTRAAL_KM = 6371.0088
+# graad breedte in km
+KM_PER_GRAAD = np.pi * AARDSTRAAL_KM / 180
+
+
+def _radialen(lat, lon):
+    # BallTree met haversine verwacht (breedte, lengte) in radialen
+    return np.radians(np.column_stack([np.asarray(lat, dtype='float64'), np.asarray(lon, dtype='float64')]))
+
+
+# -----------------------
+# Afstanden tot laadpalen: één BallTree (haversine) per snapshot
+# -----------------------
+class NabijheidIndex:
+    def __init__(self, lon, lat):
+        self.n = len(lon)
+        self.boom = BallTree(_radialen(lat, lon), metric='haversine')
+
+    def dichtstbij(self, lat, lon, k=5):
+        # (afstanden in km, posities in de laadpalentabel), elk (aantal punten, k), oplopend
+        k = min(k, self.n)
+        afstand, index = self.boom.query(_radialen(np.atleast_1d(lat), np.atleast_1d(lon)), k=k)
+        return afstand * AARDSTRAAL_KM, index
+
+    def aantal_binnen(self, lat, lon, straal_km):
+        # aantal laadpalen binnen straal_km van elk punt
+        return self.boom.query_radius(
+            _radialen(np.atleast_1d(lat), np.atleast_1d(lon)), r=straal_km / AARDSTRAAL_KM, count_only=True
+        )
+
+    def dekking(self, zuid, west, noord, oost, stap_km=1.0, gebied=None):
+        # afstand (km) tot de dichtstbijzijnde laadpaal op een raster van ongeveer stap_km.
+        # De rijen liggen op gelijke afstand in Web Mercator (noord -> zuid), zodat het raster
+        # zonder herprojectie als afbeelding over de kaart past. Cellen buiten `gebied`
+        # (shapely-geometrie, bijv. de provincies) worden NaN en niet opgevraagd.
+        midden = np.radians((zuid + noord) / 2)
+        kolommen = max(2, int(round((oost - west) * KM_PER_GRAAD * np.cos(midden) / stap_km)))
+        rijen = max(2, int(round((noord - zuid) * KM_PER_GRAAD / stap_km)))
+        lon = np.linspace(west, oost, kolommen)
+        y = np.linspace(_mercator_y(noord), _mercator_y(zuid), rijen)
+        lat = np.degrees(np.arctan(np.sinh(y)))
+
+        lon_raster, lat_raster = np.meshgrid(lon, lat)
+        afstand = np.full(lon_raster.shape, np.nan)
+        if gebied is not None:
+            shapely.prepare(gebied)
+            binnen = shapely.contains_xy(gebied, lon_raster, lat_raster)
+        else:
+            binnen = np.ones(lon_raster.shape, dtype=bool)
+        if binnen.any():
+            afstand[binnen] = self.dichtstbij(lat_raster[binnen], lon_raster[binnen], k=1)[0][:, 0]
+        return afstand
+
+
+def _mercator_y(lat):
+    return np.arcsinh(np.tan(np.radians(lat)))
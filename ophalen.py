@@ -0,0 +1,159 @@
+import json
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+import data
+import meting
+
+# (verbinden, lezen) in seconden
+TIMEOUT = (5, 30)
+# 3 nieuwe pogingen bij verbindingsfouten en 429/5xx, met 0,5 s, 1 s, 2 s wachttijd
+# (of de Retry-After van de server)
+POGINGEN = 3
+BACKOFF = 0.5
+HERHAAL_STATUS = (429, 500, 502, 503, 504)
+
+log = logging.getLogger(__name__)
+
+
+# -----------------------
+# Eén gedeelde HTTP-sessie per proces: verbindingen worden hergebruikt (keep-alive)
+# -----------------------
+def nieuwe_sessie(pogingen=POGINGEN, backoff=BACKOFF):
+    herhaal = Retry(
+        total=pogingen,
+        backoff_factor=backoff,
+        status_forcelist=HERHAAL_STATUS,
+        allowed_methods=frozenset(["GET"]),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=8, pool_maxsize=8, max_retries=herhaal)
+    sessie = requests.Session()
+    sessie.mount("https://", adapter)
+    sessie.mount("http://", adapter)
+    # requests pakt gzip/deflate zelf uit
+    sessie.headers["Accept-Encoding"] = "gzip, deflate"
+    return sessie
+
+
+_sessie = None
+_sessie_lock = threading.Lock()
+
+
+def sessie():
+    global _sessie
+    with _sessie_lock:
+        if _sessie is None:
+            _sessie = nieuwe_sessie()
+        return _sessie
+
+
+# -----------------------
+# Bron met kopie op schijf: voorwaardelijk ophalen (ETag / Last-Modified) en terugvallen
+# op de laatste goede kopie, of op een meegeleverd bestand
+# -----------------------
+class Bron:
+    def __init__(self, naam, url, pad, meegeleverd=None, params=None):
+        self.naam = naam
+        self.url = url
+        # laatste goede antwoord; ernaast pad + ".json" met ETag en Last-Modified
+        self.pad = pad
+        self.meegeleverd = meegeleverd
+        self.params = params
+
+
+def _lees_validatie(bron):
+    if not os.path.exists(bron.pad) or not os.path.exists(bron.pad + ".json"):
+        return {}
+    with open(bron.pad + ".json") as f:
+        return json.load(f)
+
+
+def _bewaar(bron, inhoud, antwoord):
+    # de achtergrondverversing en een rerun (of een tweede server) kunnen tegelijk schrijven
+    os.makedirs(os.path.dirname(bron.pad) or ".", exist_ok=True)
+    tijdelijk = data.tijdelijk_pad(bron.pad)
+    with open(tijdelijk, "wb") as f:
+        f.write(inhoud)
+    os.replace(tijdelijk, bron.pad)
+    validatie = {k: antwoord.headers[h] for k, h in [("etag", "ETag"), ("laatst_gewijzigd", "Last-Modified")] if h in antwoord.headers}
+    with open(tijdelijk, "w") as f:
+        json.dump(dict(validatie, url=bron.url), f)
+    os.replace(tijdelijk, bron.pad + ".json")
+
+
+def haal(bron, timeout=TIMEOUT, http=None):
+    # (inhoud, herkomst) met herkomst 'netwerk', 'ongewijzigd' (304: de kopie op schijf is
+    # nog actueel), 'schijf' of 'meegeleverd' (ophalen mislukt). Zonder terugval: de fout zelf
+    koppen = {}
+    # alleen voorwaardelijk vragen als er een kopie op schijf is die een 304 kan vervangen
+    validatie = _lees_validatie(bron) if os.path.exists(bron.pad) else {}
+    if validatie.get("url") == bron.url:
+        if "etag" in validatie:
+            koppen["If-None-Match"] = validatie["etag"]
+        if "laatst_gewijzigd" in validatie:
+            koppen["If-Modified-Since"] = validatie["laatst_gewijzigd"]
+
+    with meting.meet(f"ophalen: {bron.naam}") as m:
+        try:
+            antwoord = (http or sessie()).get(bron.url, params=bron.params, headers=koppen, timeout=timeout)
+            if antwoord.status_code == 304:
+                # een 304 heeft geen inhoud: zonder kopie op schijf (intussen weg) is dit mislukt
+                try:
+                    with open(bron.pad, "rb") as f:
+                        inhoud = f.read()
+                except FileNotFoundError:
+                    raise requests.HTTPError(f"304 voor {bron.naam} zonder kopie op schijf", response=antwoord)
+                m.bytes = len(inhoud)
+                return inhoud, "ongewijzigd"
+            antwoord.raise_for_status()
+            inhoud = antwoord.content
+            _bewaar(bron, inhoud, antwoord)
+            m.bytes = len(inhoud)
+            return inhoud, "netwerk"
+        except requests.RequestException:
+            try:
+                inhoud, herkomst = lokaal(bron)
+            except FileNotFoundError:
+                # geen terugval: de fout van het ophalen zelf
+                inhoud = None
+            if inhoud is None:
+                raise
+            log.warning("Ophalen van %s mislukt; de kopie (%s) wordt gebruikt", bron.naam, herkomst, exc_info=True)
+            m.bytes = len(inhoud)
+            return inhoud, herkomst
+
+
+def lokaal(bron):
+    # (inhoud, herkomst) zonder netwerk: de laatste download, anders het meegeleverde bestand
+    for pad, herkomst in [(bron.pad, "schijf"), (bron.meegeleverd, "meegeleverd")]:
+        if pad and os.path.exists(pad):
+            with open(pad, "rb") as f:
+                return f.read(), herkomst
+    raise FileNotFoundError(f"geen lokale kopie van {bron.naam}")
+
+
+# -----------------------
+# Meerdere bronnen tegelijk: de wachttijd is die van de traagste, niet de som
+# -----------------------
+def gelijktijdig(taken):
+    # taken: naam -> functie zonder argumenten. Geeft naam -> resultaat; een taak die
+    # mislukt geeft zijn exceptie terug, zodat de andere resultaten bruikbaar blijven
+    if not taken:
+        return {}
+    with ThreadPoolExecutor(max_workers=len(taken), thread_name_prefix="ophalen") as pool:
+        toekomst = {naam: pool.submit(taak) for naam, taak in taken.items()}
+    uitkomst = {}
+    for naam, t in toekomst.items():
+        fout = t.exception()
+        if fout is not None:
+            log.error("Ophalen van %s mislukt", naam, exc_info=fout)
+        uitkomst[naam] = fout if fout is not None else t.result()
+    return uitkomst
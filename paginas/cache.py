@@ -0,0 +1,86 @@
+# Streamlit-caches rond de laadfuncties van data, aggregaten en prognose en de figuurcache.
+# Alleen de app en de pagina's importeren deze module: de rest van de code (en batch.py) werkt
+# zonder Streamlit-runtime. Die van de kaartpagina staan in paginas/laadpalenkaart.py.
+import pandas as pd
+import streamlit as st
+
+import aggregaten
+import data
+import figuren
+import meting
+import prognose
+
+
+# -----------------------
+# Verkoopcijfers CBS en actieve personenauto's
+# -----------------------
+@st.cache_resource(show_spinner=False, max_entries=2)
+def _laad_verkoop(pad, sleutel):
+    # één gedeeld, alleen-lezen frame voor alle sessies (geen unpickle-kopie per aanroep)
+    meting.mis("verkoop laden")
+    return data.gedeeld_naast(pad, "verkoop", sleutel, data.lees_verkoop)
+
+
+def laad_verkoop(pad=data.VERKOOP_CSV):
+    with meting.meet("verkoop laden", cache=True) as m:
+        df = _laad_verkoop(pad, data.bestand_sleutel(pad))
+        m.rijen = len(df)
+    return df
+
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def _laad_huidig(pad, sleutel):
+    meting.mis("huidig laden")
+    return data.gedeeld_naast(pad, "huidig", sleutel, data.lees_huidig)
+
+
+def laad_huidig(pad=data.HUIDIG_CSV):
+    with meting.meet("huidig laden", cache=True) as m:
+        df = _laad_huidig(pad, data.bestand_sleutel(pad))
+        m.rijen = len(df)
+    return df
+
+
+# -----------------------
+# Aggregaten van het sessielog
+# -----------------------
+@st.cache_resource(show_spinner=False, max_entries=2)
+def _laad_aggregaten(pad, sleutel):
+    # gedeeld object (niet gekopieerd per rerun): de prefixsommen voor datumvensters blijven zo bewaard
+    meting.mis("aggregaten laden")
+    return aggregaten.laad_of_werk_bij(pad)
+
+
+def laad_aggregaten(pad=data.SESSIES_CSV):
+    with meting.meet("aggregaten laden", cache=True) as m:
+        agg = _laad_aggregaten(pad, data.bestand_sleutel(pad))
+        m.rijen = agg.n
+    return agg
+
+
+# -----------------------
+# Prognoses, gecached op (databestand, periode, brandstoffen, model)
+# -----------------------
+@st.cache_data(show_spinner=False)
+def _laad_prognoses(sleutel, start, eind, brandstoffen, model):
+    meting.mis("regressie fitten")
+    df = laad_verkoop()
+    df = df[(df['datum'] >= start) & (df['datum'] <= eind)]
+    return prognose.prognoses(df, list(brandstoffen), model)
+
+
+def laad_prognoses(start, eind, brandstoffen, model='lineair', pad=data.VERKOOP_CSV):
+    with meting.meet("regressie fitten", rijen=len(brandstoffen), cache=True):
+        return _laad_prognoses(data.bestand_sleutel(pad), pd.Timestamp(start), pd.Timestamp(eind), tuple(brandstoffen), model)
+
+
+# -----------------------
+# Figuren, gedeeld door alle sessies
+# -----------------------
+@st.cache_resource
+def figuur_cache():
+    return figuren.FiguurCache()
+
+
+def figuur(naam, staat, bouw):
+    return figuur_cache().haal(naam, staat, bouw)
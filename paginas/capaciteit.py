@@ -0,0 +1,149 @@
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+import capaciteit
+import data
+import laadpalen
+import meting
+import prognose
+import provincies as provincies_index
+from paginas import cache
+from paginas.laadpalenkaart import laadpalen_met_provincies
+
+JAREN = np.arange(2025, prognose.EINDE.year + 1)
+
+
+# -----------------------
+# Vaste invoer van het model: alleen opnieuw bij een nieuw databestand of prognosemodel
+# -----------------------
+@st.cache_data(show_spinner=False)
+def _invoer(sleutels, model):
+    meting.mis("capaciteit: invoer")
+    agg = cache.laad_aggregaten()
+    verkoop = cache.laad_verkoop()
+    regressie = cache.laad_prognoses(verkoop['datum'].min(), verkoop['datum'].max(), ['elektrisch'], model)
+    namen, aandeel = capaciteit.laadpalen_per_provincie(laadpalen_met_provincies()["Provincie"])
+    return {
+        'profiel': capaciteit.uurprofiel(agg),
+        'vloot': capaciteit.vloot_per_jaar(cache.laad_huidig(), verkoop, regressie, JAREN),
+        'provincies': namen,
+        'aandeel_laadpalen': aandeel,
+        'aandeel_vloot': capaciteit.aandeel_vloot(namen, aandeel),
+    }
+
+
+def invoer(model):
+    sleutels = (
+        data.bestand_sleutel(data.SESSIES_CSV),
+        data.bestand_sleutel(data.VERKOOP_CSV),
+        data.bestand_sleutel(data.HUIDIG_CSV),
+        laadpalen.snapshot_sleutel(),
+        # provincies die later binnenkomen (na een start zonder) veranderen de verdeling
+        provincies_index.provincies_sleutel(),
+    )
+    with meting.meet("capaciteit: invoer", cache=True):
+        return sleutels, _invoer(sleutels, model)
+
+
+def opmaak(fig):
+    fig.update_layout(
+        plot_bgcolor='#1e222b',
+        paper_bgcolor='#1e222b',
+        font=dict(color='white', size=20),
+        legend=dict(font=dict(color='white', size=20)),
+        xaxis=dict(title_font=dict(color='white', size=20), tickfont=dict(color='white', size=20)),
+        yaxis=dict(title_font=dict(color='white', size=20), tickfont=dict(color='white', size=20)),
+    )
+    return fig
+
+
+# ===============================
+# Benutting en piekvraag per provincie en uur
+# ===============================
+def toon():
+    st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+    st.title("Laadcapaciteit per provincie")
+    st.caption(
+        "Vraag: BEV-vloot (actieve auto's + verkoopprognose) x publieke laadsessies per auto per dag "
+        "x het uurprofiel van de gemeten laadsessies. De vloot is naar inwoners over de provincies verdeeld "
+        "(er zijn geen BEV-cijfers per provincie), de laadpunten naar hun aandeel in de OpenChargeMap-laadpalen."
+    )
+
+    kol1, kol2, kol3 = st.columns(3)
+    jaar = kol1.select_slider("Jaar", options=[int(j) for j in JAREN], value=int(JAREN[-1]))
+    scenario = kol1.radio("Scenario verkoopprognose", capaciteit.SCENARIOS, index=1, horizontal=True)
+    sessies_per_ev = kol2.slider("Publieke laadsessies per BEV per dag", 0.02, 0.40, 0.10, 0.01)
+    model = kol2.selectbox("Prognosemodel", prognose.MODELLEN)
+    laadpunten_nu = kol3.slider("Publieke laadpunten in 2025", 50_000, 400_000, 180_000, 10_000)
+    groei = kol3.slider("Groei laadpunten per jaar (%)", 0, 30, 10) / 100
+
+    sleutels, basis = invoer(model)
+    if len(basis['provincies']) == 0:
+        st.info("Geen laadpalen met provincie gevonden.")
+        st.markdown('</div>', unsafe_allow_html=True)
+        return
+
+    # alle scenario's, jaren, provincies en uren in één keer: enkele duizenden getallen
+    with meting.meet("capaciteitsmodel") as m:
+        uitkomst = capaciteit.bereken(
+            basis['vloot'], basis['aandeel_vloot'], laadpunten_nu * basis['aandeel_laadpalen'], basis['profiel'],
+            sessies_per_ev, groei, JAREN - JAREN[0]
+        )
+        m.rijen = uitkomst['vraag'].size
+    s = capaciteit.SCENARIOS.index(scenario)
+    t = int(np.searchsorted(JAREN, jaar))
+    staat = (sleutels, model, sessies_per_ev, laadpunten_nu, groei)
+
+    # landelijk: vraag opgeteld over de provincies, piek over de uren
+    landelijk = uitkomst['vraag'].sum(axis=2).max(axis=-1)
+    landelijke_capaciteit = uitkomst['capaciteit'].sum(axis=2)
+    kol1, kol2, kol3 = st.columns(3)
+    kol1.metric("BEV's", f"{basis['vloot'][s, t]:,.0f}".replace(",", "."))
+    kol2.metric("Piek gelijktijdig ladend", f"{landelijk[s, t]:,.0f}".replace(",", "."))
+    kol3.metric("Piekbenutting landelijk", f"{landelijk[s, t] / landelijke_capaciteit[s, t]:.0%}")
+
+    def bouw_heatmap():
+        fig = px.imshow(
+            uitkomst['benutting'][s, t] * 100,
+            x=list(range(24)),
+            y=list(basis['provincies']),
+            color_continuous_scale='RdYlGn_r',
+            zmin=0,
+            zmax=100,
+            aspect='auto',
+            labels={'x': 'Uur van de dag', 'y': 'Provincie', 'color': 'Benutting (%)'},
+            title=f"Benutting publieke laadpunten per uur ({jaar}, scenario {scenario})",
+        )
+        fig.update_layout(height=650)
+        return opmaak(fig)
+
+    st.plotly_chart(cache.figuur("capaciteit_heatmap", staat + (s, t), bouw_heatmap), use_container_width=True)
+
+    tabel = pd.DataFrame({
+        'Provincie': basis['provincies'],
+        'Laadpunten': uitkomst['capaciteit'][s, t].round(),
+        'Piekvraag': uitkomst['piek'][s, t].round(),
+        'Piekuur': uitkomst['piekuur'][s, t],
+        'Piekbenutting (%)': (uitkomst['piek_benutting'][s, t] * 100).round(1),
+        'Uren boven capaciteit': uitkomst['uren_tekort'][s, t],
+    })
+    st.dataframe(tabel, hide_index=True, use_container_width=True)
+
+    def bouw_verloop():
+        verloop = pd.DataFrame({
+            'jaar': np.tile(JAREN, len(capaciteit.SCENARIOS)),
+            'scenario': np.repeat(capaciteit.SCENARIOS, len(JAREN)),
+            'benutting': (landelijk / landelijke_capaciteit).ravel() * 100,
+        })
+        fig = px.line(
+            verloop, x='jaar', y='benutting', color='scenario', markers=True,
+            labels={'benutting': 'Piekbenutting landelijk (%)'},
+            title="Landelijke piekbenutting per scenario",
+        )
+        fig.update_layout(height=400, hovermode='x unified')
+        return opmaak(fig)
+
+    st.plotly_chart(cache.figuur("capaciteit_verloop", staat, bouw_verloop), use_container_width=True)
+    st.markdown('</div>', unsafe_allow_html=True)
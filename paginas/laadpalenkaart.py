@@ -0,0 +1,267 @@
+import pandas as pd
+import requests
+import shapely
+import streamlit as st
+from streamlit_folium import st_folium
+
+import data
+import detailniveau
+import kaart
+import laadpalen
+import meting
+import nabijheid
+import provincies as provincies_index
+
+# heel Nederland (zuid, west, noord, oost)
+NL_GRENZEN = (50.75, 3.36, 53.55, 7.23)
+DEKKING_STAP_KM = 1.0
+
+
+# -----------------------
+# Achtergrondverversing van laadpalen en provinciegrenzen: één thread per serverproces
+# -----------------------
+@st.cache_resource
+def start_verversing():
+    return laadpalen.start_verversing()
+
+
+# -----------------------
+# Cache: laad laadpalen (OpenChargeMap-snapshot op schijf)
+# -----------------------
+@st.cache_resource(max_entries=2)
+def _laad_laadpalen(sleutel):
+    # slanke tabel zonder geometrie, één gedeeld alleen-lezen frame (memory-mapped Arrow) voor
+    # alle sessies en serverprocessen. Punten voor GeoPandas zijn er zo nodig met
+    # gpd.points_from_xy op de coördinaatkolommen
+    meting.mis("laadpalen laden")
+    return data.gedeeld("laadpalen", sleutel, lambda: laadpalen.slank(laadpalen.lees_snapshot()))
+
+
+def laad_laadpalen():
+    # start direct vanaf de snapshot; een achtergrondthread haalt alleen
+    # gewijzigde POI's op en schrijft een nieuwe snapshot (=> nieuwe cache-sleutel)
+    start_verversing()
+    with meting.meet("laadpalen laden", cache=True) as m:
+        gdf = _laad_laadpalen(laadpalen.snapshot_sleutel())
+        m.rijen = len(gdf)
+    return gdf
+
+# -----------------------
+# Cache: provinciegrenzen (download, kopie op schijf of meegeleverd bestand), voorbereid
+# -----------------------
+@st.cache_resource(max_entries=2)
+def _laad_provincies(sleutel):
+    # cache_resource: de voorbereide polygonen (één per zoomniveau) worden gedeeld, niet gekopieerd
+    meting.mis("provincies ophalen")
+    try:
+        return provincies_index.lees_provincies()
+    except requests.RequestException:
+        # niet bereikbaar en niets op schijf: zonder provincies verder. Een geslaagde
+        # download (ook door de achtergrondverversing) geeft een nieuwe sleutel
+        return provincies_index.leeg()
+
+
+def laad_provincies():
+    # de achtergrondverversing revalideert de grenzen; een nieuwe download geeft een nieuwe sleutel
+    start_verversing()
+    with meting.meet("provincies ophalen", cache=True) as m:
+        grenzen = _laad_provincies(provincies_index.provincies_sleutel())
+        m.rijen = len(grenzen)
+    return grenzen
+
+# -----------------------
+# Provincies koppelen aan laadpalen
+# -----------------------
+def koppel_provincies(laadpalen, provincies):
+    # laadpalen: slanke tabel (lon/lat in EPSG:4326); provincies: Provinciegrenzen
+    punten = laadpalen.copy()
+
+    # toewijzing per coördinaat bewaard in cache/; alleen nieuwe of
+    # verplaatste laadpalen worden opnieuw getoetst
+    namen = provincies_index.koppel(punten["AddressInfo.Longitude"], punten["AddressInfo.Latitude"], provincies)
+    # als categorie: één kleine integer per laadpaal
+    punten["Provincie"] = pd.Categorical(namen, categories=sorted(set(provincies.namen)))
+    return punten
+
+
+@st.cache_resource(max_entries=2)
+def _laadpalen_met_provincies(sleutel, provincies_sleutel):
+    # gedeeld zoals _laad_laadpalen; alleen de gefilterde weergaven in toon() zijn per sessie
+    meting.mis("provincies koppelen")
+    grenzen = laad_provincies()
+
+    def koppel():
+        with meting.meet("laadpalen laden", cache=True):
+            punten = _laad_laadpalen(sleutel)
+        return koppel_provincies(punten, grenzen)
+
+    return data.gedeeld("laadpalen_provincies", (sleutel, grenzen.sleutel), koppel)
+
+
+def laadpalen_met_provincies():
+    # één keer per snapshot berekend i.p.v. bij elke rerun
+    start_verversing()
+    with meting.meet("provincies koppelen", cache=True) as m:
+        gdf = _laadpalen_met_provincies(laadpalen.snapshot_sleutel(), provincies_index.provincies_sleutel())
+        m.rijen = len(gdf)
+    return gdf
+
+# -----------------------
+# Kaart bouwen: alleen wat in beeld is, als clusters of losse laadpalen
+# -----------------------
+@st.cache_resource(max_entries=32)
+def detail_index(sleutel, provincies_sleutel, keuze, _gdf):
+    # quadtree per snapshot, grenzenversie en provincie; de clusters per zoomniveau worden
+    # bij het eerste gebruik van dat niveau berekend en bewaard
+    meting.mis("detailindex bouwen")
+    return detailniveau.DetailIndex(
+        _gdf["AddressInfo.Longitude"], _gdf["AddressInfo.Latitude"], _gdf["AddressInfo.Title"]
+    )
+
+
+@st.cache_resource(max_entries=64)
+def bouw_kaart(sleutel, keuze, grenzen, zoom, _index, locatie=[52.1, 5.3], gaten_km=None, _dekking=None,
+               provincies_sleutel=None, _provincies=None):
+    meting.mis("kaart bouwen")
+    clusters, punten = _index.vraag(*grenzen, zoom)
+    lagen = [kaart.dekkingslaag(_dekking, NL_GRENZEN, gaten_km)] if gaten_km else []
+    if _provincies is not None and len(_provincies):
+        # grenzen vereenvoudigd tot wat op deze zoom zichtbaar is
+        getoond = _provincies.namen == keuze if keuze in set(_provincies.namen) else slice(None)
+        lagen.append(kaart.grenslaag(_provincies.geometrie(zoom)[getoond], _provincies.namen[getoond]))
+    return kaart.bouw_detail_kaart(clusters, punten, locatie=locatie, zoom=zoom, lagen=lagen)
+
+
+# -----------------------
+# Nabijheid: BallTree over alle laadpalen, dekkingsraster binnen de provincies
+# -----------------------
+@st.cache_resource(max_entries=2)
+def nabijheid_index(sleutel, _gdf):
+    meting.mis("nabijheidsindex bouwen")
+    return nabijheid.NabijheidIndex(_gdf["AddressInfo.Longitude"], _gdf["AddressInfo.Latitude"])
+
+
+@st.cache_resource(max_entries=2)
+def dekking(sleutel, provincies_sleutel, _index):
+    # afstand tot de dichtstbijzijnde laadpaal per rastercel; de drempel kleurt pas bij het tekenen
+    meting.mis("dekking berekenen")
+    # vereenvoudigd tot ~200 m: ruim fijn genoeg voor een raster van 1 km
+    gebied = shapely.union_all(laad_provincies().geometrie(8))
+    return _index.dekking(*NL_GRENZEN, stap_km=DEKKING_STAP_KM, gebied=gebied)
+
+
+def toon_dichtstbij(index, gdf, lat, lon):
+    st.subheader(f"Laadpalen bij {lat:.4f}, {lon:.4f}")
+    kol_k, kol_straal = st.columns(2)
+    k = int(kol_k.number_input("Aantal dichtstbijzijnde laadpalen", min_value=1, max_value=50, value=5))
+    straal = kol_straal.slider("Straal (km)", 1, 25, 5)
+    with meting.meet("nabijheid opvragen", rijen=k):
+        afstand, posities = index.dichtstbij(lat, lon, k)
+        binnen = int(index.aantal_binnen(lat, lon, straal)[0])
+    st.metric(f"Laadpalen binnen {straal} km", binnen)
+    rijen = gdf.iloc[posities[0]]
+    st.dataframe(pd.DataFrame({
+        "Laadpaal": rijen["AddressInfo.Title"].astype(object).fillna("Laadpunt").to_numpy(),
+        "Provincie": rijen["Provincie"].astype(object).fillna("Onbekend").to_numpy(),
+        "Afstand (km)": afstand[0].round(2),
+    }), hide_index=True)
+
+
+def kaartbeeld(keuze):
+    # laatst gerapporteerde (zuid, west, noord, oost) en zoom van st_folium, mits voor deze provincie
+    beeld = st.session_state.get("kaart") or {}
+    if st.session_state.get("kaart_keuze") != keuze or not beeld.get("zoom"):
+        return None
+    zw, no = beeld["bounds"]["_southWest"], beeld["bounds"]["_northEast"]
+    grenzen = (zw["lat"], zw["lng"], no["lat"], no["lng"])
+    if None in grenzen:
+        return None
+    return grenzen, beeld["zoom"]
+
+
+# -----------------------
+# Streamlit UI
+# -----------------------
+def toon():
+    st.markdown('<div class="chart-container" style="text-align:center;">', unsafe_allow_html=True)
+
+    st.title("🔌 Laadpalen in Nederland per Provincie")
+
+    # laad data
+    laadpalen_met_prov = laadpalen_met_provincies()
+
+    if len(laadpalen_met_prov["Provincie"].cat.categories) == 0:
+        st.warning("Provinciegrenzen niet beschikbaar (geen verbinding en geen kopie op schijf); alle laadpalen staan onder 'Onbekend'.")
+
+    # overzicht aantal laadpalen
+    st.subheader("Aantal laadpalen per provincie")
+    counts = laadpalen_met_prov["Provincie"].cat.add_categories("Onbekend").fillna("Onbekend").value_counts()
+    st.dataframe(counts[counts > 0])
+
+    # dropdown voor provincies
+    opties = ["Alle provincies"] + sorted([p for p in laadpalen_met_prov["Provincie"].dropna().unique()])
+    keuze = st.selectbox("Kies een provincie:", opties)
+    kol_gaten, kol_afstand = st.columns(2)
+    toon_gaten = kol_gaten.toggle("Toon gebieden ver van een laadpaal")
+    gaten_km = kol_afstand.slider("Afstand tot de dichtstbijzijnde laadpaal (km)", 1, 25, 5, disabled=not toon_gaten)
+
+    # filter & kaart centreren
+    if keuze != "Alle provincies":
+        gefilterd = laadpalen_met_prov[laadpalen_met_prov["Provincie"] == keuze]
+        if len(gefilterd) == 0:
+            st.info("Geen laadpalen gevonden in deze provincie.")
+            gefilterd = laadpalen_met_prov.iloc[0:0]
+            center = [52.1, 5.3]
+            zoom = 8
+        else:
+            center = [float(gefilterd["AddressInfo.Latitude"].mean()), float(gefilterd["AddressInfo.Longitude"].mean())]
+            zoom = 10
+    else:
+        gefilterd = laadpalen_met_prov
+        center = [52.1, 5.3]
+        zoom = 8
+
+    # kaart tonen: bij elke verschuiving/zoom stuurt st_folium het nieuwe beeld terug
+    # en worden alleen de clusters/laadpalen binnen dat beeld opnieuw opgevraagd
+    sleutel = laadpalen.snapshot_sleutel()
+    provincies_sleutel = provincies_index.provincies_sleutel()
+    with meting.meet("detailindex bouwen", rijen=len(gefilterd), cache=True):
+        index = detail_index(sleutel, provincies_sleutel, keuze, gefilterd)
+    beeld = kaartbeeld(keuze)
+    if beeld is not None:
+        grenzen, zoom = beeld
+        center = [(grenzen[0] + grenzen[2]) / 2, (grenzen[1] + grenzen[3]) / 2]
+    else:
+        grenzen = index.omvang() or NL_GRENZEN
+    st.session_state["kaart_keuze"] = keuze
+
+    # nabijheid over alle laadpalen, ook als er één provincie getoond wordt
+    alle = None
+    if len(laadpalen_met_prov):
+        with meting.meet("nabijheidsindex bouwen", rijen=len(laadpalen_met_prov), cache=True):
+            alle = nabijheid_index(sleutel, laadpalen_met_prov)
+    raster = None
+    if toon_gaten and alle is not None:
+        with meting.meet("dekking berekenen", cache=True) as meet_dekking:
+            raster = dekking(sleutel, provincies_sleutel, alle)
+            meet_dekking.rijen = int(raster.size)
+    else:
+        gaten_km = None
+
+    with meting.meet("kaart bouwen", cache=True) as meet_kaart:
+        m = bouw_kaart(
+            sleutel, keuze, grenzen, zoom, index, locatie=center, gaten_km=gaten_km, _dekking=raster,
+            provincies_sleutel=provincies_sleutel, _provincies=laad_provincies()
+        )
+        laag = next(c for c in m._children.values() if isinstance(c, kaart.DetailLaag))
+        meet_kaart.bytes = len(laag.clusters) + len(laag.data)
+    with meting.meet("st_folium (renderen + verzenden)"):
+        uitvoer = st_folium(m, key="kaart", width=1750, height=750, returned_objects=["bounds", "zoom", "last_clicked"])
+
+    klik = (uitvoer or {}).get("last_clicked")
+    if klik and alle is not None:
+        toon_dichtstbij(alle, laadpalen_met_prov, klik["lat"], klik["lng"])
+    else:
+        st.caption("Klik op de kaart voor de dichtstbijzijnde laadpalen.")
+
+    st.markdown('</div>', unsafe_allow_html=True)
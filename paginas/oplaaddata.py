@@ -0,0 +1,216 @@
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+import streamlit as st
+
+import data
+from paginas import cache
+
+
+# ===============================
+# Oplaad data
+# ===============================
+def toon():
+    st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+
+    # ===========================
+    # Load aggregates
+    # ===========================
+    # Alle grafieken hieronder komen uit vooraf berekende aggregaten; alleen
+    # sessies die sinds de vorige keer aan het log zijn toegevoegd worden verwerkt.
+    # De figuren hangen af van de versie van het sessielog, de periode (en de gekozen weergave).
+    sessies_sleutel = data.bestand_sleutel(data.SESSIES_CSV)
+    agg = cache.laad_aggregaten()
+    if agg.n == 0:
+        st.info("Nog geen laadsessies.")
+        st.markdown('</div>', unsafe_allow_html=True)
+        return
+
+    eerste = pd.Timestamp(agg.per_dag.eerste_dag).date()
+    laatste = pd.Timestamp(agg.per_dag.dagen()[-1]).date()
+    periode = st.slider(
+        "Selecteer periode (laadsessies)",
+        min_value=eerste,
+        max_value=laatste,
+        value=(eerste, laatste),
+        format="YYYY-MM-DD"
+    )
+    # hele periode: de aggregaten zelf (kwantielschetsen, bewaarde uitschieters);
+    # anders de dagtotalen van het venster via prefixsommen, zonder de sessies opnieuw te lezen
+    bron = agg if periode == (eerste, laatste) else agg.venster(*periode)
+    staat = (sessies_sleutel, periode)
+
+    kol_sessies, kol_energie = st.columns(2)
+    kol_sessies.metric("Laadsessies", f"{bron.n:,}".replace(",", "."))
+    kol_energie.metric("Geladen energie", f"{bron.totale_energie() / 1000:,.0f} kWh".replace(",", "."))
+    if bron.n == 0:
+        st.info("Geen laadsessies in deze periode.")
+        st.markdown('</div>', unsafe_allow_html=True)
+        return
+
+    # ===========================
+    # 1. MaxPower frequency (250W bins)
+    # ===========================
+    def bouw_maxpower():
+        maxpower_freq = bron.maxpower_freq()
+
+        fig_maxpower = px.bar(
+            maxpower_freq,
+            x='MaxPower_bin',
+            y='Frequency',
+            text='Frequency',
+            title='Frequentie van MaxPower bij laadpalen (in 250W-bins)',
+            labels={'MaxPower_bin': 'Max Power (250W-bins)', 'Frequency': 'Aantal keren'},
+            width=800
+        )
+        fig_maxpower.update_traces(textposition='auto')
+        fig_maxpower.update_layout(
+            plot_bgcolor='#1e222b',
+            paper_bgcolor='#1e222b',
+            font=dict(color='white', size=20),
+            xaxis=dict(title_font=dict(color='white',size=20), tickfont=dict(color='white',size=20)),
+            yaxis=dict(title_font=dict(color='white',size=20), tickfont=dict(color='white',size=20))
+        )
+        return fig_maxpower
+
+    st.plotly_chart(cache.figuur("maxpower", staat, bouw_maxpower), use_container_width=True)
+
+    # ===========================
+    # 2. Average occupancy per hour of day
+    # ===========================
+    # som van de bezetting per uur (sessies over middernacht tellen ook mee) / aantal dagen
+    def bouw_bezetting():
+        occupancy_per_hour = bron.gemiddelde_bezetting_per_uur()
+
+        fig_occupancy = px.bar(
+            occupancy_per_hour,
+            x='Hour',
+            y='AvgOccupancy',
+            text='AvgOccupancy',
+            title='Gemiddelde bezetting per uur van de dag',
+            labels={'Hour': 'Uur van de dag', 'AvgOccupancy': 'Gemiddeld aantal laadpalen in gebruik'},
+            width=800
+        )
+        fig_occupancy.update_xaxes(dtick=1, range=[-0.5, 23.5]) 
+        fig_occupancy.update_traces(texttemplate='%{text:.2f}', textposition='auto')
+        fig_occupancy.update_layout(
+            plot_bgcolor='#1e222b',
+            paper_bgcolor='#1e222b',
+            font=dict(color='white', size=20),
+            xaxis=dict(title_font=dict(color='white',size=20), tickfont=dict(color='white',size=20)),
+            yaxis=dict(title_font=dict(color='white',size=20), tickfont=dict(color='white',size=20))
+        )
+        return fig_occupancy
+
+    st.plotly_chart(cache.figuur("bezetting_per_uur", staat, bouw_bezetting), use_container_width=True)
+
+    # ===========================
+    # 3. ConnectedTime vs ChargeTime boxplot
+    # ===========================
+    # kwartielen en snorharen uit de kwantielschetsen (binnen een periode: uit de vaste bins),
+    # gemiddelde/sd uit de lopende momenten,
+    # uitschieters uit de bewaarde extremen en violin/histogram uit vaste bins: de figuur is
+    # even groot bij duizend als bij honderd miljoen sessies
+    weergave = st.radio("Weergave verbonden tijd / laadtijd", ["Boxplot", "Violin", "Histogram"], horizontal=True)
+
+    def bouw_vergelijking():
+        kleuren = px.colors.qualitative.Plotly
+        fig_compare = go.Figure()
+        for i, (col, naam) in enumerate([('ConnectedTime', 'Verbonden tijd'), ('ChargeTime', 'Laadtijd')]):
+            if weergave == "Boxplot":
+                box = bron.box_statistieken(col)
+                fig_compare.add_trace(go.Box(
+                    name=naam,
+                    x=[naam],
+                    q1=[box['q1']], median=[box['median']], q3=[box['q3']],
+                    lowerfence=[box['lowerfence']], upperfence=[box['upperfence']],
+                    mean=[box['mean']], sd=[box['sd']],
+                    marker_color=kleuren[i], legendgroup=naam
+                ))
+                uitschieters = bron.uitschieters(col, box)
+                fig_compare.add_trace(go.Scatter(
+                    x=[naam] * len(uitschieters), y=uitschieters, mode='markers',
+                    marker=dict(color=kleuren[i], size=5, opacity=0.6),
+                    name=f"Uitschieters {naam}", legendgroup=naam, showlegend=False
+                ))
+            else:
+                hist = bron.histogram(col)
+                midden = (hist['van'] + hist['tot']) / 2
+                if weergave == "Histogram":
+                    fig_compare.add_trace(go.Bar(
+                        x=midden, y=hist['aantal'], width=hist['tot'] - hist['van'],
+                        name=naam, marker_color=kleuren[i], opacity=0.6
+                    ))
+                else:
+                    # violin getekend uit de bincounts (licht gladgestreken), breedte 0.8 per categorie
+                    dichtheid = np.convolve(hist['aantal'], np.ones(5) / 5, mode='same')
+                    breedte = 0.4 * dichtheid / max(dichtheid.max(), 1)
+                    gebruikt = np.flatnonzero(dichtheid > 0)
+                    y = midden.to_numpy()[gebruikt[0]:gebruikt[-1] + 1] if len(gebruikt) else []
+                    w = breedte[gebruikt[0]:gebruikt[-1] + 1] if len(gebruikt) else []
+                    fig_compare.add_trace(go.Scatter(
+                        x=np.r_[i - w, (i + w)[::-1]], y=np.r_[y, y[::-1]],
+                        fill='toself', mode='lines', line=dict(color=kleuren[i], width=1),
+                        name=naam, hoverinfo='skip'
+                    ))
+
+        if weergave == "Histogram":
+            fig_compare.update_layout(
+                title='Verdeling van verbonden tijd en laadtijd',
+                xaxis_title='Tijd (uur)',
+                yaxis_title='Aantal sessies',
+                barmode='overlay',
+                width=800
+            )
+        else:
+            fig_compare.update_layout(
+                title='Vergelijking tussen verbonden tijd en laadtijd',
+                xaxis_title='Soort tijd',
+                yaxis_title='Tijd (uur)',
+                legend_title_text='Soort tijd',
+                width=800
+            )
+            if weergave == "Violin":
+                fig_compare.update_xaxes(tickvals=[0, 1], ticktext=['Verbonden tijd', 'Laadtijd'])
+        fig_compare.update_layout(font=dict(color='white', size=20),
+            xaxis=dict(title_font=dict(color='white',size=20), tickfont=dict(color='white',size=20)),
+            yaxis=dict(title_font=dict(color='white',size=20), tickfont=dict(color='white',size=20))
+                                 )
+        return fig_compare
+
+    
+    st.plotly_chart(cache.figuur("tijden_box", staat + (weergave,), bouw_vergelijking), use_container_width=True)
+
+
+        # ===========================
+    # 4. 🔥 Heatmap: correlatie tussen numerieke kolommen
+    # ===========================
+    # Pearson-correlatie uit sommen en kruisproducten van de numerieke kolommen
+    def bouw_heatmap():
+        df_corr = bron.correlatie()
+
+        fig_heatmap = px.imshow(
+            df_corr,
+            text_auto=True,  # show correlation values
+            color_continuous_scale='RdBu_r',  # blue = negative, red = positive
+            zmin=-1, zmax=1,  # full correlation range
+            title='Correlatie tussen variabelen in laadpaaldata',
+            labels=dict(x='Variabelen', y='Variabelen', color='Correlatiecoëfficiënt'),
+            width=800,
+            height=800
+        )
+
+        fig_heatmap.update_layout(
+            plot_bgcolor='#1e222b',
+            paper_bgcolor='#1e222b',
+            coloraxis_colorbar=dict(title='Correlatie'),
+            font=dict(color='white', size=20),
+            xaxis=dict(title_font=dict(size=20, color='white'), tickfont=dict(size=20, color='white')),
+            yaxis=dict(title_font=dict(size=20, color='white'), tickfont=dict(size=20, color='white'))
+        )
+        return fig_heatmap
+
+    st.plotly_chart(cache.figuur("correlatie", staat, bouw_heatmap), use_container_width=True)
+
+    st.markdown('</div>', unsafe_allow_html=True)
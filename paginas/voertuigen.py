@@ -0,0 +1,275 @@
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+import data
+import prognose
+from paginas import cache
+
+
+# ===============================
+# Personenauto’s per kwartaal
+# ===============================
+def toon():
+    st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+
+    # Lees CSV in (gecached, opnieuw ingelezen zodra het bestand wijzigt)
+    df = cache.laad_verkoop()
+
+    color_map = {
+        'Benzine': 'dodgerblue',
+        'Diesel': 'saddlebrown',
+        'elektrisch': 'gold',
+        'hybride': 'limegreen'
+    }
+
+    # Date filter
+    min_date = df['datum'].min().to_pydatetime()
+    max_date = df['datum'].max().to_pydatetime()
+
+    selected_date = st.slider(
+        "Selecteer periode (kwartaal personenauto's)",
+        min_value=min_date,
+        max_value=max_date,
+        value=(min_date, max_date),
+        format="YYYY-MM"
+    )
+
+    brandstof_opties = data.BRANDSTOFFEN
+    selected_brandstoffen = st.multiselect(
+        "Selecteer brandstoftypes om te tonen",
+        options=brandstof_opties,
+        default=brandstof_opties
+    )
+
+    # Buttons for regression lines
+    show_reg_benzine = st.toggle("Toon regressielijn Benzine", value=False)
+    show_reg_elektrisch = st.toggle("Toon regressielijn Elektrisch", value=False)
+    show_reg_hybride = st.toggle("Toon regressielijn Hybride", value=False)
+    show_reg_diesel = st.toggle("Toon regressielijn Diesel", value=False)
+
+    regressiemodel = st.selectbox(
+        "Regressiemodel",
+        options=prognose.MODELLEN,
+        format_func={'lineair': 'Lineair', 'exponentieel': 'Exponentieel (log-lineair)', 'logistisch': 'Logistisch (S-curve)'}.get
+    )
+    show_band = st.toggle("Toon 95%-betrouwbaarheidsband", value=False)
+
+    show_toggles = {
+        'Benzine': show_reg_benzine,
+        'elektrisch': show_reg_elektrisch,
+        'hybride': show_reg_hybride,
+        'Diesel': show_reg_diesel
+    }
+    # regressielijnen en band tellen alleen mee voor zover ze getekend worden
+    getekend = tuple(b for b in ['Benzine', 'elektrisch', 'hybride', 'Diesel'] if show_toggles[b])
+
+    # Figuren worden pas gebouwd als (databestand, filters) nog niet in de figuurcache staan
+    verkoop_sleutel = data.bestand_sleutel(data.VERKOOP_CSV)
+    filter_staat = (verkoop_sleutel, selected_date, tuple(selected_brandstoffen))
+
+    def gefilterd_lang():
+        melted = df.melt(
+            id_vars='datum',
+            value_vars=['Benzine', 'Diesel', 'elektrisch', 'hybride'],
+            var_name='brandstof',
+            value_name='aantal'
+        )
+        melted = melted.sort_values('datum')
+        filtered = melted[(melted['datum'] >= selected_date[0]) & (melted['datum'] <= selected_date[1])]
+        return filtered[filtered['brandstof'].isin(selected_brandstoffen)]
+
+    def bouw_lijn():
+        fig = px.line(
+            gefilterd_lang(),
+            x='datum',
+            y='aantal',
+            color='brandstof',
+            color_discrete_map=color_map,
+            title="Aantal verkochte personenauto’s per brandstofcategorie (per kwartaal)"
+        )
+
+        # Add regressions with future projection to 2030.
+        # Alle geselecteerde brandstoffen worden in één keer gefit en gecached op
+        # (periode, brandstoffen, model); de toggles bepalen alleen wat er getekend wordt.
+        # Zonder getekende regressielijn wordt er niets gefit (en scipy niet geladen).
+        regressies = {}
+        if getekend:
+            regressies = cache.laad_prognoses(selected_date[0], selected_date[1], selected_brandstoffen, regressiemodel)
+
+        for brand in ['Benzine', 'elektrisch', 'hybride', 'Diesel']:
+            if show_toggles[brand] and brand in regressies:
+                regressie = regressies[brand]
+                lijn = regressie['lijn']
+
+                # met twee kwartalen alleen de lijn: geen band en geen p-waarde
+                if show_band and lijn['boven'].notna().any():
+                    fig.add_scatter(
+                        x=pd.concat([lijn['datum'], lijn['datum'][::-1]]),
+                        y=pd.concat([lijn['boven'], lijn['onder'][::-1]]),
+                        fill='toself',
+                        fillcolor=color_map[brand],
+                        opacity=0.2,
+                        line=dict(width=0),
+                        hoverinfo='skip',
+                        name=f"95%-band {brand}"
+                    )
+
+                # Add regression line
+                statistiek = f"r={regressie['r']:.3f}" if np.isnan(regressie['p']) else f"p={regressie['p']:.3e}, r={regressie['r']:.3f}"
+                fig.add_scatter(
+                    x=lijn['datum'],
+                    y=lijn['voorspelling'],
+                    mode='lines',
+                    name=f"Regressie {brand} ({statistiek})",
+                    line=dict(color=color_map[brand], dash='dot')
+                )
+
+        fig.update_layout(
+            plot_bgcolor='#1e222b',
+            paper_bgcolor='#1e222b',
+            font=dict(color='white', size=20),
+            legend=dict(font=dict(color='white',size=20)),
+            xaxis=dict(title_font=dict(color='white',size=20), tickfont=dict(color='white',size=20)),
+            yaxis=dict(title_font=dict(color='white',size=20), tickfont=dict(color='white',size=20)),
+            hovermode='x unified'
+        )
+        return fig
+
+    fig = cache.figuur(
+        "verkoop_lijn",
+        filter_staat + (getekend, regressiemodel if getekend else None, show_band and bool(getekend)),
+        bouw_lijn
+    )
+
+    st.plotly_chart(fig, use_container_width=True)
+    if getekend:
+        kwartalen = df['datum'].between(selected_date[0], selected_date[1]).sum()
+        if kwartalen < 2:
+            st.info("Te weinig kwartalen in de gekozen periode voor een regressielijn (minstens twee).")
+        elif kwartalen == 2:
+            st.info("Met twee kwartalen alleen de lijn door beide punten: geen betrouwbaarheidsband of p-waarde.")
+    st.markdown('</div>', unsafe_allow_html=True)
+
+    # ---- Bar chart ----
+    st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+
+    def bouw_staaf():
+        totalen = gefilterd_lang().groupby('brandstof', as_index=False)['aantal'].sum()
+        bar_fig = px.bar(
+            totalen,
+            x='brandstof',
+            y='aantal',
+            color='brandstof',
+            color_discrete_map=color_map,
+            title="Totaal aantal verkochte auto's per brandstofcategorie (geselecteerde periode)",
+            text='aantal'
+        )
+
+        bar_fig.update_traces(
+            width=0.6,
+            textposition='auto',
+            offsetgroup=None,
+            alignmentgroup=None
+        )
+
+        bar_fig.update_layout(
+            width=800,
+            plot_bgcolor='#1e222b',
+            paper_bgcolor='#1e222b',
+            font=dict(color='white', size=20),
+            legend=dict(font=dict(color='white',size=20)),
+            xaxis=dict(
+                title_font=dict(color='white',size=20),
+                tickfont=dict(color='white',size=20),
+                type='category',
+                categoryorder='array',
+                categoryarray=totalen['brandstof'].tolist(),
+            ),
+            yaxis=dict(title_font=dict(color='white',size=20), tickfont=dict(color='white',size=20)),
+            bargap=0.2,
+            height=350
+        )
+        return bar_fig
+
+    bar_fig = cache.figuur("verkoop_staaf", filter_staat, bouw_staaf)
+
+    # ---- Load and clean personenautos_huidig.csv ----
+    def bouw_huidig():
+        df_huidig = cache.laad_huidig()
+
+        # Melt into long format for Plotly (jaar stays as x-axis)
+        df_huidig_melted = df_huidig.melt(
+            id_vars='jaar',  # lowercase
+            var_name='Brandstof',
+            value_name='Aantal (miljoen)'
+        )
+
+        huidig_color_map = {
+            'Benzine': 'dodgerblue',
+            'Diesel': 'saddlebrown',
+            'LPG': 'mediumpurple',
+            'Elektriciteit': 'gold'
+        }
+
+        # ---- Base line chart ----
+        line_fig = px.line(
+            df_huidig_melted,
+            x='jaar',  # lowercase
+            y='Aantal (miljoen)',
+            color='Brandstof',
+            color_discrete_map=huidig_color_map,
+            title="Aantal personenauto's actief (2019–2025)",
+            markers=True
+        )
+
+        line_fig.update_layout(
+            plot_bgcolor='#1e222b',
+            paper_bgcolor='#1e222b',
+            font=dict(color='white', size=20),
+            legend=dict(font=dict(color='white',size=20)),
+            xaxis=dict(
+                title_font=dict(color='white',size=20),
+                tickfont=dict(color='white',size=20),
+                dtick=1,
+                showgrid=True,
+                gridcolor='gray'
+            ),
+            yaxis=dict(
+                title_font=dict(color='white',size=20),
+                tickfont=dict(color='white',size=20),
+                showgrid=True,
+                gridcolor='gray'
+            ),
+            hovermode='x unified',
+            width=800,
+            height=350
+        )
+        return line_fig
+
+    # geen widgets: alleen een nieuwe versie van het bestand bouwt deze opnieuw
+    line_fig = cache.figuur("huidig_lijn", data.bestand_sleutel(data.HUIDIG_CSV), bouw_huidig)
+
+    # ---- Place both graphs next to each other ----
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.plotly_chart(bar_fig, use_container_width=True, key="bar_fig_chart")
+     
+        st.markdown(
+            "Bron (verkoopdata): [CBS - Verkochte wegvoertuigen; nieuw en tweedehands, voertuigsoort, brandstof]"
+            "(https://opendata.cbs.nl/#/CBS/nl/dataset/85898NED/table)"
+        )
+    
+    with col2:
+        st.plotly_chart(line_fig, use_container_width=True, key="line_fig_chart")
+
+        st.markdown('</div>', unsafe_allow_html=True)
+
+        # ---- Sources ----
+        st.markdown(
+            "Bron (actieve voertuigen): "
+            "[Compendium voor de Leefomgeving - Aantal motorvoertuigen actief, 2019–2025]"
+            "(https://www.clo.nl/indicatoren/nl002627-aantal-motorvoertuigen-actief-2019-2025#:~:text=Het%20personenautopark%20is%20tussen%202019,9%20tot%207%2C2%20procent.)"
+        )
@@ -0,0 +1,135 @@
+import numpy as np
+import pandas as pd
+
+EINDE = pd.Timestamp('2030-01-01')
+MODELLEN = ['lineair', 'exponentieel', 'logistisch']
+# kandidaten voor het verzadigingsniveau K van de S-curve, als veelvoud van het hoogste punt
+K_FACTOREN = np.geomspace(1.05, 50, 60)
+
+
+# -----------------------
+# Lineaire kleinste-kwadratenfit voor alle reeksen (kolommen) tegelijk
+# -----------------------
+def lineaire_fit(x, Y):
+    # x: (n,), Y: (n, k) met eventueel NaN; gesloten vorm van de normaalvergelijkingen per kolom.
+    # scipy pas hier importeren: het kost ~1 s en is alleen nodig zodra er een regressielijn aan staat
+    from scipy import stats
+
+    geldig = ~np.isnan(Y)
+    n = geldig.sum(axis=0)
+    X = np.where(geldig, x[:, None], 0.0)
+    Yn = np.where(geldig, Y, 0.0)
+    x_gem = X.sum(axis=0) / n
+    y_gem = Yn.sum(axis=0) / n
+    dx = np.where(geldig, x[:, None] - x_gem, 0.0)
+    dy = np.where(geldig, Y - y_gem, 0.0)
+    sxx = (dx * dx).sum(axis=0)
+    sxy = (dx * dy).sum(axis=0)
+    syy = (dy * dy).sum(axis=0)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        helling = sxy / sxx
+        r = sxy / np.sqrt(sxx * syy)
+        s2 = np.maximum(syy - helling * sxy, 0.0) / (n - 2)
+        t = r * np.sqrt((n - 2) / np.maximum(1 - r ** 2, 1e-300))
+    p = 2 * stats.t.sf(np.abs(t), n - 2)
+    return {
+        'helling': helling, 'snijpunt': y_gem - helling * x_gem,
+        'r': r, 'p': p, 's2': s2, 'n': n, 'x_gem': x_gem, 'sxx': sxx,
+    }
+
+
+def _band(fit, x0, niveau=0.95):
+    # lijn en betrouwbaarheidsband van de verwachte waarde op x0 (in de getransformeerde ruimte);
+    # met twee punten is er geen spreiding te schatten: band NaN
+    from scipy import stats
+
+    lijn = fit['snijpunt'] + fit['helling'] * x0[:, None]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        se = np.sqrt(fit['s2'] * (1 / fit['n'] + (x0[:, None] - fit['x_gem']) ** 2 / fit['sxx']))
+        marge = np.where(fit['n'] > 2, stats.t.ppf(0.5 + niveau / 2, np.maximum(fit['n'] - 2, 1)) * se, np.nan)
+    return lijn, lijn - marge, lijn + marge
+
+
+# -----------------------
+# Modellen: alle drie terug te brengen tot een lineaire fit in een getransformeerde ruimte
+# -----------------------
+def _lineair(x, Y, x0):
+    fit = lineaire_fit(x, Y)
+    lijn, onder, boven = _band(fit, x0)
+    return lijn, onder, boven, fit['r'], fit['p']
+
+
+def _exponentieel(x, Y, x0):
+    # log(y) = a + b x
+    with np.errstate(divide='ignore', invalid='ignore'):
+        fit = lineaire_fit(x, np.where(Y > 0, np.log(Y), np.nan))
+    lijn, onder, boven = _band(fit, x0)
+    return np.exp(lijn), np.exp(onder), np.exp(boven), fit['r'], fit['p']
+
+
+def _logistisch(x, Y, x0):
+    # y = K / (1 + exp(a + b x))  <=>  log(K / y - 1) = a + b x.
+    # Voor alle reeksen x alle kandidaat-K's één batch-fit; per reeks wint de K met de kleinste fout.
+    k = Y.shape[1]
+    K = np.nanmax(Y, axis=0)[None, :] * K_FACTOREN[:, None]             # (G, k)
+    Yk = np.repeat(Y[:, None, :], len(K_FACTOREN), axis=1)               # (n, G, k)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        Z = np.where(Yk > 0, np.log(K / Yk - 1), np.nan).reshape(len(x), -1)
+    fit = lineaire_fit(x, Z)
+
+    schatting = K.reshape(-1) / (1 + np.exp(fit['snijpunt'] + fit['helling'] * x[:, None]))
+    fout = np.nansum((schatting - Yk.reshape(len(x), -1)) ** 2, axis=0).reshape(len(K_FACTOREN), k)
+    beste = np.argmin(np.where(np.isnan(fout), np.inf, fout), axis=0) * k + np.arange(k)
+
+    gekozen = {naam: waarde[beste] for naam, waarde in fit.items()}
+    lijn, onder, boven = _band(gekozen, x0)
+    K_beste = K.reshape(-1)[beste]
+    # exp is stijgend en K/(1+e^z) dalend in z: onder- en bovengrens wisselen
+    return (K_beste / (1 + np.exp(lijn)), K_beste / (1 + np.exp(boven)), K_beste / (1 + np.exp(onder)),
+            -gekozen['r'], gekozen['p'])
+
+
+MODEL_FUNCTIES = {'lineair': _lineair, 'exponentieel': _exponentieel, 'logistisch': _logistisch}
+
+
+def kwartaal_nummer(datums):
+    datums = pd.DatetimeIndex(datums)
+    return np.asarray(datums.year * 4 + (datums.month - 1) // 3, dtype='float64')
+
+
+def prognoses(df, brandstoffen, model='lineair', einde=EINDE):
+    # df: breed (datum + kolom per brandstof). Geeft per brandstof een frame met
+    # datum, voorspelling, onder, boven en de fitstatistieken r, p en n (aantal punten).
+    # Vanaf twee punten een lijn; band en p-waarde pas vanaf drie (anders NaN)
+    if len(df) < 2 or not brandstoffen:
+        return {}
+    df = df.sort_values('datum')
+    toekomst = pd.date_range(df['datum'].max(), einde, freq='QS')[1:]
+    datums = pd.DatetimeIndex(df['datum']).append(toekomst)
+
+    x = kwartaal_nummer(df['datum'])
+    x0 = kwartaal_nummer(datums)
+    x_start = x[0]
+    Y = df[list(brandstoffen)].to_numpy(dtype='float64')
+    lijn, onder, boven, r, p = MODEL_FUNCTIES[model](x - x_start, Y, x0 - x_start)
+
+    uitkomst = {}
+    for j, brand in enumerate(brandstoffen):
+        # minder dan twee bruikbare punten: geen lijn
+        if np.isnan(lijn[:, j]).all():
+            continue
+        # alleen de kwartalen waarin deze brandstof een waarde had, plus de toekomst
+        gebruikt = np.r_[~np.isnan(Y[:, j]), np.ones(len(toekomst), dtype=bool)]
+        uitkomst[brand] = {
+            'lijn': pd.DataFrame({
+                'datum': datums[gebruikt],
+                'voorspelling': lijn[gebruikt, j],
+                'onder': onder[gebruikt, j],
+                'boven': boven[gebruikt, j],
+            }),
+            'r': float(r[j]),
+            'p': float(p[j]),
+            'n': int((~np.isnan(Y[:, j])).sum()),
+        }
+    return uitkomst
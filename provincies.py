@@ -0,0 +1,308 @@
+import hashlib
+import io
+import json
+import os
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import shapely
+
+import data
+import ophalen
+
+TOEWIJZING_MAP = data.KOLOM_MAP
+
+# Provinciegrenzen van CBS en Kadaster (Gebiedsindelingen, gegeneraliseerd) via PDOK, CC BY 4.0:
+# naamsvermelding "CBS / Kadaster" verplicht. Laatste goede download in cache/; provincies.geojson
+# in de repo is de terugval als er nog nooit is gedownload. Vernieuwen: python -m provincies
+PROVINCIES = ophalen.Bron(
+    "provincies",
+    "https://service.pdok.nl/cbs/gebiedsindelingen/2023/wfs/v1_0",
+    os.path.join(data.KOLOM_MAP, "provincies.geojson"),
+    meegeleverd="provincies.geojson",
+    params={
+        "request": "GetFeature",
+        "service": "WFS",
+        "version": "2.0.0",
+        "typeName": "provincie_gegeneraliseerd",
+        "outputFormat": "json",
+    },
+)
+NAAMSVERMELDING = "CBS / Kadaster, Gebiedsindelingen 2023 (provincie_gegeneraliseerd), via PDOK"
+LICENTIE = "CC BY 4.0 (https://creativecommons.org/licenses/by/4.0/)"
+
+# kaartzooms met een eigen vereenvoudigde versie van de grenzen; daarboven de volledige
+ZOOMNIVEAUS = (6, 8, 10, 12)
+# rastercellen voor de snelle toewijzing, in graden (~1 km)
+CEL = 0.01
+GEEN, GRENS = -1, -2
+
+
+# -----------------------
+# Provinciegrenzen (GeoJSON) ophalen; voorbereid bewaard per versie van het bestand
+# -----------------------
+def lees_provincies(bron=PROVINCIES, map_=TOEWIJZING_MAP):
+    # alleen de eerste keer per GeoJSON-versie: inlezen, naar EPSG:4326 en voorbereiden.
+    # Daarna direct uit de GeoParquet (WKB, al in EPSG:4326) en het raster.
+    # Zonder netwerk: de kopie op schijf (of het meegeleverde bestand); het revalideren doet
+    # laadpalen.start_verversing op de achtergrond. Alleen zonder enige kopie wordt er gewacht
+    try:
+        inhoud, _ = ophalen.lokaal(bron)
+    except FileNotFoundError:
+        inhoud, _ = ophalen.haal(bron)
+    pad = grenzen_pad(hashlib.sha1(inhoud).hexdigest()[:12], map_)
+    if os.path.exists(pad):
+        return Provinciegrenzen.lees(pad)
+    grenzen = bereid_voor(gpd.read_file(io.BytesIO(inhoud)))
+    grenzen.schrijf(pad)
+    # vorige versies van de grenzen (en hun raster) zijn niet meer nodig
+    data.ruim_oude_versies_op(pad, "provincie_grenzen", ".parquet", map_)
+    data.ruim_oude_versies_op(pad[:-len(".parquet")] + ".npz", "provincie_grenzen", ".npz", map_)
+    return grenzen
+
+
+def provincies_sleutel(bron=PROVINCIES):
+    # verandert zodra er een nieuwe download op schijf staat
+    for pad in [bron.pad, bron.meegeleverd]:
+        if pad and os.path.exists(pad):
+            return data.bestand_sleutel(pad)
+    return None
+
+
+def grenzen_pad(sleutel, map_=TOEWIJZING_MAP):
+    # GeoParquet met alle versies; het raster staat ernaast als .npz
+    return os.path.join(map_, f"provincie_grenzen_{sleutel}.parquet")
+
+
+def vind_naam_kolom(gdf):
+    kandidaten = ["name", "naam", "statnaam", "provincie", "provincienaam", "NAME", "Name"]
+    for c in kandidaten:
+        if c in gdf.columns:
+            return c
+    for c in gdf.columns:
+        if c != gdf.geometry.name:
+            return c
+    return None
+
+
+# -----------------------
+# Voorbereiden: vereenvoudigde grenzen per zoomniveau en een raster voor de toewijzing
+# -----------------------
+def tolerantie(zoom):
+    # een halve pixel (tegels van 256 px) in graden: wat kleiner is, is op die zoom niet te zien
+    return 180.0 / (256 * 2 ** zoom)
+
+
+def vereenvoudig(geometrieen, tol):
+    # als de provincies een geldige dekking vormen (buren delen hun grens exact) blijven
+    # gedeelde grenzen gedeeld: geen gaten of overlap tussen buren. Anders per polygoon
+    if len(geometrieen) and shapely.coverage_is_valid(geometrieen):
+        return shapely.coverage_simplify(geometrieen, tol)
+    return shapely.simplify(geometrieen, tol, preserve_topology=True)
+
+
+def bouw_raster(geometrieen, cel=CEL):
+    # per cel het provincienummer als de cel helemaal binnen één provincie ligt, GEEN als hij
+    # helemaal erbuiten ligt en GRENS als er een grens door loopt (rijen zuid -> noord)
+    x0, y0, x1, y1 = shapely.total_bounds(geometrieen)
+    nx, ny = int(np.ceil((x1 - x0) / cel)) + 1, int(np.ceil((y1 - y0) / cel)) + 1
+    cx, cy = np.meshgrid(x0 + np.arange(nx) * cel, y0 + np.arange(ny) * cel)
+    cx, cy = cx.ravel(), cy.ravel()
+    # iets ruimer, zodat afronding bij het opzoeken nooit een grenscel mist
+    marge = cel * 1e-6
+    cellen = shapely.box(cx - marge, cy - marge, cx + cel + marge, cy + cel + marge)
+
+    raster = np.full(len(cellen), GEEN, dtype='int16')
+    raster[shapely.STRtree(cellen).query(shapely.boundary(geometrieen), predicate='intersects')[1]] = GRENS
+    # zonder grens erdoor beslist het middelpunt voor de hele cel
+    rest = np.flatnonzero(raster != GRENS)
+    raster[rest] = wijs_toe_index(cx[rest] + cel / 2, cy[rest] + cel / 2, geometrieen)
+    return raster.reshape(ny, nx), (float(x0), float(y0))
+
+
+def bereid_voor(gdf):
+    if gdf.crs is not None and not gdf.crs.equals("EPSG:4326"):
+        gdf = gdf.to_crs("EPSG:4326")
+    gdf = gdf[gdf.geometry.notna() & ~gdf.geometry.is_empty]
+    kolom = vind_naam_kolom(gdf)
+    namen = gdf[kolom].to_numpy(dtype=object) if kolom else gdf.index.astype(str).to_numpy(dtype=object)
+    geometrieen = gdf.geometry.to_numpy()
+    if len(geometrieen) == 0:
+        return leeg()
+    vereenvoudigd = {zoom: vereenvoudig(geometrieen, tolerantie(zoom)) for zoom in ZOOMNIVEAUS}
+    raster, oorsprong = bouw_raster(geometrieen)
+    return Provinciegrenzen(namen, geometrieen, vereenvoudigd, raster, oorsprong)
+
+
+def leeg():
+    # zonder provinciegrenzen: alle laadpalen 'Onbekend'
+    return Provinciegrenzen(np.zeros(0, dtype=object), np.zeros(0, dtype=object), {}, np.zeros((0, 0), dtype='int16'), (0.0, 0.0))
+
+
+class Provinciegrenzen:
+    def __init__(self, namen, geometrieen, vereenvoudigd, raster, oorsprong, cel=CEL):
+        self.namen = np.asarray(namen, dtype=object)
+        # volledige resolutie: alleen voor punten in een grenscel
+        self.geometrieen = np.asarray(geometrieen, dtype=object)
+        # zoom -> vereenvoudigde grenzen, in dezelfde volgorde als namen
+        self.vereenvoudigd = vereenvoudigd
+        self.raster = raster
+        self.oorsprong = oorsprong
+        self.cel = cel
+        self.sleutel = handtekening(self.geometrieen, self.namen)
+        shapely.prepare(self.geometrieen)
+
+    def __len__(self):
+        return len(self.namen)
+
+    def geometrie(self, zoom):
+        # de grofste versie die op deze zoom nog niet van de volledige te onderscheiden is
+        niveaus = [z for z in self.vereenvoudigd if z >= zoom]
+        return self.vereenvoudigd[min(niveaus)] if niveaus else self.geometrieen
+
+    def wijs_toe(self, lon, lat):
+        # zelfde uitkomst als wijs_toe op de volledige grenzen; alleen punten in een
+        # grenscel (of buiten het raster) krijgen de exacte punt-in-polygoontest
+        x = np.asarray(lon, dtype='float64')
+        y = np.asarray(lat, dtype='float64')
+        index = np.full(len(x), GEEN, dtype='int16')
+        if len(self.namen):
+            with np.errstate(invalid='ignore'):
+                ix = np.floor((x - self.oorsprong[0]) / self.cel)
+                iy = np.floor((y - self.oorsprong[1]) / self.cel)
+            ny, nx = self.raster.shape
+            in_raster = (ix >= 0) & (ix < nx) & (iy >= 0) & (iy < ny)
+            index[in_raster] = self.raster[iy[in_raster].astype('int64'), ix[in_raster].astype('int64')]
+            grens = np.flatnonzero(index == GRENS)
+            index[grens] = wijs_toe_index(x[grens], y[grens], self.geometrieen)
+        return np.append(self.namen, None)[index]
+
+    def schrijf(self, pad):
+        zooms = [-1] + list(self.vereenvoudigd)
+        versies = [self.geometrieen] + list(self.vereenvoudigd.values())
+        gdf = gpd.GeoDataFrame({
+            "name": np.tile(self.namen, len(versies)),
+            "zoom": np.repeat(np.array(zooms, dtype='int16'), len(self.namen)),
+        }, geometry=np.concatenate(versies), crs="EPSG:4326")
+        # eerst het raster: de GeoParquet is het teken dat alles er staat
+        raster_pad = pad[:-len(".parquet")] + ".npz"
+        tijdelijk = data.tijdelijk_pad(raster_pad)
+        with open(tijdelijk, "wb") as f:
+            np.savez(f, raster=self.raster, oorsprong=np.array(self.oorsprong), cel=self.cel)
+        os.replace(tijdelijk, raster_pad)
+        data.schrijf_kolombestand(gdf, pad)
+
+    @classmethod
+    def lees(cls, pad):
+        gdf = gpd.read_parquet(pad)
+        met_raster = np.load(pad[:-len(".parquet")] + ".npz")
+        versies = {zoom: groep for zoom, groep in gdf.groupby("zoom", sort=True)}
+        vol = versies.pop(-1)
+        return cls(
+            vol["name"].to_numpy(dtype=object),
+            vol.geometry.to_numpy(),
+            {int(zoom): groep.geometry.to_numpy() for zoom, groep in versies.items()},
+            met_raster["raster"],
+            tuple(met_raster["oorsprong"]),
+            float(met_raster["cel"]),
+        )
+
+
+# -----------------------
+# Punt -> provincie: bounding-box-filter + voorbereide polygonen
+# -----------------------
+def wijs_toe_index(lon, lat, geometrieen):
+    # per provincie eerst een goedkope bounding-box-test op de coördinaat-arrays;
+    # alleen de kandidaten krijgen de exacte punt-in-polygoontest (zonder Point-objecten).
+    # Geeft het provincienummer, GEEN buiten alle provincies
+    x = np.asarray(lon, dtype='float64')
+    y = np.asarray(lat, dtype='float64')
+    resultaat = np.full(len(x), GEEN, dtype='int16')
+    for i, geom in enumerate(geometrieen):
+        shapely.prepare(geom)
+        x0, y0, x1, y1 = geom.bounds
+        kandidaat = np.flatnonzero((x >= x0) & (x <= x1) & (y >= y0) & (y <= y1))
+        binnen = shapely.contains_xy(geom, x[kandidaat], y[kandidaat])
+        resultaat[kandidaat[binnen]] = i
+    return resultaat
+
+
+def wijs_toe(lon, lat, geometrieen, namen):
+    return np.append(np.asarray(namen, dtype=object), None)[wijs_toe_index(lon, lat, geometrieen)]
+
+
+def handtekening(geometrieen, namen):
+    # verandert zodra een provinciegrens of -naam verandert
+    h = hashlib.sha1()
+    for geom, naam in zip(geometrieen, namen):
+        h.update(str(naam).encode())
+        h.update(shapely.to_wkb(geom))
+    return h.hexdigest()[:12]
+
+
+# -----------------------
+# Toewijzing per coördinaat bewaren; alleen nieuwe/verplaatste punten opnieuw toewijzen
+# -----------------------
+def toewijzing_pad(sleutel, map_=TOEWIJZING_MAP):
+    return os.path.join(map_, f"provincie_toewijzing_{sleutel}.parquet")
+
+
+def koppel(lon, lat, grenzen, map_=TOEWIJZING_MAP):
+    # grenzen: Provinciegrenzen
+    pad = toewijzing_pad(grenzen.sleutel, map_)
+    # (lon, lat) als één complexe sleutel: snel op te zoeken in een hashtabel
+    sleutel = np.asarray(lon, dtype='float64') + 1j * np.asarray(lat, dtype='float64')
+
+    bekend_sleutel = np.zeros(0, dtype='complex128')
+    bekend_prov = np.zeros(0, dtype=object)
+    if os.path.exists(pad):
+        bekend = pd.read_parquet(pad)
+        bekend_sleutel = bekend['lon'].to_numpy() + 1j * bekend['lat'].to_numpy()
+        bekend_prov = bekend['Provincie'].to_numpy(dtype=object)
+
+    positie = pd.Index(bekend_sleutel).get_indexer(sleutel)
+    nieuw = positie < 0
+    if nieuw.any():
+        uniek = pd.unique(sleutel[nieuw])
+        positie[nieuw] = len(bekend_sleutel) + pd.Index(uniek).get_indexer(sleutel[nieuw])
+        bekend_sleutel = np.concatenate([bekend_sleutel, uniek])
+        bekend_prov = np.concatenate([bekend_prov, grenzen.wijs_toe(uniek.real, uniek.imag)])
+        data.schrijf_kolombestand(
+            pd.DataFrame({'lon': bekend_sleutel.real, 'lat': bekend_sleutel.imag, 'Provincie': bekend_prov}), pad
+        )
+        # toewijzingen bij oude grenzen worden nooit meer gelezen
+        data.ruim_oude_versies_op(pad, "provincie_toewijzing", ".parquet", map_)
+
+    return bekend_prov[positie]
+
+
+# -----------------------
+# Meegeleverde provincies.geojson vernieuwen: python -m provincies
+# -----------------------
+def schrijf_meegeleverd(inhoud, doel=PROVINCIES.meegeleverd, naamsvermelding=NAAMSVERMELDING, licentie=LICENTIE):
+    # alleen naam en grens, in EPSG:4326 op 5 decimalen (~1 m); bron en licentie reizen mee in het bestand
+    gdf = gpd.read_file(io.BytesIO(inhoud))
+    if gdf.crs is not None and not gdf.crs.equals("EPSG:4326"):
+        gdf = gdf.to_crs("EPSG:4326")
+    kolom = vind_naam_kolom(gdf)
+    gdf = gpd.GeoDataFrame(
+        {"name": gdf[kolom].astype(str) if kolom else gdf.index.astype(str)},
+        geometry=shapely.set_precision(gdf.geometry.to_numpy(), 1e-5),
+        crs="EPSG:4326",
+    ).sort_values("name")
+    geojson = json.loads(gdf.to_json(drop_id=True))
+    geojson = {"type": geojson["type"], "naamsvermelding": naamsvermelding, "licentie": licentie, "features": geojson["features"]}
+    tijdelijk = data.tijdelijk_pad(doel)
+    with open(tijdelijk, "w") as f:
+        json.dump(geojson, f, separators=(",", ":"))
+    os.replace(tijdelijk, doel)
+    return gdf
+
+
+if __name__ == "__main__":
+    inhoud, herkomst = ophalen.haal(PROVINCIES)
+    if herkomst not in ("netwerk", "ongewijzigd"):
+        raise SystemExit(f"{PROVINCIES.url} niet bereikbaar (alleen de {herkomst} kopie); {PROVINCIES.meegeleverd} niet vervangen")
+    gdf = schrijf_meegeleverd(inhoud)
+    print(f"{PROVINCIES.url} -> {PROVINCIES.meegeleverd} ({len(gdf)} provincies: {', '.join(gdf['name'])})")
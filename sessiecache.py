@@ -0,0 +1,143 @@
+import hashlib
+import json
+import os
+
+import pyarrow as pa
+
+import data
+
+# ophogen als het formaat van de cache verandert; een andere versie wordt opnieuw opgebouwd
+VERSIE = 3
+SCHEMA = pa.schema([
+    ('Started', pa.timestamp('ns')),
+    ('Ended', pa.timestamp('ns')),
+    ('TotalEnergy', pa.int32()),
+    ('ConnectedTime', pa.float64()),
+    ('ChargeTime', pa.float64()),
+    ('MaxPower', pa.int32()),
+])
+
+
+# -----------------------
+# Vingerafdruk van het log: sha1 per MB. Het log wordt alleen aangevuld, dus een gewijzigd
+# of ingekort log is te zien aan de lengte, het eerste of het laatste stuk; die drie controleren
+# kost hooguit 2 MB lezen, en bijwerken hasht alleen de nieuwe bytes (plus een onvolledig laatste
+# stuk). Zo blijft elke update O(nieuwe bytes), ook bij een log van vele GB
+# -----------------------
+STUK = 1024 ** 2
+
+
+class Vingerafdruk:
+    def __init__(self, positie=0, stukken=(), stuk=None):
+        # stukken[i]: sha1 van de bytes [i * stuk, min((i + 1) * stuk, positie))
+        self.positie = positie
+        self.stukken = list(stukken)
+        self.stuk = stuk or STUK
+
+    def _hash(self, f, begin, eind):
+        f.seek(begin)
+        return hashlib.sha1(f.read(eind - begin)).hexdigest()
+
+    def werk_bij(self, pad, eind):
+        # de bytes [positie, eind) erbij; het onvolledige laatste stuk wordt opnieuw gehasht
+        if eind <= self.positie:
+            return self
+        i = self.positie // self.stuk
+        del self.stukken[i:]
+        with open(pad, 'rb') as f:
+            for begin in range(i * self.stuk, eind, self.stuk):
+                self.stukken.append(self._hash(f, begin, min(begin + self.stuk, eind)))
+        self.positie = eind
+        return self
+
+    def klopt(self, pad):
+        # de eerste `positie` bytes van pad zijn (voor zover na te gaan) nog dezelfde
+        if self.positie == 0:
+            return True
+        if os.path.getsize(pad) < self.positie:
+            return False
+        with open(pad, 'rb') as f:
+            for i in {0, len(self.stukken) - 1}:
+                begin = i * self.stuk
+                if self._hash(f, begin, min(begin + self.stuk, self.positie)) != self.stukken[i]:
+                    return False
+        return True
+
+    def neem_over(self, ander):
+        self.positie, self.stukken, self.stuk = ander.positie, list(ander.stukken), ander.stuk
+        return self
+
+    def naar_bytes(self):
+        return json.dumps({"positie": self.positie, "stuk": self.stuk, "stukken": self.stukken}).encode()
+
+    @classmethod
+    def van_bytes(cls, tekst):
+        d = json.loads(tekst)
+        return cls(d["positie"], d["stukken"], d["stuk"])
+
+
+# -----------------------
+# Geparste sessies als Arrow IPC-bestand naast de CSV, met de vingerafdruk van de CSV-bytes
+# waar ze uit komen: een gewijzigd log maakt de cache ongeldig, een aangevuld log niet
+# -----------------------
+def cache_pad(csv_pad):
+    map_ = os.path.join(os.path.dirname(csv_pad), data.KOLOM_MAP)
+    return os.path.join(map_, os.path.splitext(os.path.basename(csv_pad))[0] + ".arrow")
+
+
+def _metadata(vingerafdruk):
+    return {
+        b'versie': str(VERSIE).encode(),
+        b'bron_vingerafdruk': vingerafdruk.naar_bytes(),
+    }
+
+
+def open_cache(csv_pad, pad=None):
+    # (tabel, vingerafdruk): de sessies uit de eerste vingerafdruk.positie bytes van de CSV,
+    # memory-mapped; (None, None) als er geen bruikbare cache is
+    pad = pad or cache_pad(csv_pad)
+    if not os.path.exists(pad):
+        return None, None
+    try:
+        tabel = pa.ipc.open_file(pa.memory_map(pad)).read_all()
+    except (pa.ArrowInvalid, OSError):
+        return None, None
+    meta = tabel.schema.metadata or {}
+    if meta.get(b'versie') != str(VERSIE).encode() or not tabel.schema.equals(SCHEMA):
+        return None, None
+    vingerafdruk = Vingerafdruk.van_bytes(meta[b'bron_vingerafdruk'])
+    if vingerafdruk.positie == 0 or not vingerafdruk.klopt(csv_pad):
+        return None, None
+    return tabel, vingerafdruk
+
+
+def als_frame(batch):
+    # zonder kopie: getallen en tijdstippen (zonder nulls) blijven views op de memory map
+    return batch.to_pandas(split_blocks=True)
+
+
+class Schrijver:
+    # schrijft een nieuwe cache naar een tijdelijk bestand; pas als alles erin staat
+    # vervangt die de oude (bij een fout of afgebroken lezen blijft de oude staan)
+    def __init__(self, csv_pad, vingerafdruk, pad=None):
+        self.pad = pad or cache_pad(csv_pad)
+        self.metadata = _metadata(vingerafdruk)
+
+    def __enter__(self):
+        os.makedirs(os.path.dirname(self.pad), exist_ok=True)
+        self._tijdelijk = data.tijdelijk_pad(self.pad)
+        self._schrijver = pa.ipc.new_file(self._tijdelijk, SCHEMA.with_metadata(self.metadata))
+        return self
+
+    def schrijf(self, df):
+        self._schrijver.write_table(pa.Table.from_pandas(df, schema=SCHEMA, preserve_index=False))
+
+    def schrijf_tabel(self, tabel):
+        self._schrijver.write_table(tabel.replace_schema_metadata(self.metadata))
+
+    def __exit__(self, soort, fout, traceback):
+        self._schrijver.close()
+        if soort is None:
+            os.replace(self._tijdelijk, self.pad)
+        else:
+            os.remove(self._tijdelijk)
@@ -0,0 +1,39 @@
+import os
+import socket
+import sys
+
+import pytest
+
+# de modules staan los in de hoofdmap van de repo (geen pakket)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.lokale_ocm import LokaleOCM, maak_pois  # noqa: E402
+from benchmarks.ophalen import start_server  # noqa: E402
+
+
+# -----------------------
+# Lokale OpenChargeMap-stand-in met een vaste set POI's
+# -----------------------
+@pytest.fixture
+def lokale_ocm():
+    with LokaleOCM(maak_pois(200)) as ocm:
+        yield ocm
+
+
+# -----------------------
+# Lokale testserver van de ophaallaag (ETag, gzip, 503) en een adres waar niets luistert
+# -----------------------
+@pytest.fixture
+def ophaalserver():
+    server, basis = start_server()
+    yield server, basis
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def onbereikbaar():
+    # een vrije poort die meteen weer dicht gaat
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return f"http://127.0.0.1:{s.getsockname()[1]}"
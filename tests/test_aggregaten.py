@@ -0,0 +1,70 @@
+# Aantal dagen achter de gemiddelden per dag (dezelfde telling voor alle aggregaten en een datumvenster)
+# en de ingestie via python -m aggregaten.
+import os
+import pickle
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import aggregaten
+import data
+from benchmarks.synthetisch import schrijf_sessies_csv, sessies
+
+
+def sessie_frame(*paren):
+    # (start, einde) als tekst -> frame met de kolommen van het sessielog
+    df = pd.DataFrame({
+        'Started': pd.to_datetime([s for s, _ in paren]),
+        'Ended': pd.to_datetime([e for _, e in paren]),
+    })
+    return df.assign(TotalEnergy=1000, ConnectedTime=1.0, ChargeTime=1.0, MaxPower=3000)
+
+
+@pytest.mark.parametrize("paren, dagen", [
+    ([("2024-03-01 08:00", "2024-03-01 10:00")], 1),
+    ([("2024-03-01 08:00", "2024-03-01 10:00"), ("2024-03-01 20:00", "2024-03-01 23:00")], 1),
+    ([("2024-03-01 22:00", "2024-03-02 01:00")], 2),
+    ([("2024-03-01 08:00", "2024-03-01 10:00"), ("2024-03-03 00:30", "2024-03-03 02:00")], 3),
+])
+def test_dagen_telt_kalenderdagen(paren, dagen):
+    agg = aggregaten.Aggregaten().voeg_toe(sessie_frame(*paren))
+    assert agg.dagen() == dagen
+    assert agg.venster(paren[0][0], paren[-1][1]).dagen() == dagen
+
+
+def test_leeg_telt_als_een_dag():
+    assert aggregaten.Aggregaten().dagen() == 1
+
+
+def test_venster_over_alles_gelijk_aan_aggregaten():
+    agg = aggregaten.Aggregaten().voeg_toe(sessies(5_000, seed=4, dagen=30))
+    dagen = agg.per_dag.dagen()
+    venster = agg.venster(dagen[0], dagen[-1])
+
+    assert venster.n == agg.n
+    assert venster.dagen() == agg.dagen() == len(dagen)
+    pd.testing.assert_frame_equal(venster.gemiddelde_bezetting_per_uur(), agg.gemiddelde_bezetting_per_uur())
+
+
+def test_bezetting_per_uur_gemiddeld_over_kalenderdagen():
+    # één sessie van 22:00 tot 01:00: twee kalenderdagen, elk van de drie uren één keer bezet
+    agg = aggregaten.Aggregaten().voeg_toe(sessie_frame(("2024-03-01 22:00", "2024-03-02 01:00")))
+    bezetting = agg.gemiddelde_bezetting_per_uur().set_index('Hour')['AvgOccupancy']
+    assert np.allclose(bezetting[[22, 23, 0]], 0.5)
+    assert bezetting.drop([22, 23, 0]).eq(0).all()
+
+
+def test_ingestie_vanaf_de_commandoregel_is_in_de_app_te_laden(tmp_path):
+    # python -m aggregaten draait als __main__; de pickle moet toch naar aggregaten.Aggregaten verwijzen
+    schrijf_sessies_csv(str(tmp_path / data.SESSIES_CSV), 1_000)
+    repo = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    subprocess.run([sys.executable, "-m", "aggregaten"], cwd=tmp_path, check=True, capture_output=True,
+                   env=dict(os.environ, PYTHONPATH=repo))
+
+    with open(tmp_path / aggregaten.AGGREGATEN_PAD, 'rb') as f:
+        agg = pickle.load(f)
+    assert type(agg) is aggregaten.Aggregaten
+    assert agg.n == 1_000
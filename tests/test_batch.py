@@ -0,0 +1,45 @@
+# python -m batch over een sessielog met alleen de kopregel: een duidelijke fout en geen uitvoer.
+import os
+import subprocess
+import sys
+
+import pytest
+
+import aggregaten
+import batch
+from benchmarks.synthetisch import schrijf_sessies_csv
+
+
+@pytest.fixture
+def alleen_kop(tmp_path):
+    pad = tmp_path / "sessies.csv"
+    schrijf_sessies_csv(str(pad), 10)
+    with open(pad) as f:
+        pad.write_text(f.readline())
+    return str(pad)
+
+
+def test_resultaten_zonder_sessies_is_een_fout(alleen_kop):
+    agg = batch.analyseer([alleen_kop])
+    assert agg.n == 0
+    with pytest.raises(ValueError):
+        batch.resultaten(agg)
+
+
+def test_commandoregel_zonder_sessies_schrijft_niets(alleen_kop, tmp_path):
+    uit = tmp_path / "uit"
+    repo = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    proces = subprocess.run([sys.executable, "-m", "batch", alleen_kop, "--processen", "1", "--uit", str(uit)],
+                            capture_output=True, text=True, env=dict(os.environ, PYTHONPATH=repo))
+
+    assert proces.returncode == 1
+    assert "geen sessies" in proces.stderr
+    assert not uit.exists()
+
+
+def test_resultaten_met_sessies(tmp_path):
+    pad = str(tmp_path / "sessies.csv")
+    schrijf_sessies_csv(pad, 1_000)
+    uitkomst = batch.resultaten(batch.analyseer([pad]))
+    assert uitkomst['tijden_box']['n'].eq(1_000).all()
+    assert list(uitkomst['tijden_box']['kolom']) == aggregaten.TIJD_KOLOMMEN
@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+
+import bezetting
+import data
+from benchmarks.bezetting import naief_per_uur
+from benchmarks.synthetisch import sessies
+
+
+def sessie_frame(*paren):
+    return pd.DataFrame({
+        'Started': pd.to_datetime([begin for begin, _ in paren]),
+        'Ended': pd.to_datetime([eind for _, eind in paren]),
+    })
+
+
+def per_uur(df):
+    return bezetting.bezetting_per_uur(df['Started'], df['Ended'])
+
+
+def zelfde_dag(df):
+    return df[df['Started'].dt.normalize() == df['Ended'].dt.normalize()]
+
+
+# -----------------------
+# Gelijk aan de oude 24-voudige maskerlus (die klopt alleen binnen één dag)
+# -----------------------
+def test_zelfde_dag_gelijk_aan_oude_lus_op_voorbeelddata():
+    df = zelfde_dag(data.lees_sessies())
+    assert np.array_equal(per_uur(df), naief_per_uur(df))
+
+
+def test_zelfde_dag_gelijk_aan_oude_lus_synthetisch():
+    df = zelfde_dag(sessies(50_000, seed=1))
+    assert np.array_equal(per_uur(df), naief_per_uur(df))
+
+
+def test_per_minuut_telt_op_tot_per_uur():
+    df = zelfde_dag(sessies(5_000, seed=3))
+    heel = df.assign(Started=df['Started'].dt.floor('h'), Ended=df['Ended'].dt.floor('h'))
+    per_minuut = bezetting.bezetting_per_minuut(heel['Started'], heel['Ended'])
+    assert np.array_equal(per_minuut.reshape(24, 60).sum(axis=1), 60 * per_uur(heel))
+
+
+# -----------------------
+# Sessies over middernacht en over meerdere dagen
+# -----------------------
+def test_over_middernacht():
+    df = sessie_frame(('2023-03-01 22:30', '2023-03-02 02:15'))
+    verwacht = np.zeros(24, dtype='int64')
+    verwacht[[22, 23, 0, 1]] = 1
+    assert np.array_equal(per_uur(df), verwacht)
+
+
+def test_over_meerdere_dagen():
+    df = sessie_frame(('2023-03-01 10:00', '2023-03-03 09:00'))
+    # dag 1: 10-23 uur, dag 2: hele dag, dag 3: 0-8 uur
+    verwacht = np.ones(24, dtype='int64')
+    verwacht[:9] += 1
+    verwacht[10:] += 1
+    assert np.array_equal(per_uur(df), verwacht)
+
+    eerste_dag, per_dag = bezetting.bezetting_per_dag_uur(df['Started'], df['Ended'])
+    assert eerste_dag == np.datetime64('2023-03-01')
+    assert per_dag.shape == (3, 24)
+    assert np.array_equal(per_dag.sum(axis=1), [14, 24, 9])
+
+
+# -----------------------
+# Eindtijd vóór de begintijd telt nergens mee
+# -----------------------
+def test_einde_voor_begin_telt_niet_mee():
+    df = sessie_frame(('2023-03-01 12:00', '2023-03-01 08:00'))
+    assert np.array_equal(per_uur(df), np.zeros(24, dtype='int64'))
+
+
+def test_einde_voor_begin_naast_gewone_sessie():
+    df = sessie_frame(('2023-03-01 12:00', '2023-03-01 08:00'), ('2023-03-01 09:00', '2023-03-01 11:00'))
+    verwacht = np.zeros(24, dtype='int64')
+    verwacht[[9, 10]] = 1
+    assert np.array_equal(per_uur(df), verwacht)
+    assert (bezetting.bezetting_tijdlijn(df['Started'], df['Ended']) >= 0).all()
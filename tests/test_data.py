@@ -0,0 +1,33 @@
+# Atomair wegschrijven: tegelijk schrijvende threads (sessies in één server) naar hetzelfde bestand.
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+import data
+
+
+def test_tijdelijk_pad_per_proces_en_thread(tmp_path):
+    pad = str(tmp_path / "x.parquet")
+    with ThreadPoolExecutor(1) as pool:
+        andere_thread = pool.submit(data.tijdelijk_pad, pad).result()
+    hier = data.tijdelijk_pad(pad)
+    assert hier != andere_thread
+    assert hier.startswith(f"{pad}.{os.getpid()}.") and hier.endswith(".tmp")
+
+
+def test_tegelijk_schrijven_naar_hetzelfde_bestand(tmp_path):
+    doel = str(tmp_path / "sub" / "x.parquet")
+    frames = [pd.DataFrame({"a": range(i, i + 50_000)}) for i in range(8)]
+
+    def schrijf(df):
+        for _ in range(5):
+            data.schrijf_kolombestand(df, doel)
+
+    with ThreadPoolExecutor(len(frames)) as pool:
+        list(pool.map(schrijf, frames))
+
+    # één van de versies in zijn geheel, geen tijdelijke bestanden over
+    gelezen = pd.read_parquet(doel)
+    assert any(gelezen.equals(df) for df in frames)
+    assert os.listdir(tmp_path / "sub") == ["x.parquet"]
@@ -0,0 +1,111 @@
+# Snapshot en modifiedsince-verversing van laadpalen.ververs tegen de lokale OpenChargeMap-stand-in.
+import datetime as dt
+import os
+
+import pandas as pd
+import pytest
+import requests
+
+import laadpalen
+import ophalen
+from benchmarks.lokale_ocm import maak_pois
+
+
+@pytest.fixture
+def paden(tmp_path):
+    return str(tmp_path / "snapshot.parquet"), str(tmp_path / "snapshot.json")
+
+
+def wijzig(ocm, aantal_gewijzigd, aantal_nieuw):
+    # wijzigingsdatum na de vorige sync, zodat modifiedsince ze meeneemt
+    nu = (dt.datetime.now(dt.timezone.utc) + dt.timedelta(seconds=1)).strftime("%Y-%m-%dT%H:%M:%SZ")
+    for p in list(ocm.pois.values())[:aantal_gewijzigd]:
+        p["AddressInfo"]["Title"] = "Gewijzigd"
+        p["DateLastStatusUpdate"] = nu
+    for p in maak_pois(aantal_nieuw, seed=1, start_id=max(ocm.pois) + 1, datum=nu):
+        ocm.pois[p["ID"]] = p
+
+
+# -----------------------
+# Volledige ophaalronde
+# -----------------------
+def test_eerste_verversing_haalt_alles_op(lokale_ocm, paden):
+    pad, meta = paden
+    snapshot = laadpalen.ververs(url=lokale_ocm.url, pad=pad, meta=meta)
+
+    assert len(lokale_ocm.verzoeken) == 1
+    assert "modifiedsince" not in lokale_ocm.verzoeken[0]
+    assert len(snapshot) == len(lokale_ocm.pois)
+    assert sorted(snapshot["ID"]) == sorted(lokale_ocm.pois)
+    assert list(snapshot.columns) == laadpalen.SNAPSHOT_KOLOMMEN
+
+    # snapshot en laatste sync staan op schijf
+    pd.testing.assert_frame_equal(laadpalen.lees_snapshot(pad), snapshot.reset_index(drop=True))
+    assert laadpalen.lees_meta(meta)["aantal"] == len(snapshot)
+    assert laadpalen.lees_meta(meta)["laatste_sync"] is not None
+
+
+# -----------------------
+# modifiedsince: alleen de wijzigingen ophalen en op ID samenvoegen
+# -----------------------
+def test_verversing_voegt_wijzigingen_samen_op_id(lokale_ocm, paden):
+    pad, meta = paden
+    laadpalen.ververs(url=lokale_ocm.url, pad=pad, meta=meta)
+    wijzig(lokale_ocm, 10, 5)
+
+    snapshot = laadpalen.ververs(url=lokale_ocm.url, pad=pad, meta=meta)
+
+    assert "modifiedsince" in lokale_ocm.verzoeken[-1]
+    assert len(snapshot) == 205
+    assert snapshot["ID"].is_unique
+    assert sorted(snapshot["ID"]) == sorted(lokale_ocm.pois)
+    assert (snapshot["AddressInfo.Title"] == "Gewijzigd").sum() == 10
+    assert laadpalen.lees_meta(meta)["aantal"] == 205
+
+
+def test_verversing_zonder_wijzigingen_houdt_snapshot_gelijk(lokale_ocm, paden):
+    pad, meta = paden
+    eerste = laadpalen.ververs(url=lokale_ocm.url, pad=pad, meta=meta)
+
+    tweede = laadpalen.ververs(url=lokale_ocm.url, pad=pad, meta=meta)
+
+    assert "modifiedsince" in lokale_ocm.verzoeken[-1]
+    assert sorted(tweede["ID"]) == sorted(eerste["ID"])
+
+
+def test_verversing_zonder_snapshot_op_schijf_haalt_alles_op(lokale_ocm, paden):
+    pad, meta = paden
+    laadpalen.ververs(url=lokale_ocm.url, pad=pad, meta=meta)
+    os.remove(pad)
+
+    snapshot = laadpalen.ververs(url=lokale_ocm.url, pad=pad, meta=meta)
+
+    assert "modifiedsince" not in lokale_ocm.verzoeken[-1]
+    assert len(snapshot) == len(lokale_ocm.pois)
+
+
+# -----------------------
+# Mislukte verversing: de vorige snapshot blijft staan
+# -----------------------
+def test_mislukte_verversing_houdt_vorige_snapshot(lokale_ocm, paden, monkeypatch):
+    pad, meta = paden
+    laadpalen.ververs(url=lokale_ocm.url, pad=pad, meta=meta)
+    vorige, vorige_meta = laadpalen.lees_snapshot(pad), laadpalen.lees_meta(meta)
+    wijzig(lokale_ocm, 10, 5)
+
+    # zonder wachttijd tussen de nieuwe pogingen
+    monkeypatch.setattr(ophalen, "_sessie", ophalen.nieuwe_sessie(backoff=0))
+    lokale_ocm.status = 503
+    with pytest.raises(requests.HTTPError):
+        laadpalen.ververs(url=lokale_ocm.url, pad=pad, meta=meta)
+
+    assert len(lokale_ocm.verzoeken) == 1 + 1 + ophalen.POGINGEN
+    pd.testing.assert_frame_equal(laadpalen.lees_snapshot(pad), vorige)
+    assert laadpalen.lees_meta(meta) == vorige_meta
+    assert sorted(os.listdir(os.path.dirname(pad))) == ["snapshot.json", "snapshot.parquet"]
+
+    # de volgende geslaagde verversing haalt de gemiste wijzigingen alsnog op
+    lokale_ocm.status = 200
+    snapshot = laadpalen.ververs(url=lokale_ocm.url, pad=pad, meta=meta)
+    assert len(snapshot) == 205
+    assert (snapshot["AddressInfo.Title"] == "Gewijzigd").sum() == 10
@@ -0,0 +1,144 @@
+# De ophaallaag tegen de lokale testserver: gzip, revalidatie met ETag (304), nieuwe pogingen
+# bij 503 en de terugval op de kopie op schijf of het meegeleverde bestand.
+import os
+
+import pytest
+import requests
+
+import ophalen
+from benchmarks.ophalen import INHOUD, bron
+
+
+@pytest.fixture
+def snel():
+    # nieuwe pogingen zonder noemenswaardige wachttijd
+    return ophalen.nieuwe_sessie(backoff=0.05)
+
+
+# -----------------------
+# gzip en 304
+# -----------------------
+def test_gzip_over_de_lijn_uitgepakt_op_schijf(ophaalserver, tmp_path):
+    server, basis = ophaalserver
+    b = bron("etag", f"{basis}/bron", str(tmp_path))
+
+    assert ophalen.haal(b) == (INHOUD, "netwerk")
+    assert server.verzonden < len(INHOUD) / 10
+    with open(b.pad, "rb") as f:
+        assert f.read() == INHOUD
+
+
+def test_revalidatie_geeft_304_zonder_inhoud(ophaalserver, tmp_path):
+    server, basis = ophaalserver
+    b = bron("etag", f"{basis}/bron", str(tmp_path))
+    ophalen.haal(b)
+    verzonden = server.verzonden
+
+    assert ophalen.haal(b) == (INHOUD, "ongewijzigd")
+    assert server.verzonden == verzonden
+    assert server.verzoeken["/bron"] == 2
+
+
+def test_andere_url_wordt_niet_gerevalideerd(ophaalserver, tmp_path):
+    server, basis = ophaalserver
+    ophalen.haal(bron("etag", f"{basis}/bron", str(tmp_path)))
+
+    # zelfde kopie op schijf, maar de validatie hoort bij een andere url
+    assert ophalen.haal(bron("etag", f"{basis}/bron?vertraging=0", str(tmp_path))) == (INHOUD, "netwerk")
+
+
+def test_zonder_kopie_geen_voorwaardelijke_koppen(ophaalserver, tmp_path):
+    server, basis = ophaalserver
+    b = bron("etag", f"{basis}/bron", str(tmp_path))
+    ophalen.haal(b)
+    assert "If-None-Match" not in server.koppen
+
+    # de validatie staat er nog, de kopie zelf niet meer: gewoon opnieuw ophalen
+    os.remove(b.pad)
+    assert ophalen.haal(b) == (INHOUD, "netwerk")
+    assert "If-None-Match" not in server.koppen and "If-Modified-Since" not in server.koppen
+    ophalen.haal(b)
+    assert "If-None-Match" in server.koppen
+
+
+def test_304_zonder_kopie_is_mislukt(ophaalserver, tmp_path):
+    _, basis = ophaalserver
+    b = bron("leeg", f"{basis}/altijd304", str(tmp_path))
+
+    with pytest.raises(requests.HTTPError):
+        ophalen.haal(b)
+    # de lege inhoud van de 304 is niet als kopie bewaard
+    assert not os.path.exists(b.pad)
+
+
+def test_304_zonder_kopie_valt_terug_op_meegeleverd(ophaalserver, tmp_path):
+    _, basis = ophaalserver
+    meegeleverd = tmp_path / "meegeleverd.json"
+    meegeleverd.write_bytes(b"{}")
+
+    b = bron("leeg", f"{basis}/altijd304", str(tmp_path), str(meegeleverd))
+    assert ophalen.haal(b) == (b"{}", "meegeleverd")
+    assert not os.path.exists(b.pad)
+
+
+# -----------------------
+# Nieuwe pogingen bij 503
+# -----------------------
+def test_tweemaal_503_derde_poging_lukt(ophaalserver, tmp_path, snel):
+    server, basis = ophaalserver
+    b = bron("wankel", f"{basis}/wankel?fouten=2", str(tmp_path))
+
+    assert ophalen.haal(b, http=snel) == (INHOUD, "netwerk")
+    assert server.verzoeken["/wankel"] == 3
+
+
+def test_blijvend_503_valt_terug_op_schijf(ophaalserver, tmp_path, snel):
+    server, basis = ophaalserver
+    ophalen.haal(bron("wankel", f"{basis}/wankel", str(tmp_path)), http=snel)
+
+    b = bron("wankel", f"{basis}/wankel?fouten=100", str(tmp_path))
+    assert ophalen.haal(b, http=snel) == (INHOUD, "schijf")
+    assert server.verzoeken["/wankel"] == 1 + 1 + ophalen.POGINGEN
+
+
+def test_blijvend_503_zonder_kopie_geeft_de_fout(ophaalserver, tmp_path, snel):
+    server, basis = ophaalserver
+    with pytest.raises(requests.HTTPError):
+        ophalen.haal(bron("wankel", f"{basis}/wankel?fouten=100", str(tmp_path)), http=snel)
+
+
+# -----------------------
+# Server onbereikbaar: terugval op schijf, dan meegeleverd, anders de fout
+# -----------------------
+def test_onbereikbaar_valt_terug_op_schijf(ophaalserver, onbereikbaar, tmp_path, snel):
+    _, basis = ophaalserver
+    ophalen.haal(bron("etag", f"{basis}/bron", str(tmp_path)))
+
+    # zelfde kopie op schijf, server weg
+    assert ophalen.haal(bron("etag", f"{onbereikbaar}/bron", str(tmp_path)), http=snel) == (INHOUD, "schijf")
+
+
+def test_onbereikbaar_valt_terug_op_meegeleverd(onbereikbaar, tmp_path, snel):
+    meegeleverd = tmp_path / "meegeleverd.json"
+    meegeleverd.write_bytes(b"{}")
+
+    b = bron("nieuw", f"{onbereikbaar}/bron", str(tmp_path), str(meegeleverd))
+    assert ophalen.haal(b, http=snel) == (b"{}", "meegeleverd")
+
+
+def test_onbereikbaar_zonder_terugval_geeft_de_fout(onbereikbaar, tmp_path, snel):
+    b = bron("nieuw", f"{onbereikbaar}/bron", str(tmp_path))
+    with pytest.raises(requests.ConnectionError):
+        ophalen.haal(b, http=snel)
+
+    # gelijktijdig geeft de fout terug in plaats van hem op te gooien
+    fout = ophalen.gelijktijdig({"weg": lambda: ophalen.haal(b, http=snel)})["weg"]
+    assert isinstance(fout, requests.ConnectionError)
+
+
+def test_gelijktijdig_geeft_alle_resultaten(ophaalserver, tmp_path):
+    _, basis = ophaalserver
+    bronnen = [bron(f"bron{i}", f"{basis}/bron?vertraging=50", str(tmp_path)) for i in range(3)]
+
+    uitkomst = ophalen.gelijktijdig({b.naam: (lambda b=b: ophalen.haal(b)) for b in bronnen})
+    assert uitkomst == {b.naam: (INHOUD, "netwerk") for b in bronnen}
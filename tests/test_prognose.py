@@ -0,0 +1,48 @@
+# Regressielijnen bij weinig kwartalen: vanaf twee punten een lijn, band en p-waarde vanaf drie.
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import prognose
+
+
+def verkoop(*waarden, **extra):
+    datums = pd.date_range('2020-01-01', periods=len(waarden), freq='QS')
+    return pd.DataFrame({'datum': datums, 'elektrisch': np.asarray(waarden, dtype='float64'), **extra})
+
+
+@pytest.mark.parametrize("model", prognose.MODELLEN)
+def test_twee_punten_geven_een_lijn_zonder_band(model):
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        uitkomst = prognose.prognoses(verkoop(100, 150), ['elektrisch'], model)
+
+    regressie = uitkomst['elektrisch']
+    lijn = regressie['lijn']
+    assert regressie['n'] == 2
+    assert np.isnan(regressie['p'])
+    assert np.allclose(lijn['voorspelling'][:2], [100, 150])
+    assert lijn['voorspelling'].notna().all()
+    assert lijn['onder'].isna().all() and lijn['boven'].isna().all()
+
+
+@pytest.mark.parametrize("model", prognose.MODELLEN)
+def test_drie_punten_geven_band_en_p_waarde(model):
+    regressie = prognose.prognoses(verkoop(100, 160, 200), ['elektrisch'], model)['elektrisch']
+    lijn = regressie['lijn']
+    assert regressie['n'] == 3
+    assert 0 <= regressie['p'] <= 1
+    assert lijn[['voorspelling', 'onder', 'boven']].notna().all().all()
+    assert (lijn['onder'] <= lijn['voorspelling'] + 1e-9).all() and (lijn['voorspelling'] <= lijn['boven'] + 1e-9).all()
+
+
+def test_een_punt_geeft_niets():
+    assert prognose.prognoses(verkoop(100), ['elektrisch']) == {}
+
+
+def test_brandstof_met_een_punt_valt_weg():
+    df = verkoop(100, 150, 210, Benzine=[np.nan, np.nan, 900.0])
+    uitkomst = prognose.prognoses(df, ['elektrisch', 'Benzine'])
+    assert list(uitkomst) == ['elektrisch']
@@ -0,0 +1,73 @@
+# Meegeleverde provincies.geojson: bron en licentie in het bestand, en het vernieuwen vanuit
+# een download in het PDOK-formaat (RD New, naam in statnaam). Opruimen van oude cacheversies.
+import json
+import os
+
+import geopandas as gpd
+import numpy as np
+
+import ophalen
+import provincies
+from benchmarks import synthetisch
+
+
+def test_meegeleverd_heeft_naamsvermelding_en_licentie():
+    with open(provincies.PROVINCIES.meegeleverd) as f:
+        geojson = json.load(f)
+    assert geojson["naamsvermelding"] and geojson["licentie"].startswith("CC BY")
+    assert len(geojson["features"]) == 12
+
+
+def test_schrijf_meegeleverd_uit_pdok_formaat(tmp_path):
+    provs = synthetisch.provincies(hoekpunten=50)
+    pdok = gpd.GeoDataFrame({"statcode": [f"PV{i:02d}" for i in range(len(provs))], "statnaam": provs["name"]},
+                            geometry=provs.geometry, crs="EPSG:4326").to_crs("EPSG:28992")
+    doel = str(tmp_path / "provincies.geojson")
+
+    provincies.schrijf_meegeleverd(pdok.to_json().encode(), doel=doel)
+
+    with open(doel) as f:
+        geojson = json.load(f)
+    assert geojson["naamsvermelding"] == provincies.NAAMSVERMELDING
+    assert geojson["licentie"] == provincies.LICENTIE
+    gelezen = gpd.read_file(doel)
+    assert list(gelezen.columns) == ["name", "geometry"]
+    assert sorted(gelezen["name"]) == sorted(provs["name"])
+    # terug in EPSG:4326, op ~1 m nauwkeurig
+    terug = gelezen.set_index("name").geometry
+    for naam, geom in zip(provs["name"], provs.geometry):
+        assert np.allclose(terug[naam].bounds, geom.bounds, atol=1e-4)
+
+
+# -----------------------
+# Alleen de laatste versie van grenzen en toewijzing blijft in de cache staan
+# -----------------------
+def test_koppel_ruimt_toewijzing_bij_oude_grenzen_op(tmp_path):
+    map_ = str(tmp_path)
+    lon, lat = np.array([5.0, 5.5, 6.0]), np.array([52.0, 52.2, 52.4])
+    oud = provincies.bereid_voor(synthetisch.provincies(hoekpunten=50, seed=0))
+    nieuw = provincies.bereid_voor(synthetisch.provincies(hoekpunten=50, seed=1))
+
+    provincies.koppel(lon, lat, oud, map_)
+    # een bestand met een langere naam is van iets anders en blijft staan
+    (tmp_path / "provincie_toewijzing_extra_0123456789ab.parquet").write_bytes(b"")
+    toegewezen = provincies.koppel(lon, lat, nieuw, map_)
+
+    assert sorted(os.listdir(map_)) == sorted([
+        os.path.basename(provincies.toewijzing_pad(nieuw.sleutel, map_)),
+        "provincie_toewijzing_extra_0123456789ab.parquet",
+    ])
+    assert list(toegewezen) == list(nieuw.wijs_toe(lon, lat))
+
+
+def test_lees_provincies_ruimt_oude_grenzen_op(tmp_path):
+    map_ = str(tmp_path / "cache")
+    os.makedirs(map_)
+    bron = ophalen.Bron("provincies", "http://127.0.0.1:9/", str(tmp_path / "provincies.geojson"))
+    for seed in [0, 1]:
+        synthetisch.provincies(hoekpunten=50, seed=seed).to_file(bron.pad, driver="GeoJSON")
+        grenzen = provincies.lees_provincies(bron, map_)
+
+    pad = os.listdir(map_)
+    assert len(pad) == 2 and {os.path.splitext(p)[1] for p in pad} == {".parquet", ".npz"}
+    assert provincies.Provinciegrenzen.lees(os.path.join(map_, sorted(pad)[1])).sleutel == grenzen.sleutel
@@ -0,0 +1,175 @@
+# Vingerafdruk van het sessielog en incrementeel bijwerken van aggregaten en sessiecache:
+# een aangevuld log kost alleen de nieuwe bytes, een herschreven of ingekort log begint opnieuw.
+import hashlib
+import os
+
+import numpy as np
+import pytest
+
+import aggregaten
+import sessiecache
+from benchmarks.synthetisch import schrijf_sessies_csv, sessies
+
+
+def vul_aan(pad, n, seed):
+    sessies(n, seed=seed).to_csv(pad, mode='a', header=False, index=False, date_format='%Y-%m-%d %H:%M:%S')
+
+
+def gelijk(a, b):
+    assert a.n == b.n
+    assert a.totale_energie() == b.totale_energie()
+    assert np.array_equal(a.maxpower_telling, b.maxpower_telling)
+    assert np.array_equal(a.bezetting_uur, b.bezetting_uur)
+    assert a.bron_positie == b.bron_positie
+    assert a.bron_vingerafdruk.stukken == b.bron_vingerafdruk.stukken
+
+
+@pytest.fixture
+def log(tmp_path):
+    pad = str(tmp_path / "sessies.csv")
+    schrijf_sessies_csv(pad, 5_000)
+    return pad
+
+
+@pytest.fixture
+def gehasht(monkeypatch):
+    # telt de bytes die door sha1 gaan
+    teller = {"bytes": 0}
+    sha1 = hashlib.sha1
+
+    def tellende_sha1(inhoud=b""):
+        teller["bytes"] += len(inhoud)
+        return sha1(inhoud)
+
+    monkeypatch.setattr(hashlib, "sha1", tellende_sha1)
+    return teller
+
+
+# -----------------------
+# Vingerafdruk
+# -----------------------
+def test_stapsgewijs_bijwerken_gelijk_aan_in_een_keer(tmp_path):
+    pad = tmp_path / "log"
+    pad.write_bytes(bytes(range(256)) * 10)
+
+    stapsgewijs = sessiecache.Vingerafdruk(stuk=100)
+    for eind in [1, 99, 100, 101, 350, 350, 1999, 2560]:
+        stapsgewijs.werk_bij(str(pad), eind)
+    in_een_keer = sessiecache.Vingerafdruk(stuk=100).werk_bij(str(pad), 2560)
+
+    assert stapsgewijs.positie == in_een_keer.positie == 2560
+    assert stapsgewijs.stukken == in_een_keer.stukken
+    assert len(stapsgewijs.stukken) == 26
+
+
+def test_naar_bytes_en_terug(tmp_path):
+    pad = tmp_path / "log"
+    pad.write_bytes(b"x" * 250)
+    afdruk = sessiecache.Vingerafdruk(stuk=100).werk_bij(str(pad), 250)
+
+    terug = sessiecache.Vingerafdruk.van_bytes(afdruk.naar_bytes())
+    assert (terug.positie, terug.stukken, terug.stuk) == (afdruk.positie, afdruk.stukken, afdruk.stuk)
+
+
+@pytest.mark.parametrize("wijziging, klopt", [
+    (lambda b: b + b"erbij", True),
+    (lambda b: b[:-1], False),
+    (lambda b: b"X" + b[1:], False),
+    (lambda b: b[:-2] + b"XX", False),
+])
+def test_klopt(tmp_path, wijziging, klopt):
+    pad = tmp_path / "log"
+    inhoud = bytes(range(256)) * 10
+    pad.write_bytes(inhoud)
+    afdruk = sessiecache.Vingerafdruk(stuk=100).werk_bij(str(pad), len(inhoud))
+
+    pad.write_bytes(wijziging(inhoud))
+    assert afdruk.klopt(str(pad)) == klopt
+
+
+# -----------------------
+# Aggregaten en sessiecache bijwerken
+# -----------------------
+def test_aangevuld_log_gelijk_aan_volledig_opnieuw(log):
+    agg = aggregaten.werk_bij(aggregaten.Aggregaten(), log)
+    for seed in [1, 2]:
+        vul_aan(log, 1_000, seed)
+        agg = aggregaten.werk_bij(agg, log)
+
+    # vanaf nul uit de sessiecache, en zonder cache helemaal uit de CSV
+    gelijk(agg, aggregaten.werk_bij(aggregaten.Aggregaten(), log))
+    assert agg.n == 7_000
+    os.remove(sessiecache.cache_pad(log))
+    gelijk(agg, aggregaten.werk_bij(aggregaten.Aggregaten(), log))
+
+
+def test_bijwerken_hasht_alleen_de_nieuwe_bytes(log, monkeypatch, gehasht):
+    monkeypatch.setattr(sessiecache, "STUK", 4096)
+    agg = aggregaten.werk_bij(aggregaten.Aggregaten(), log)
+    grootte = agg.bron_positie
+    assert grootte > 50 * 4096
+
+    vul_aan(log, 50, 1)
+    gehasht["bytes"] = 0
+    agg = aggregaten.werk_bij(agg, log)
+    erbij = agg.bron_positie - grootte
+
+    # controle (eerste en laatste stuk) + onvolledig laatste stuk + de nieuwe bytes
+    assert erbij > 0
+    assert gehasht["bytes"] <= erbij + 3 * 4096
+
+    # zonder nieuwe regels: alleen de controle
+    gehasht["bytes"] = 0
+    aggregaten.werk_bij(agg, log)
+    assert gehasht["bytes"] <= 2 * 4096
+
+
+def test_sessiecache_deelt_de_vingerafdruk(log):
+    agg = aggregaten.werk_bij(aggregaten.Aggregaten(), log)
+    tabel, afdruk = sessiecache.open_cache(log)
+    assert tabel.num_rows == agg.n
+    assert (afdruk.positie, afdruk.stukken) == (agg.bron_positie, agg.bron_vingerafdruk.stukken)
+
+    # een nieuwe start: de aggregaten komen uit de cache, de vingerafdruk ook
+    vul_aan(log, 500, 1)
+    opnieuw = aggregaten.werk_bij(aggregaten.Aggregaten(), log)
+    tabel, afdruk = sessiecache.open_cache(log)
+    assert tabel.num_rows == opnieuw.n == 5_500
+    assert afdruk.stukken == opnieuw.bron_vingerafdruk.stukken
+
+
+def test_herschreven_log_begint_opnieuw(log):
+    agg = aggregaten.werk_bij(aggregaten.Aggregaten(), log)
+
+    schrijf_sessies_csv(log, 3_000, seed=7)
+    assert sessiecache.open_cache(log) == (None, None)
+    bijgewerkt = aggregaten.werk_bij(agg, log)
+
+    os.remove(sessiecache.cache_pad(log))
+    gelijk(bijgewerkt, aggregaten.werk_bij(aggregaten.Aggregaten(), log))
+    assert bijgewerkt.n == 3_000
+
+
+def test_fout_halverwege_laat_de_positie_staan(log, monkeypatch):
+    agg = aggregaten.werk_bij(aggregaten.Aggregaten(), log)
+    positie, n = agg.bron_positie, agg.n
+    vul_aan(log, 1_000, 1)
+
+    def kapot(*args):
+        raise ValueError("kapot blok")
+
+    monkeypatch.setattr(aggregaten, "lees_blok", kapot)
+    with pytest.raises(ValueError):
+        aggregaten.werk_bij(agg, log)
+    assert (agg.bron_positie, agg.n) == (positie, n)
+
+
+def test_sessiecache_met_compacte_gehele_getallen(log):
+    aggregaten.werk_bij(aggregaten.Aggregaten(), log)
+    tabel, _ = sessiecache.open_cache(log)
+    df = sessiecache.als_frame(tabel.to_batches()[0])
+
+    assert df['TotalEnergy'].dtype == 'int32' and df['MaxPower'].dtype == 'int32'
+    csv = sessies(5_000)
+    assert np.array_equal(df['TotalEnergy'].to_numpy(), csv['TotalEnergy'].to_numpy()[:len(df)])
+    assert np.array_equal(df['MaxPower'].to_numpy(), csv['MaxPower'].to_numpy()[:len(df)])